@@ -0,0 +1,4 @@
+# flake8: noqa
+from .density import DensityShooter
+from .monte_carlo import MonteCarloShooter
+from .endgame import EndgameSolver
@@ -0,0 +1,160 @@
+"""Probability-density shooter with incremental updates of placement counts."""
+
+import random
+from typing import Optional
+
+from elements.bitboard import blocks_to_mask, iter_indexes
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.placements import placement_index
+
+
+class DensityShooter:
+    """
+    Компьютерный стрелок, который стреляет в блок, покрытый наибольшим числом
+    возможных положений ещё не уничтоженных кораблей.
+    Счетчики положений по блокам не пересчитываются заново, а уменьшаются при каждом промахе,
+    попадании и уничтожении корабля.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сетки противника
+        offset (int): Где начинается сетка противника (количество блоков), по умолчанию board.human_offset
+        fleet (кортеж): длины кораблей противника
+        density (список целых): взвешенное число возможных положений кораблей, покрывающих каждый блок
+    ----------
+    Методы:
+        reset(): начинает новую партию
+        next_shot(): возвращает блок для следующего выстрела
+        register_shot(fired_block, hit, destroyed_ship): учитывает результат выстрела
+    """
+
+    def __init__(
+        self,
+        offset: Optional[int] = None,
+        *,
+        fleet: Optional[tuple] = None,
+        rng: Optional[random.Random] = None,
+        board: BoardConfig = DEFAULT_BOARD,
+    ) -> None:
+        self.board = board
+        self.offset = board.human_offset if offset is None else offset
+        self.fleet = board.fleet if fleet is None else fleet
+        self.rng = rng or random
+        self.index = placement_index(board)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Сбрасывает все наблюдения и счетчики перед новой партией.
+        Начальные счетчики считаются по формуле для строки и столбца блока, без перебора положений.
+        """
+        width, height = self.board.width, self.board.height
+        self.remaining = {length: self.fleet.count(length) for length in set(self.fleet)}
+        self.alive = {length: self.index.all_placements(length) for length in self.remaining}
+        self.counts = {}
+        for length in self.remaining:
+            by_column = [self.__starts_through(position, length, width) for position in range(width)]
+            by_row = [self.__starts_through(position, length, height) for position in range(height)]
+            if length == 1:
+                # A single-block ship is counted once, as a horizontal one
+                by_row = [0] * height
+            self.counts[length] = [by_row[row] + by_column[column] for row in range(height) for column in range(width)]
+        self.density = [0] * self.board.cells
+        for length, counts in self.counts.items():
+            weight = self.remaining[length]
+            for cell, count in enumerate(counts):
+                self.density[cell] += weight * count
+        self.fired = 0
+        self.unsunk_hits = 0
+
+    @staticmethod
+    def __starts_through(position: int, length: int, size: int) -> int:
+        """
+        Возвращает, сколько отрезков длины length в ряду из size блоков проходит через блок position.
+        """
+        return max(0, min(position, size - length) - max(0, position - length + 1) + 1)
+
+    def next_shot(self) -> tuple:
+        """
+        Возвращает блок для выстрела: в режиме добивания — блок, лучше всего продолжающий
+        подбитый корабль, иначе — блок с наибольшей плотностью возможных положений.
+        Вне добивания у блоков, в которые стреляли, плотность нулевая, поэтому
+        лучшие блоки ищутся без проверки каждого блока по маске выстрелов.
+        """
+        if self.unsunk_hits:
+            scores = self.__target_scores()
+            if scores:
+                best_score = max(scores.values())
+                best_cells = sorted(cell for cell, score in scores.items() if score == best_score)
+                return self.board.index_to_block(self.rng.choice(best_cells), self.offset)
+        else:
+            best_score = max(self.density)
+            if best_score > 0:
+                best_cells = [cell for cell, score in enumerate(self.density) if score == best_score]
+                return self.board.index_to_block(self.rng.choice(best_cells), self.offset)
+        # No ship can be placed anywhere: any block that has not been fired at will do
+        best_cells = list(iter_indexes(self.board.full_mask & ~self.fired))
+        return self.board.index_to_block(self.rng.choice(best_cells), self.offset)
+
+    def register_shot(self, fired_block: tuple, hit: bool, destroyed_ship: Optional[list] = None) -> None:
+        """
+        Учитывает результат выстрела.
+        Аргументы:
+            fired_block (tuple): координаты блока, в который стрелял компьютер
+            hit (bool): было ли попадание
+            destroyed_ship (список, необязательный): все блоки корабля, если выстрел его уничтожил
+        """
+        bit = 1 << self.board.block_to_index(fired_block, self.offset)
+        self.fired |= bit
+        if not hit:
+            for length in self.alive:
+                self.__kill(length, self.index.covering_any(bit, length))
+            return
+        if destroyed_ship is None:
+            self.unsunk_hits |= bit
+            # Any other ship touching a hit block is impossible, only placements through it survive
+            for length in self.alive:
+                self.__kill(length, self.index.blocked_by(bit, length) & ~self.index.covering_any(bit, length))
+            return
+        ship_mask = blocks_to_mask(destroyed_ship, self.offset, self.board)
+        self.unsunk_hits &= ~ship_mask
+        length = len(destroyed_ship)
+        self.remaining[length] -= 1
+        counts = self.counts[length]
+        for other_cell in range(self.board.cells):
+            self.density[other_cell] -= counts[other_cell]
+        for other_length in self.alive:
+            self.__kill(other_length, self.index.blocked_by(ship_mask, other_length))
+
+    def __kill(self, length: int, placements: int) -> None:
+        """
+        Исключает положения длины length и уменьшает счетчики их блоков.
+        """
+        dead = self.alive[length] & placements
+        if not dead:
+            return
+        self.alive[length] &= ~dead
+        counts = self.counts[length]
+        weight = self.remaining[length]
+        for number in iter_indexes(dead):
+            for cell in self.index.cells_of(length, number):
+                counts[cell] -= 1
+                self.density[cell] -= weight
+
+    def __target_scores(self) -> dict:
+        """
+        Считает для каждого блока, в который ещё не стреляли, сколько возможных положений проходит через него
+        и через подбитые, но не уничтоженные блоки. Положения через несколько попаданий весят больше.
+        Возвращает:
+            dict: номер блока -> вес (только блоки с ненулевым весом)
+        """
+        scores = {}
+        for length, alive in self.alive.items():
+            weight = self.remaining[length]
+            if not weight:
+                continue
+            for number in iter_indexes(alive & self.index.covering_any(self.unsunk_hits, length)):
+                mask = self.index.mask(length, number)
+                score = weight * (mask & self.unsunk_hits).bit_count()
+                for cell in iter_indexes(mask & ~self.fired):
+                    scores[cell] = scores.get(cell, 0) + score
+        return scores
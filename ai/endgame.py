@@ -0,0 +1,419 @@
+"""Exact endgame solver: enumerates the fleets still possible and minimises the expected number of shots."""
+
+import time
+from typing import Optional
+
+from elements.bitboard import HIT, MISS, SUNK, iter_indexes
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.placements import placement_index
+from elements.rng import RngStream
+
+# The solver takes over when at most this many ships remain...
+ENDGAME_SHIPS = 3
+# ...and at most this many fleets are still consistent with the shots
+MAX_ARRANGEMENTS = 2000
+# The transposition table has 2 ** TABLE_BITS slots
+TABLE_BITS = 16
+# Fleets tried by enumerate_arrangements between two checks of the clock (a search node checks it every time)
+CLOCK_CHECK_NODES = 64
+# A shot must beat the best one so far by more than this (sums of probabilities are not exact)
+EPSILON = 1e-9
+# Seed of the Zobrist keys (any fixed value: keys only have to be the same within a process)
+ZOBRIST_SEED = 0x5EA
+
+
+class _OutOfTime(Exception):
+    """
+    Поиск не уложился во время или число узлов, отведенные на ход.
+    """
+
+
+class TranspositionTable:
+    """
+    Таблица уже решенных позиций фиксированного размера: ключ Zobrist позиции -> (ожидаемое число
+    оставшихся выстрелов, точное ли это значение или только нижняя граница, лучший выстрел).
+    Позиция попадает в ячейку по младшим битам ключа; при столкновении остается запись, на которую
+    ушло больше узлов поиска, а записи прошлых ходов (поколений) вытесняются всегда.
+    Память ограничена размером таблицы, сколько бы позиций ни перебиралось.
+    ----------
+    Атрибуты:
+        size (int): число ячеек
+        generation (int): номер текущего хода
+        hits, misses (int): сколько раз позиция нашлась или не нашлась в таблице
+    ----------
+    Методы:
+        get(key): запись (значение, точное, выстрел) или None
+        store(key, value, exact, cell, work): сохраняет запись
+        new_generation(): начинает новый ход
+        clear(): удаляет все записи
+    """
+
+    def __init__(self, bits: int = TABLE_BITS) -> None:
+        self.size = 1 << bits
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.__mask = self.size - 1
+        self.__keys = [None] * self.size
+        self.__entries = [None] * self.size
+
+    def get(self, key: int) -> Optional[tuple]:
+        """
+        Возвращает (значение, точное ли оно, лучший выстрел) для позиции key или None.
+        """
+        slot = key & self.__mask
+        if self.__keys[slot] != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self.__entries[slot][:3]
+
+    def store(self, key: int, value: float, exact: bool, cell: Optional[int], work: int) -> None:
+        """
+        Сохраняет результат поиска позиции key, на который ушло work узлов,
+        если ячейка свободна, занята той же позицией, записью прошлого хода или более дешевой записью.
+        """
+        slot = key & self.__mask
+        stored = self.__entries[slot]
+        if stored is None or self.__keys[slot] == key or stored[4] != self.generation or stored[3] <= work:
+            self.__keys[slot] = key
+            self.__entries[slot] = (value, exact, cell, work, self.generation)
+
+    def new_generation(self) -> None:
+        """
+        Начинает новый ход: записи прошлых ходов остаются, но уступают место новым.
+        """
+        self.generation += 1
+
+    def clear(self) -> None:
+        """
+        Удаляет все записи.
+        """
+        self.__keys = [None] * self.size
+        self.__entries = [None] * self.size
+
+    def __len__(self) -> int:
+        return self.size - self.__keys.count(None)
+
+
+def enumerate_arrangements(
+    remaining: tuple,
+    allowed: int,
+    unsunk_hits: int,
+    *,
+    limit: int = MAX_ARRANGEMENTS,
+    deadline: Optional[float] = None,
+    board: BoardConfig = DEFAULT_BOARD,
+) -> Optional[list]:
+    """
+    Перебирает все расстановки оставшихся кораблей, совместимые с наблюдениями.
+    Корабль может стоять только на блоках allowed, не касаться других кораблей и подбитых блоков,
+    которые он не занимает; все подбитые, но не уничтоженные блоки должны быть заняты.
+    Корабли одинаковой длины перебираются по возрастанию номера положения, поэтому каждая
+    расстановка встречается один раз.
+    Аргументы:
+        remaining (кортеж): длины ещё не уничтоженных кораблей, от большего к меньшему
+        allowed (int): маска блоков, на которых может стоять корабль (включая подбитые)
+        unsunk_hits (int): маска подбитых, но не уничтоженных блоков
+        limit (int): наибольшее число расстановок
+        deadline (float, необязательный): время time.perf_counter(), к которому перебор должен закончиться
+        board (BoardConfig): размеры сетки
+    Возвращает:
+        list или None: расстановки (кортежи пар (длина, номер положения)); None, если расстановок
+                больше limit или перебор не успел к deadline
+    """
+    index = placement_index(board)
+    lengths = tuple(sorted(set(remaining), reverse=True))
+    forbidden = board.full_mask & ~allowed
+    legal = {}
+    for length in lengths:
+        placements = index.all_placements(length) & ~index.covering_any(forbidden, length)
+        for cell in iter_indexes(unsunk_hits):
+            bit = 1 << cell
+            placements &= ~(index.blocked_by(bit, length) & ~index.covering_any(bit, length))
+        # A ship made of hits only would already have been reported sunk
+        legal[length] = placements & index.covering_any(board.full_mask & ~unsunk_hits, length)
+    arrangements = []
+    ships = []
+    visited = 0
+
+    def extend(position: int, legal: dict, occupied: int, previous: int) -> bool:
+        nonlocal visited
+        if position == len(remaining):
+            if occupied & unsunk_hits == unsunk_hits:
+                arrangements.append(tuple(ships))
+            return len(arrangements) <= limit
+        visited += 1
+        if deadline is not None and not visited % CLOCK_CHECK_NODES and time.perf_counter() >= deadline:
+            return False
+        length = remaining[position]
+        candidates = legal[length]
+        if position and remaining[position - 1] == length:
+            candidates &= -(1 << (previous + 1))
+        for number in iter_indexes(candidates):
+            ship_conflicts = index.conflicts(length, number, lengths)
+            ships.append((length, number))
+            fits = extend(
+                position + 1,
+                {key: placements & ~ship_conflicts[key] for key, placements in legal.items()},
+                occupied | index.placement(length, number)[0],
+                number,
+            )
+            ships.pop()
+            if not fits:
+                return False
+        return True
+
+    return arrangements if extend(0, legal, 0, -1) else None
+
+
+class EndgameSolver:
+    """
+    Точный решатель конца партии для компьютера. Когда у игрока осталось не больше max_ships кораблей
+    и не больше max_arrangements совместимых с выстрелами расстановок, перебирает все эти расстановки
+    (считая их равновероятными) и выбирает выстрел с наименьшим ожидаемым числом оставшихся выстрелов
+    до уничтожения флота: после выстрела расстановки делятся по исходу (промах, попадание, уничтожение
+    конкретного корабля), и для каждой части поиск повторяется.
+    Поиск ускоряют:
+        - блок, занятый во всех расстановках, всегда выбирается сразу (в него придется стрелять все равно,
+          а исход выстрела только добавляет сведений);
+        - нижняя граница — число ещё не подбитых блоков кораблей — отсекает заведомо худшие выстрелы;
+        - таблица позиций TranspositionTable с ключами Zobrist по состоянию блоков (промах, попадание,
+          уничтожен) и числу оставшихся кораблей каждой длины, общая для всех ходов и партий решателя.
+    Перебор и поиск ограничены временем time_budget (и, если задано, числом узлов max_nodes); если поиск
+    не успел, выбирается блок, занятый в наибольшем числе расстановок, так что ход никогда не затягивается.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сетки противника
+        time_budget (float или None): время на один ход в секундах (None — без ограничения по времени)
+        max_nodes (int или None): наибольшее число узлов поиска на ход; с time_budget=None
+                выбор выстрела не зависит от скорости машины
+        max_ships, max_arrangements (int): когда решатель берется за ход
+        table (TranspositionTable): таблица решенных позиций
+        last_arrangements (int): число расстановок на последнем ходу (0, если решатель не брался за ход)
+        last_nodes (int): число узлов поиска на последнем ходу
+        last_exact (bool): был ли последний выстрел выбран точным поиском
+        last_expected (float или None): ожидаемое число выстрелов до конца партии при лучшей игре, если его
+                посчитал точный поиск (None, если выстрел выбран без поиска)
+    ----------
+    Методы:
+        choose(remaining, allowed, unsunk_hits): номер бита блока для выстрела или None,
+                если до конца партии ещё далеко
+    """
+
+    def __init__(
+        self,
+        *,
+        time_budget: Optional[float] = 0.05,
+        max_nodes: Optional[int] = None,
+        max_ships: int = ENDGAME_SHIPS,
+        max_arrangements: int = MAX_ARRANGEMENTS,
+        table_bits: int = TABLE_BITS,
+        board: BoardConfig = DEFAULT_BOARD,
+    ) -> None:
+        self.board = board
+        self.time_budget = time_budget
+        self.max_nodes = max_nodes
+        self.max_ships = max_ships
+        self.max_arrangements = max_arrangements
+        self.table = TranspositionTable(table_bits)
+        self.last_arrangements = 0
+        self.last_nodes = 0
+        self.last_exact = False
+        self.last_expected = None
+        self.__index = placement_index(board)
+        rng = RngStream(ZOBRIST_SEED)
+        self.__cell_keys = {state: [rng.getrandbits(64) for _ in range(board.cells)] for state in (MISS, HIT, SUNK)}
+        self.__fleet_keys = {
+            (length, count): rng.getrandbits(64)
+            for length in board.ship_lengths
+            for count in range(board.ships_count(length) + 1)
+        }
+        self.__deadline = None
+        self.__occupied = []
+        self.__ship_of = []
+        self.__total = 0
+
+    def choose(self, remaining: tuple, allowed: int, unsunk_hits: int) -> Optional[int]:
+        """
+        Выбирает выстрел в конце партии.
+        Аргументы:
+            remaining (кортеж): длины ещё не уничтоженных кораблей
+            allowed (int): маска блоков, на которых ещё может стоять корабль (включая подбитые)
+            unsunk_hits (int): маска подбитых, но не уничтоженных блоков
+        Возвращает:
+            int или None: номер бита блока для выстрела; None, если кораблей или расстановок слишком много
+                и ход должна сделать обычная логика
+        """
+        self.last_arrangements = self.last_nodes = 0
+        self.last_exact = False
+        self.last_expected = None
+        remaining = tuple(sorted(remaining, reverse=True))
+        if not remaining or len(remaining) > self.max_ships:
+            return None
+        self.__deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        arrangements = enumerate_arrangements(
+            remaining,
+            allowed,
+            unsunk_hits,
+            limit=self.max_arrangements,
+            deadline=self.__deadline,
+            board=self.board,
+        )
+        if not arrangements:
+            return None
+        self.last_arrangements = len(arrangements)
+        self.__prepare(arrangements)
+        self.__total = sum(remaining)
+        members = range(len(arrangements))
+        counts = self.__counts(members, unsunk_hits)
+        certain = [cell for cell, count in counts.items() if count == len(arrangements)]
+        if certain:
+            self.last_exact = True
+            return min(certain)
+        key = self.__root_key(remaining, allowed, unsunk_hits)
+        self.table.new_generation()
+        try:
+            self.last_expected = self.__search(members, unsunk_hits, unsunk_hits, remaining, key, float("inf"))
+            self.last_exact = True
+            return self.table.get(key)[2]
+        except _OutOfTime:
+            best_count = max(counts.values())
+            return min(cell for cell, count in counts.items() if count == best_count)
+
+    def __prepare(self, arrangements: list) -> None:
+        """
+        Запоминает для каждой расстановки маску занятых блоков и корабль (маску) на каждом её блоке.
+        """
+        index = self.__index
+        self.__occupied = []
+        self.__ship_of = []
+        for arrangement in arrangements:
+            occupied = 0
+            ship_of = {}
+            for length, number in arrangement:
+                mask = index.placement(length, number)[0]
+                occupied |= mask
+                for cell in index.cells_of(length, number):
+                    ship_of[cell] = mask
+            self.__occupied.append(occupied)
+            self.__ship_of.append(ship_of)
+
+    def __counts(self, members, shot: int) -> dict:
+        """
+        Возвращает для каждого блока, в который ещё не стреляли, число расстановок members, где он занят.
+        """
+        counts = {}
+        for member in members:
+            for cell in iter_indexes(self.__occupied[member] & ~shot):
+                counts[cell] = counts.get(cell, 0) + 1
+        return counts
+
+    def __root_key(self, remaining: tuple, allowed: int, unsunk_hits: int) -> int:
+        """
+        Ключ Zobrist позиции: блоки, где кораблей быть не может, — промахи, подбитые блоки — попадания,
+        плюс число оставшихся кораблей каждой длины.
+        """
+        key = 0
+        for cell in iter_indexes(self.board.full_mask & ~allowed):
+            key ^= self.__cell_keys[MISS][cell]
+        for cell in iter_indexes(unsunk_hits):
+            key ^= self.__cell_keys[HIT][cell]
+        for length in self.board.ship_lengths:
+            key ^= self.__fleet_keys[(length, remaining.count(length))]
+        return key
+
+    def __tick(self) -> None:
+        """
+        Считает узел поиска и прерывает поиск, если вышло время или число узлов.
+        """
+        self.last_nodes += 1
+        if self.max_nodes is not None and self.last_nodes > self.max_nodes:
+            raise _OutOfTime
+        if self.__deadline is not None and time.perf_counter() >= self.__deadline:
+            raise _OutOfTime
+
+    def __search(self, members, shot: int, hits: int, remaining: tuple, key: int, bound: float) -> float:
+        """
+        Возвращает ожидаемое число выстрелов до уничтожения всех кораблей, если оно меньше bound,
+        иначе — какое-нибудь значение не меньше bound.
+        Аргументы:
+            members: номера расстановок, совместимых с позицией
+            shot (int): маска блоков, в которые уже стреляли
+            hits (int): маска подбитых блоков оставшихся кораблей (включая уничтоженные при поиске)
+            remaining (кортеж): длины кораблей, не уничтоженных к этой позиции
+            key (int): ключ Zobrist позиции
+            bound (float): значение, больше которого результат не нужен
+        """
+        lower = self.__total - hits.bit_count()
+        if not lower or len(members) == 1:
+            # Every remaining block of the only arrangement is a sure hit
+            return lower
+        entry = self.table.get(key)
+        if entry is not None and (entry[1] or entry[0] >= bound):
+            return entry[0]
+        self.__tick()
+        nodes_before = self.last_nodes
+        total = len(members)
+        counts = self.__counts(members, shot)
+        certain = [cell for cell, count in counts.items() if count == total]
+        candidates = [min(certain)] if certain else sorted(counts, key=lambda cell: (-counts[cell], cell))
+        best = bound
+        best_cell = None
+        for cell in candidates:
+            outcomes = self.__outcomes(members, cell, hits)
+            # Optimistic value: every part needs only its remaining hits
+            value = 1 + sum(len(part) * (lower - (outcome is not None)) for outcome, part in outcomes) / total
+            if value >= best - EPSILON:
+                continue
+            for outcome, part in outcomes:
+                weight = len(part) / total
+                child_lower = lower - (outcome is not None)
+                value -= weight * child_lower
+                child_value = self.__search(
+                    part, *self.__child(cell, outcome, shot, hits, remaining, key), (best - value) / weight
+                )
+                value += weight * child_value
+                if value >= best - EPSILON:
+                    break
+            else:
+                best = value
+                best_cell = cell
+        self.table.store(key, best, best_cell is not None, best_cell, self.last_nodes - nodes_before + 1)
+        return best
+
+    def __outcomes(self, members, cell: int, hits: int) -> list:
+        """
+        Делит расстановки по исходу выстрела в блок cell: None — промах, 0 — попадание,
+        маска корабля — уничтожение этого корабля. Части отсортированы от большей к меньшей.
+        """
+        bit = 1 << cell
+        hits |= bit
+        parts = {}
+        for member in members:
+            ship = self.__ship_of[member].get(cell)
+            if ship is None:
+                outcome = None
+            else:
+                outcome = ship if not ship & ~hits else 0
+            parts.setdefault(outcome, []).append(member)
+        return sorted(parts.items(), key=lambda item: -len(item[1]))
+
+    def __child(self, cell: int, outcome: Optional[int], shot: int, hits: int, remaining: tuple, key: int) -> tuple:
+        """
+        Возвращает (shot, hits, remaining, key) позиции после выстрела в cell с исходом outcome.
+        """
+        bit = 1 << cell
+        if outcome is None:
+            return shot | bit, hits, remaining, key ^ self.__cell_keys[MISS][cell]
+        if not outcome:
+            return shot | bit, hits | bit, remaining, key ^ self.__cell_keys[HIT][cell]
+        for ship_cell in iter_indexes(outcome):
+            if ship_cell != cell:
+                key ^= self.__cell_keys[HIT][ship_cell]
+            key ^= self.__cell_keys[SUNK][ship_cell]
+        length = outcome.bit_count()
+        count = remaining.count(length)
+        key ^= self.__fleet_keys[(length, count)] ^ self.__fleet_keys[(length, count - 1)]
+        position = remaining.index(length)
+        return shot | bit, hits | bit, remaining[:position] + remaining[position + 1 :], key
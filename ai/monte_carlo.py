@@ -0,0 +1,199 @@
+"""Monte Carlo shooter: samples fleets consistent with the shots so far on a process pool."""
+
+import os
+import random
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from typing import Optional
+
+from ai.density import DensityShooter
+from elements.bitboard import iter_indexes
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.fleet_generator import random_set_bit
+from elements.placements import placement_index
+
+# Extra time given to the workers on top of the budget before their results are ignored
+RESULT_GRACE_TIME = 0.05
+# Fleets drawn between two checks of the clock
+SAMPLE_BATCH = 64
+
+
+def sample_occupancy(
+    remaining: tuple,
+    alive: dict,
+    unsunk_hits: int,
+    time_budget: float,
+    seed: int,
+    attempts: Optional[int] = None,
+    board: BoardConfig = DEFAULT_BOARD,
+) -> tuple:
+    """
+    Выбирает случайные расстановки оставшихся кораблей, совместимые с наблюдениями,
+    пока не выйдет время (или не будет сделано attempts попыток), и считает, сколько раз
+    каждый блок был занят кораблем.
+    Функция верхнего уровня, чтобы её можно было запускать в другом процессе.
+    Аргументы:
+        remaining (кортеж): длины ещё не уничтоженных кораблей, от большего к меньшему
+        alive (словарь): длина корабля -> множество положений, совместимых с наблюдениями
+        unsunk_hits (int): маска подбитых, но не уничтоженных блоков (все должны быть покрыты)
+        time_budget (float): время на выборку в секундах
+        seed (int): зерно генератора случайных чисел
+        attempts (int, необязательный): точное число попыток вместо ограничения по времени;
+                тогда результат зависит только от seed
+        board (BoardConfig): размеры сетки
+    Возвращает:
+        tuple: (список счетчиков по блокам, число подходящих расстановок)
+    """
+    rng = random.Random(seed)
+    index = placement_index(board)
+    lengths = tuple(alive)
+    occupancy = [0] * board.cells
+    samples = 0
+    deadline = time.perf_counter() + time_budget
+    attempts_left = attempts
+    while True:
+        if attempts_left is None:
+            if time.perf_counter() >= deadline:
+                break
+            batch = SAMPLE_BATCH
+        else:
+            if attempts_left <= 0:
+                break
+            batch = min(SAMPLE_BATCH, attempts_left)
+            attempts_left -= batch
+        for _ in range(batch):
+            legal = dict(alive)
+            occupied = 0
+            ships = []
+            for length in remaining:
+                candidates = legal[length]
+                if not candidates:
+                    break
+                number = random_set_bit(candidates, rng)
+                occupied |= index.placement(length, number)[0]
+                ships.append((length, number))
+                ship_conflicts = index.conflicts(length, number, lengths)
+                for key in legal:
+                    legal[key] &= ~ship_conflicts[key]
+            else:
+                if occupied & unsunk_hits == unsunk_hits:
+                    samples += 1
+                    for length, number in ships:
+                        for cell in index.cells_of(length, number):
+                            occupancy[cell] += 1
+    return occupancy, samples
+
+
+class MonteCarloShooter:
+    """
+    Сильный компьютерный стрелок: на каждом ходу набирает много случайных расстановок флота,
+    совместимых с промахами, попаданиями и уничтоженными кораблями, и стреляет в блок,
+    который чаще всего оказывался занят. Выборка распределяется по пулу процессов
+    и ограничена временем на ход. Наблюдения ведет встроенный DensityShooter, он же
+    выбирает выстрел, если ни одной подходящей расстановки найти не удалось.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сетки противника
+        offset (int): Где начинается сетка противника (количество блоков), по умолчанию board.human_offset
+        time_budget (float): время на выбор одного выстрела в секундах
+        workers (int): число процессов; 0 — выборка в текущем процессе
+        executor (Executor, необязательный): общий пул процессов (например, один на весь сервер);
+                такой пул не останавливается в close()
+        attempts (int или None): число попыток выборки на процесс вместо time_budget; с потоком rng
+                (elements.rng.RngStream) выстрелы тогда повторяются бит в бит
+        last_samples (int): число расстановок, найденных на последнем ходу
+    ----------
+    Методы:
+        reset(), next_shot(), register_shot(fired_block, hit, destroyed_ship): см. game_logic.GameState
+        close(): останавливает пул процессов
+    """
+
+    def __init__(
+        self,
+        offset: Optional[int] = None,
+        *,
+        fleet: Optional[tuple] = None,
+        time_budget: float = 0.1,
+        workers: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+        executor: Optional[Executor] = None,
+        attempts: Optional[int] = None,
+        board: BoardConfig = DEFAULT_BOARD,
+    ) -> None:
+        self.board = board
+        self.offset = board.human_offset if offset is None else offset
+        self.time_budget = time_budget
+        self.attempts = attempts
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.rng = rng or random
+        self.observations = DensityShooter(offset, fleet=fleet, rng=rng, board=board)
+        self.last_samples = 0
+        self.__pool = executor
+        self.__owns_pool = executor is None
+
+    def reset(self) -> None:
+        """
+        Сбрасывает наблюдения перед новой партией (пул процессов сохраняется).
+        """
+        self.observations.reset()
+
+    def register_shot(self, fired_block: tuple, hit: bool, destroyed_ship: Optional[list] = None) -> None:
+        """
+        Учитывает результат выстрела (см. DensityShooter.register_shot).
+        """
+        self.observations.register_shot(fired_block, hit, destroyed_ship)
+
+    def next_shot(self) -> tuple:
+        """
+        Возвращает блок, чаще всего занятый кораблем в найденных расстановках.
+        """
+        occupancy, self.last_samples = self.__sample()
+        if not self.last_samples:
+            return self.observations.next_shot()
+        for cell in iter_indexes(self.observations.fired):
+            occupancy[cell] = -1
+        best_count = max(occupancy)
+        best_cells = [cell for cell, count in enumerate(occupancy) if count == best_count]
+        return self.board.index_to_block(self.rng.choice(best_cells), self.offset)
+
+    def close(self) -> None:
+        """
+        Останавливает собственный пул процессов (общий пул, переданный в executor, не трогает).
+        """
+        if self.__pool is not None and self.__owns_pool:
+            self.__pool.shutdown(cancel_futures=True)
+            self.__pool = None
+
+    def __sample(self) -> tuple:
+        """
+        Запускает выборку на всех процессах и складывает счетчики.
+        """
+        observations = self.observations
+        remaining = tuple(
+            length
+            for length in sorted(observations.remaining, reverse=True)
+            for _ in range(observations.remaining[length])
+        )
+        alive = {length: observations.alive[length] for length in set(remaining)}
+        arguments = (remaining, alive, observations.unsunk_hits, self.time_budget)
+        if not self.workers:
+            return sample_occupancy(*arguments, self.rng.randrange(2**63), self.attempts, self.board)
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(self.workers)
+        futures = [
+            self.__pool.submit(sample_occupancy, *arguments, self.rng.randrange(2**63), self.attempts, self.board)
+            for _ in range(self.workers)
+        ]
+        # With a fixed number of attempts every worker's result is needed for a reproducible shot
+        timeout = None if self.attempts is not None else self.time_budget + RESULT_GRACE_TIME
+        done, not_done = wait(futures, timeout=timeout)
+        for future in not_done:
+            future.cancel()
+        occupancy = [0] * self.board.cells
+        samples = 0
+        for future in done:
+            worker_occupancy, worker_samples = future.result()
+            samples += worker_samples
+            for cell, count in enumerate(worker_occupancy):
+                occupancy[cell] += count
+        return occupancy, samples
@@ -0,0 +1,47 @@
+"""Runs the benchmark suite and prints JSON: python -m benchmarks --games 1000 > bench.json"""
+
+import argparse
+import json
+import platform
+import sys
+
+from benchmarks.suite import SHOOTERS, bench_boards, bench_computer_clears_fleet, bench_games, bench_startup
+from elements.rng import RngStream
+
+
+def main() -> None:
+    """
+    Запускает все замеры и печатает результаты в JSON с отсортированными ключами,
+    чтобы файлы разных коммитов можно было сравнивать через diff.
+    """
+    parser = argparse.ArgumentParser(description="BattleShip benchmarks")
+    parser.add_argument("--games", type=int, default=500, help="number of games per benchmark")
+    parser.add_argument("--boards", type=int, default=5000, help="number of AutoShips boards")
+    parser.add_argument("--shooter", choices=sorted(SHOOTERS), default="default", help="computer shooter")
+    parser.add_argument("--startup-runs", type=int, default=3, help="cold starts of the game to time (0 - skip)")
+    parser.add_argument("--seed", type=int, default=0, help="root seed of all random streams")
+    parser.add_argument("--workers", type=int, default=0, help="processes for the games benchmark (0 - no pool)")
+    parser.add_argument("--output", help="write JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    games_rng, boards_rng, fleet_rng = RngStream(args.seed).spawn(3)
+    results = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        # The output path is not a parameter of the run: results written to different files must compare equal
+        "parameters": {name: value for name, value in vars(args).items() if name != "output"},
+        "games": bench_games(args.games, args.shooter, rng=games_rng, workers=args.workers),
+        "boards": bench_boards(args.boards, rng=boards_rng),
+        "computer_vs_fleet": bench_computer_clears_fleet(args.games, args.shooter, rng=fleet_rng),
+    }
+    if args.startup_runs:
+        results["startup"] = bench_startup(args.startup_runs)
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Benchmarks for the shooting AI, fleet placement, whole-game throughput and startup time."""
+
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ai import DensityShooter
+from elements.autoships import AutoShips
+from elements.board import DEFAULT_BOARD
+from elements.fleet import Fleet
+from elements.rng import RngStream
+from game_logic import GameState, check_hit_or_miss, computer_shoots
+from simulation.engine import play_game
+
+PERCENTILES = (50, 90, 99)
+# Computer shooters by name (None - the default computer_shoots logic); each is created with its own stream
+SHOOTERS = {
+    "default": None,
+    "density": DensityShooter,
+}
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_PROBE = "import time; start = time.perf_counter(); import graphics; print(time.perf_counter() - start)"
+
+
+def percentiles(samples: list) -> dict:
+    """
+    Возвращает перцентили PERCENTILES, минимум и максимум выборки (в исходных единицах).
+    """
+    ordered = sorted(samples)
+    result = {f"p{p}": ordered[min(len(ordered) - 1, len(ordered) * p // 100)] for p in PERCENTILES}
+    result["min"] = ordered[0]
+    result["max"] = ordered[-1]
+    return result
+
+
+def latency_summary(samples: list) -> dict:
+    """
+    Переводит задержки вызовов из секунд в микросекунды и считает перцентили.
+    """
+    summary = {f"{key}_us": round(value * 1e6, 3) for key, value in percentiles(samples).items()}
+    summary["calls"] = len(samples)
+    summary["mean_us"] = round(sum(samples) / len(samples) * 1e6, 3)
+    return summary
+
+
+def make_shooter(shooter: str, rng: RngStream):
+    """
+    Создает стрелка компьютера по имени из SHOOTERS с потоком rng (None для стандартной логики).
+    """
+    shooter_class = SHOOTERS[shooter]
+    return None if shooter_class is None else shooter_class(rng=rng)
+
+
+def play_seeded_game(shooter: str, rng: RngStream) -> tuple:
+    """
+    Играет одну партию, в которой все случайные решения берутся из потока rng.
+    Функция верхнего уровня, чтобы её можно было запускать в другом процессе.
+    Возвращает:
+        tuple: (победитель, число выстрелов победителя)
+    """
+    shooter_rng, game_rng = rng.spawn(2)
+    result = play_game(computer_shooter=make_shooter(shooter, shooter_rng), rng=game_rng)
+    return result.winner, result.human_shots if result.winner == "human" else result.computer_shots
+
+
+def bench_games(games: int, shooter: str = "default", *, rng: RngStream, workers: int = 0) -> dict:
+    """
+    Играет games партий компьютер против компьютера и возвращает скорость и распределение
+    количества выстрелов победителя. Каждая партия получает свой поток из rng, поэтому результаты
+    (кроме скорости) совпадают бит в бит при любом числе процессов workers.
+    """
+    streams = rng.spawn(games)
+    start = time.perf_counter()
+    if workers:
+        with ProcessPoolExecutor(workers) as pool:
+            chunksize = max(1, games // workers // 4)
+            results = list(pool.map(play_seeded_game, [shooter] * games, streams, chunksize=chunksize))
+    else:
+        results = [play_seeded_game(shooter, stream) for stream in streams]
+    elapsed = time.perf_counter() - start
+    wins = Counter(winner for winner, _ in results)
+    shots_to_win = [shots for _, shots in results]
+    return {
+        "games": games,
+        "games_per_second": round(games / elapsed, 3),
+        "wins": dict(sorted(wins.items())),
+        "shots_to_win": {
+            "mean": round(sum(shots_to_win) / games, 3),
+            **percentiles(shots_to_win),
+            "histogram": dict(sorted(Counter(shots_to_win).items())),
+        },
+    }
+
+
+def bench_boards(boards: int, *, rng: RngStream) -> dict:
+    """
+    Измеряет скорость создания флотов через AutoShips(offset).
+    """
+    latencies = []
+    start = time.perf_counter()
+    for number in range(boards):
+        call_start = time.perf_counter()
+        AutoShips(DEFAULT_BOARD.human_offset * (number % 2), rng=rng)
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+    return {
+        "boards": boards,
+        "boards_per_second": round(boards / elapsed, 3),
+        "AutoShips": latency_summary(latencies),
+    }
+
+
+def bench_computer_clears_fleet(games: int, shooter: str = "default", *, rng: RngStream) -> dict:
+    """
+    Компьютер стреляет по флоту игрока до его полного уничтожения.
+    Возвращает задержки computer_shoots и check_hit_or_miss и распределение числа выстрелов.
+    """
+    shooter_rng, shots_rng, fleets_rng = rng.spawn(3)
+    state = GameState(make_shooter(shooter, shooter_rng), shots_rng)
+    shoots_latencies = []
+    check_latencies = []
+    shots_to_clear = []
+    computer = AutoShips(0, rng=fleets_rng)
+    for _ in range(games):
+        state.reset()
+        human = AutoShips(DEFAULT_BOARD.human_offset, rng=fleets_rng)
+        human_fleet = Fleet(human.ships)
+        shots = 0
+        while human.ships_set:
+            call_start = time.perf_counter()
+            fired_block = computer_shoots(state)
+            call_end = time.perf_counter()
+            check_hit_or_miss(
+                state=state,
+                fired_block=fired_block,
+                opponents_fleet=human_fleet,
+                computer_turn=True,
+                opponents_ships_set=human.ships_set,
+                computer=computer,
+            )
+            check_latencies.append(time.perf_counter() - call_end)
+            shoots_latencies.append(call_end - call_start)
+            shots += 1
+        shots_to_clear.append(shots)
+    return {
+        "games": games,
+        "shots_to_clear_fleet": {"mean": round(sum(shots_to_clear) / games, 3), **percentiles(shots_to_clear)},
+        "computer_shoots": latency_summary(shoots_latencies),
+        "check_hit_or_miss": latency_summary(check_latencies),
+    }
+
+
+def bench_startup(runs: int) -> dict:
+    """
+    Запускает новые процессы runs раз и измеряет время импорта graphics (как у инструментов, которым
+    окно не нужно) и время от запуска main.py до первого кадра (с SDL_VIDEODRIVER=dummy).
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    import_times = []
+    first_frame_times = []
+    for _ in range(runs):
+        probe = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        import_times.append(float(probe.stdout))
+        start = time.perf_counter()
+        with subprocess.Popen(
+            [sys.executable, "main.py", "--startup-report"],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        ) as game:
+            for line in game.stderr:
+                if line.startswith("first frame"):
+                    first_frame_times.append(time.perf_counter() - start)
+                    break
+            game.kill()
+        if len(first_frame_times) < len(import_times):
+            raise RuntimeError("main.py exited before drawing the first frame")
+    return {
+        "runs": runs,
+        "import_graphics": {f"{key}_ms": round(value * 1e3, 3) for key, value in percentiles(import_times).items()},
+        "first_frame": {f"{key}_ms": round(value * 1e3, 3) for key, value in percentiles(first_frame_times).items()},
+    }
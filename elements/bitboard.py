@@ -0,0 +1,164 @@
+"""Helpers for bit masks of grid blocks, and a bitboard of one grid used only to replay recorded games."""
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+
+# Results of a shot
+MISS = 0
+HIT = 1
+SUNK = 2
+
+
+def blocks_to_mask(blocks, offset: int, board: BoardConfig = DEFAULT_BOARD) -> int:
+    """
+    Собирает битовую маску из набора координат блоков.
+    """
+    mask = 0
+    for block in blocks:
+        mask |= 1 << board.block_to_index(block, offset)
+    return mask
+
+
+def iter_indexes(mask: int):
+    """
+    Перебирает номера установленных битов маски от младшего к старшему.
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def mask_to_blocks(mask: int, offset: int, board: BoardConfig = DEFAULT_BOARD) -> set:
+    """
+    Превращает битовую маску в набор кортежей координат (тонкое представление для отрисовки).
+    """
+    return {board.index_to_block(index, offset) for index in iter_indexes(mask)}
+
+
+class BitBoard:
+    """
+    Сетка одного игрока в виде целых чисел (по биту на блок, 100 бит для сетки 10x10).
+    Живая игра, сервер и симуляции разбирают выстрелы правилами game_logic над наборами GameState;
+    BitBoard проигрывает уже известные партии (simulation.game_log.Replay), где нужны только результаты выстрелов
+    и быстрые снимки состояния.
+    ----------
+    Атрибуты:
+        offset (int): Где начинается сетка (количество блоков)
+                (обычно 0 для компьютера и 15 для человека)
+        board (BoardConfig): размеры сетки
+        ship_masks (список целых): маска каждого корабля в порядке списка кораблей
+        ships_mask (int): все блоки, занятые кораблями
+        hits (int): блоки, в которые попали
+        misses (int): блоки, в которые стреляли и промахнулись
+        blocked (int): блоки вокруг попаданий и уничтоженных кораблей, где кораблей быть не может
+        destroyed_ships (список целых): номера уничтоженных кораблей в порядке уничтожения
+    ----------
+    Методы:
+        fire(block): стреляет по блоку, возвращает MISS, HIT или SUNK
+        fire_index(index): то же самое, но по номеру бита (без кортежей)
+        snapshot(), restore(snapshot): сохраняет и восстанавливает результаты выстрелов
+    Свойства hit_blocks, dotted_set и ships_set возвращают наборы кортежей,
+    совместимые с наборами из game_logic (например, чтобы нарисовать воспроизводимую партию).
+    """
+
+    def __init__(self, ships: list[list], offset: int, board: BoardConfig = DEFAULT_BOARD) -> None:
+        self.offset = offset
+        self.board = board
+        self.ship_masks = [blocks_to_mask(ship, offset, board) for ship in ships]
+        self.ships_mask = 0
+        self.__ship_by_index = {}
+        for ship_number, ship_mask in enumerate(self.ship_masks):
+            self.ships_mask |= ship_mask
+            for index in iter_indexes(ship_mask):
+                self.__ship_by_index[index] = ship_number
+        self.hits = 0
+        self.misses = 0
+        self.blocked = 0
+        self.destroyed_ships = []
+
+    def fire(self, block: tuple) -> int:
+        """
+        Стреляет по блоку с координатами block.
+        Возвращает:
+            int: MISS, HIT или SUNK
+        """
+        return self.fire_index(self.board.block_to_index(block, self.offset))
+
+    def fire_index(self, index: int) -> int:
+        """
+        Стреляет по блоку с номером index. При попадании закрывает диагональные блоки,
+        при уничтожении корабля — все блоки вокруг него.
+        Повторный выстрел по уже подбитому блоку считается промахом и ничего не меняет.
+        Возвращает:
+            int: MISS, HIT или SUNK
+        """
+        bit = 1 << index
+        if not bit & self.ships_mask or bit & self.hits:
+            if not bit & self.hits:
+                self.misses |= bit
+            return MISS
+        self.hits |= bit
+        ship_number = self.__ship_by_index[index]
+        ship_mask = self.ship_masks[ship_number]
+        if ship_mask & ~self.hits:
+            self.blocked = (self.blocked | self.board.diagonal_halo(bit)) & ~self.hits
+            return HIT
+        self.blocked = (self.blocked | self.board.halo(ship_mask)) & ~self.hits
+        self.destroyed_ships.append(ship_number)
+        return SUNK
+
+    def snapshot(self) -> tuple:
+        """
+        Возвращает результаты выстрелов по сетке в виде неизменяемого кортежа (несколько целых чисел).
+        """
+        return self.hits, self.misses, self.blocked, tuple(self.destroyed_ships)
+
+    def restore(self, snapshot: tuple) -> None:
+        """
+        Возвращает сетку к состоянию, сохраненному snapshot() (корабли должны быть теми же).
+        """
+        self.hits, self.misses, self.blocked, destroyed_ships = snapshot
+        self.destroyed_ships = list(destroyed_ships)
+
+    @property
+    def fired(self) -> int:
+        """Все блоки, в которые уже стреляли."""
+        return self.hits | self.misses
+
+    @property
+    def unavailable(self) -> int:
+        """Блоки, стрелять по которым больше не имеет смысла."""
+        return self.hits | self.misses | self.blocked
+
+    @property
+    def remaining(self) -> int:
+        """Ещё не подбитые блоки кораблей."""
+        return self.ships_mask & ~self.hits
+
+    @property
+    def is_defeated(self) -> bool:
+        """True, если все корабли уничтожены."""
+        return not self.remaining
+
+    @property
+    def hit_blocks(self) -> set:
+        """Набор подбитых блоков, как hit_blocks в game_logic."""
+        return mask_to_blocks(self.hits, self.offset, self.board)
+
+    @property
+    def dotted_set(self) -> set:
+        """Набор блоков с точками (промахи и блоки вокруг попаданий), как dotted_set в game_logic."""
+        return mask_to_blocks((self.misses | self.blocked) & ~self.hits, self.offset, self.board)
+
+    @property
+    def ships_set(self) -> set:
+        """Набор ещё не подбитых блоков кораблей, как ships_set у AutoShips."""
+        return mask_to_blocks(self.remaining, self.offset, self.board)
+
+    def destroyed_ships_blocks(self) -> list:
+        """
+        Возвращает уничтоженные корабли в виде списков координат (для draw_ships).
+        """
+        return [
+            sorted(mask_to_blocks(self.ship_masks[number], self.offset, self.board)) for number in self.destroyed_ships
+        ]
@@ -0,0 +1,134 @@
+"""Board dimensions and fleet composition, with bitmask geometry for grids of any size."""
+
+from collections import Counter
+
+from elements.constants import BOARD_HEIGHT, BOARD_WIDTH, FLEET, GRID_GAP
+
+
+class BoardConfig:
+    """
+    Размеры сетки и состав флота одного варианта игры. Бит i маски сетки описывает блок
+    (offset + i % width + 1, i // width + 1); маски строк и столбцов считаются один раз при создании,
+    поэтому сдвиги и соседи блоков стоят несколько операций над целым числом при любом размере сетки.
+    Объект неизменяемый и хешируемый, его можно использовать ключом кэша и передавать в другой процесс.
+    ----------
+    Атрибуты:
+        width, height (int): ширина и высота сетки в блоках
+        fleet (кортеж): длины кораблей от большего к меньшему
+        cells (int): число блоков сетки
+        full_mask (int): маска всех блоков сетки
+        human_offset (int): где начинается сетка игрока (сетка компьютера начинается с 0)
+    ----------
+    Методы:
+        block_to_index(block, offset), index_to_block(index, offset): перевод координат в номер бита и обратно
+        ships_count(length): сколько кораблей длины length во флоте
+        shift_horizontally(mask), shift_vertically(mask), halo(mask), diagonal_halo(mask): соседние блоки
+    """
+
+    def __init__(self, width: int = BOARD_WIDTH, height: int = BOARD_HEIGHT, fleet: tuple = FLEET) -> None:
+        if width < 1 or height < 1:
+            raise ValueError(f"Board size must be positive, got {width}x{height}")
+        fleet = tuple(sorted(fleet, reverse=True))
+        if not fleet or fleet[-1] < 1 or fleet[0] > max(width, height):
+            raise ValueError(f"Fleet {fleet} does not fit a {width}x{height} board")
+        self.width = width
+        self.height = height
+        self.fleet = fleet
+        self.cells = width * height
+        self.full_mask = (1 << self.cells) - 1
+        self.human_offset = width + GRID_GAP
+        left_column_mask = sum(1 << (row * width) for row in range(height))
+        self.__not_left_column_mask = self.full_mask & ~left_column_mask
+        self.__not_right_column_mask = self.full_mask & ~(left_column_mask << (width - 1))
+        self.__ships_count = Counter(fleet)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BoardConfig):
+            return NotImplemented
+        return (self.width, self.height, self.fleet) == (other.width, other.height, other.fleet)
+
+    def __hash__(self) -> int:
+        return hash((self.width, self.height, self.fleet))
+
+    def __reduce__(self) -> tuple:
+        return BoardConfig, (self.width, self.height, self.fleet)
+
+    def __repr__(self) -> str:
+        return f"BoardConfig(width={self.width}, height={self.height}, fleet={self.fleet})"
+
+    @property
+    def ship_lengths(self) -> tuple:
+        """Разные длины кораблей флота от большей к меньшей."""
+        return tuple(sorted(self.__ships_count, reverse=True))
+
+    def ships_count(self, length: int) -> int:
+        """
+        Возвращает, сколько кораблей длины length во флоте (0, если таких нет).
+        """
+        return self.__ships_count[length]
+
+    def contains(self, block: tuple, offset: int) -> bool:
+        """
+        Проверяет, что блок лежит на сетке, начинающейся с offset.
+        """
+        return offset < block[0] <= offset + self.width and 0 < block[1] <= self.height
+
+    def blocks(self, offset: int) -> list:
+        """
+        Возвращает все блоки сетки, начинающейся с offset, по столбцам.
+        """
+        return [(x, y) for x in range(1 + offset, self.width + 1 + offset) for y in range(1, self.height + 1)]
+
+    def block_to_index(self, block: tuple, offset: int) -> int:
+        """
+        Переводит координаты блока в номер бита на сетке, начинающейся с offset.
+        """
+        return (block[1] - 1) * self.width + block[0] - 1 - offset
+
+    def index_to_block(self, index: int, offset: int) -> tuple:
+        """
+        Переводит номер бита обратно в координаты блока на сетке, начинающейся с offset.
+        """
+        return index % self.width + 1 + offset, index // self.width + 1
+
+    def shift_horizontally(self, mask: int) -> int:
+        """
+        Возвращает блоки слева и справа от каждого блока маски (без переноса через край сетки).
+        """
+        return ((mask & self.__not_right_column_mask) << 1) | ((mask & self.__not_left_column_mask) >> 1)
+
+    def shift_vertically(self, mask: int) -> int:
+        """
+        Возвращает блоки сверху и снизу от каждого блока маски.
+        """
+        return ((mask << self.width) | (mask >> self.width)) & self.full_mask
+
+    def halo(self, mask: int) -> int:
+        """
+        Возвращает маску вместе со всеми соседними блоками (включая диагональные).
+        """
+        row = mask | self.shift_horizontally(mask)
+        return row | self.shift_vertically(row)
+
+    def diagonal_halo(self, mask: int) -> int:
+        """
+        Возвращает только диагональных соседей блоков маски.
+        """
+        return self.shift_horizontally(self.shift_vertically(mask))
+
+
+def parse_fleet(text: str) -> tuple:
+    """
+    Читает состав флота из строки: длины через запятую, повтор записывается как длина*количество.
+    Например, "4,3*2,2*3,1*4" — стандартный флот.
+    Исключения:
+        ValueError: строка не в этом формате
+    """
+    fleet = []
+    for part in text.split(","):
+        length, _, count = part.strip().partition("*")
+        fleet.extend([int(length)] * int(count or 1))
+    return tuple(sorted(fleet, reverse=True))
+
+
+DEFAULT_BOARD = BoardConfig()
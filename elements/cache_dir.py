@@ -0,0 +1,15 @@
+"""Where the files the game keeps between runs (font paths, precomputed openings) are stored."""
+
+import os
+
+
+def cache_path(name: str) -> str:
+    """
+    Возвращает путь к файлу name в каталоге кэша: $BATTLESHIP_CACHE_DIR, иначе $XDG_CACHE_HOME/battleship
+    или ~/.cache/battleship.
+    """
+    cache_dir = os.environ.get("BATTLESHIP_CACHE_DIR")
+    if not cache_dir:
+        xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        cache_dir = os.path.join(xdg_cache_home, "battleship")
+    return os.path.join(cache_dir, name)
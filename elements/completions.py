@@ -0,0 +1,551 @@
+"""Exact number of fleet completions of one grid and their occupancy per block, by a row-by-row frontier DP."""
+
+import json
+import os
+from functools import lru_cache
+from math import comb
+from typing import NamedTuple, Optional
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.cache_dir import cache_path
+from elements.placements import placement_index
+
+# How many results count_completions remembers (one per shot of a couple of games)
+COMPLETIONS_CACHE = 256
+# Profiles the forward pass may visit in one grid_completions call. With the backward pass and the meets one
+# costs 2-7 microseconds, so this is about a second per shot. The standard fleet on a 10x10 grid needs
+# some 2 million before the first shot, 50-250 thousand after 15 shots and under 20 thousand after 30
+COMPLETION_STATES = 200_000
+# Openings (no shots yet) of other boards and fleets are stored in this file of the cache directory
+OPENINGS_FILE = "openings.json"
+# The opening of the standard 10x10 board and fleet (about 20 seconds to compute): the number of fleets and
+# the occupancy of the top left quarter of the grid, the other quarters are its mirror images
+STANDARD_OPENING = (
+    (10, 10, (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)),
+    1855545978831780,
+    (
+        (438487728189216, 418064732753791, 475795243932227, 466986256514578, 459000540738806),
+        (418064732753791, 273993917558420, 311381164022639, 287231383839281, 287065521473363),
+        (475795243932227, 311381164022639, 378334135625502, 357367672536881, 361127137164792),
+        (466986256514578, 287231383839281, 357367672536881, 330652352790746, 334756626677764),
+        (459000540738806, 287065521473363, 361127137164792, 334756626677764, 338709200686772),
+    ),
+)
+# The transitions of one (width, longest ship) pair are forgotten when there are more than this many
+TRANSITIONS_CACHE = 1 << 20
+# Frontier codes of a column: no ship / a ship that does not go down / 2 * k + f is a ship going down
+# with k blocks so far, f = 1 while all of them are hits
+EMPTY = 0
+CLOSED = 1
+# Products of packed polynomials are taken in pieces of this many coefficients
+MEET_CHUNK_SLOTS = 8
+
+
+class Completions(NamedTuple):
+    """
+    Точное число расстановок оставшихся кораблей, совместимых с тем, что известно о сетке
+    ----------
+    Атрибуты:
+        total (int): число расстановок
+        occupancy (кортеж целых): для каждого бита сетки — в скольких расстановках блок занят кораблем
+                (occupancy[i] / total — точная вероятность корабля в блоке i)
+    """
+
+    total: int
+    occupancy: tuple
+
+
+class _FleetPolynomial:
+    """
+    Многочлены от числа уже поставленных кораблей каждой длины, упакованные в одно целое число.
+    Коэффициент при x1^a1 * x2^a2 * ... (a_j не больше, чем кораблей длины j осталось) хранится в слоте
+    с номером a1 + (t1 + 1) * (a2 + (t2 + 1) * ...), поэтому сложение многочленов — одно сложение целых,
+    а постановка корабля — маска и сдвиг. Слот вмещает произведение двух значений, поэтому точное число
+    расстановок по обе стороны границы — один коэффициент произведения двух целых.
+    """
+
+    def __init__(self, remaining: tuple, board: BoardConfig) -> None:
+        index = placement_index(board)
+        lengths = sorted(set(remaining))
+        counts = [remaining.count(length) for length in lengths]
+        # No coefficient exceeds the number of ways to choose every remaining ship among its placements
+        bound = 1
+        for length, count in zip(lengths, counts):
+            bound *= comb(index.all_placements(length).bit_count(), count)
+        self.slots = 1
+        for count in counts:
+            self.slots *= count + 1
+        self.slot_bits = 2 * bound.bit_length() + self.slots.bit_length()
+        slot = self.slot_mask = (1 << self.slot_bits) - 1
+        # Closing a ship of length l: drop the coefficients where all ships of that length are placed, shift the rest
+        self.closers = {}
+        stride = 1
+        for length, count in zip(lengths, counts):
+            keep = 0
+            for number in range(self.slots):
+                if number // stride % (count + 1) < count:
+                    keep |= slot << (number * self.slot_bits)
+            self.closers[length] = (keep, stride * self.slot_bits)
+            stride *= count + 1
+
+    def close(self, value: int, lengths: tuple) -> int:
+        """
+        Умножает многочлен value на корабли длин lengths (0, если таких кораблей не осталось).
+        """
+        for length in lengths:
+            closer = self.closers.get(length)
+            if closer is None:
+                return 0
+            value = (value & closer[0]) << closer[1]
+            if not value:
+                return 0
+        return value
+
+    def top(self, value: int) -> int:
+        """
+        Возвращает коэффициент value при старшем слоте — число расстановок, где поставлены все корабли.
+        """
+        return value >> ((self.slots - 1) * self.slot_bits) & self.slot_mask
+
+    def meet(self, before: int, after: int) -> int:
+        """
+        Возвращает число расстановок всего флота из частей before (корабли до границы) и after (после нее) —
+        коэффициент произведения при старшем слоте. Многочлены умножаются кусками по MEET_CHUNK_SLOTS слотов:
+        кусок before встречается только с одним куском after, а несколько коротких произведений
+        дешевле одного длинного.
+        """
+        bits = self.slot_bits
+        chunk_slots = min(MEET_CHUNK_SLOTS, self.slots)
+        chunk_mask = (1 << (chunk_slots * bits)) - 1
+        shift = (chunk_slots - 1) * bits
+        count = 0
+        for start in range(0, self.slots, chunk_slots):
+            part = before >> (start * bits) & chunk_mask
+            if part:
+                # Coefficient start + i of before meets coefficient slots - 1 - start - i of after
+                end = self.slots - start - chunk_slots
+                other = (after >> (end * bits) if end >= 0 else after << (-end * bits)) & chunk_mask
+                count += (part * other) >> shift & self.slot_mask
+        return count
+
+
+class _FrontierTransitions:
+    """
+    Переходы профиля при обработке одного блока сетки ширины width. Состояние — целое число: коды столбцов
+    (для столбцов левее текущего — блоки текущей строки, правее — предыдущей), бит занятости блока сверху
+    слева и открытый горизонтальный корабль 2 * h + f (h блоков, f = 1, пока все они подбиты).
+    Переходы не зависят от строки и оставшихся кораблей, поэтому запоминаются для всех вызовов.
+    """
+
+    def __init__(self, width: int, max_length: int) -> None:
+        self.width = width
+        self.max_length = max_length
+        self.code_bits = (2 * max_length + 1).bit_length()
+        self.profile_bits = width * self.code_bits
+        self.__tables = {}
+        self.__occupied = {}
+        self.__size = 0
+
+    def code(self, state: int, column: int) -> int:
+        """
+        Возвращает код столбца column в состоянии state.
+        """
+        return state >> (column * self.code_bits) & ((1 << self.code_bits) - 1)
+
+    def table(self, column: int, hit: int, empty: int) -> dict:
+        """
+        Возвращает словарь состояние -> переходы для блока в столбце column (hit — блок подбит,
+        empty — известно, что корабля нет); недостающие переходы добавляет successors.
+        """
+        key = (column, hit, empty)
+        table = self.__tables.get(key)
+        if table is None:
+            table = self.__tables[key] = {}
+        return table
+
+    def successors(self, table: dict, state: int, column: int, hit: int, empty: int) -> list:
+        """
+        Возвращает список (новое состояние, длины кораблей, законченных этим переходом) и запоминает его в table.
+        """
+        if self.__size >= TRANSITIONS_CACHE:
+            for other in self.__tables.values():
+                other.clear()
+            self.__occupied.clear()
+            self.__size = 0
+        self.__size += 1
+        successors = table[state] = self.__successors(state, column, hit, empty)
+        return successors
+
+    def __successors(self, state: int, column: int, hit: int, empty: int) -> list:
+        bits, profile_bits, max_length = self.code_bits, self.profile_bits, self.max_length
+        code_mask = (1 << bits) - 1
+        profile = state & ((1 << profile_bits) - 1)
+        corner = state >> profile_bits & 1
+        run = state >> (profile_bits + 1)
+        shift = column * bits
+        above = profile >> shift & code_mask
+        left = profile >> (shift - bits) & code_mask if column else EMPTY
+        above_right = profile >> (shift + bits) & code_mask if column + 1 < self.width else EMPTY
+        rest = profile & ~(code_mask << shift)
+        options = []
+        if not hit:
+            # No ship here: the horizontal ship on the left and the vertical one above end
+            closed = []
+            if run:
+                closed.append(run >> 1)
+            if above > CLOSED:
+                closed.append(above >> 1)
+            # A ship made of hits only would already have been reported sunk
+            if not (run & 1 or above > CLOSED and above & 1):
+                options.append((rest | (above != EMPTY) << profile_bits, tuple(closed)))
+        if not empty:
+            if above > CLOSED:
+                if left == EMPTY and above >> 1 < max_length:
+                    code = 2 * ((above >> 1) + 1) + (above & hit)
+                    options.append((rest | code << shift | 1 << profile_bits, ()))
+            elif above == EMPTY and not corner and above_right == EMPTY:
+                if run:
+                    if run >> 1 < max_length:
+                        longer = 2 * ((run >> 1) + 1) + (run & hit)
+                        options.append((rest | CLOSED << shift | longer << (profile_bits + 1), ()))
+                elif left == EMPTY:
+                    options.append((rest | (2 + hit) << shift, ()))
+                elif left >> 1 == 1 and max_length > 1:
+                    # The single block on the left, started in this row, turns out to be a horizontal ship
+                    rest &= ~(code_mask << (shift - bits))
+                    pair = 4 + (left & hit)
+                    options.append((rest | CLOSED << (shift - bits) | CLOSED << shift | pair << (profile_bits + 1), ()))
+        if column == self.width - 1:
+            options = [self.__end_row(state, closed) for state, closed in options]
+            options = [option for option in options if option is not None]
+        return options
+
+    def __end_row(self, state: int, closed: tuple):
+        """
+        Заканчивает строку: закрывает горизонтальный корабль у правого края.
+        """
+        run = state >> (self.profile_bits + 1)
+        if run & 1:
+            return None
+        profile = state & ((1 << self.profile_bits) - 1)
+        return profile, closed + (run >> 1,) if run else closed
+
+    def occupied_columns(self, state: int) -> tuple:
+        """
+        Возвращает столбцы, занятые кораблями в профиле state на границе строк (запоминает ответ).
+        """
+        columns = self.__occupied.get(state)
+        if columns is None:
+            columns = self.__occupied[state] = tuple(
+                column for column in range(self.width) if self.code(state, column) != EMPTY
+            )
+        return columns
+
+    def open_ships(self, state: int) -> tuple:
+        """
+        Возвращает длины вертикальных кораблей, не законченных к концу сетки (None, если один из них целиком подбит).
+        """
+        lengths = []
+        for column in range(self.width):
+            code = self.code(state, column)
+            if code > CLOSED:
+                if code & 1:
+                    return None
+                lengths.append(code >> 1)
+        return tuple(lengths)
+
+
+@lru_cache(maxsize=None)
+def _transitions(width: int, max_length: int) -> _FrontierTransitions:
+    """
+    Возвращает общие переходы для сеток ширины width и кораблей не длиннее max_length (одни на процесс).
+    """
+    return _FrontierTransitions(width, max_length)
+
+
+@lru_cache(maxsize=COMPLETIONS_CACHE)
+def count_completions(
+    remaining: tuple,
+    empty: int,
+    hits: int,
+    board: BoardConfig = DEFAULT_BOARD,
+    max_states: Optional[int] = None,
+) -> Optional[Completions]:
+    """
+    Считает точное число расстановок оставшихся кораблей по правилам AutoShips (корабли не касаются друг
+    друга даже углами), совместимых с выстрелами по сетке, и число расстановок, занимающих каждый блок.
+    Неизвестные блоки делятся на области, не касающиеся друг друга даже углами (_regions): корабли разных
+    областей не мешают друг другу, поэтому области обходятся по очереди, каждая — вдоль своей длинной стороны.
+    Внутри области блоки обходятся строка за строкой; состояние — только граница между обработанными
+    и необработанными блоками (профиль), а расстановки с одинаковым профилем складываются. Число кораблей
+    каждой длины не входит в состояние: значение состояния — многочлен от них (_FleetPolynomial).
+    Проход вперед дает значения на границах строк, проход назад — число продолжений тех же профилей,
+    и их произведение на границе после строки r дает занятость блоков строки r.
+    Время растет с числом профилей, то есть с числом неизвестных блоков (см. COMPLETION_STATES), поэтому
+    сетка без выстрелов не считается, а берется из opening_completions. Результаты запоминаются,
+    а переходы между профилями общие для всех вызовов.
+    Аргументы:
+        remaining (кортеж): длины ещё не уничтоженных кораблей
+        empty (int): маска блоков, где корабля точно нет (промахи, точки, блоки уничтоженных кораблей)
+        hits (int): маска подбитых блоков ещё не уничтоженных кораблей
+        board (BoardConfig): размеры сетки
+        max_states (int или None): наибольшее число профилей прохода вперед (None — без ограничения)
+    Возвращает:
+        Completions или None: число расстановок и занятость каждого блока; None, если проход вперед
+                превысил max_states
+    """
+    cells = board.cells
+    if not remaining:
+        return Completions(int(not hits), (0,) * cells)
+    if not empty and not hits:
+        return opening_completions(remaining, board, max_states)
+    return _count(remaining, empty, hits, board, max_states)
+
+
+def opening_completions(
+    remaining: tuple, board: BoardConfig = DEFAULT_BOARD, max_states: Optional[int] = None
+) -> Optional[Completions]:
+    """
+    Возвращает count_completions для сетки без выстрелов. Он одинаков во всех партиях с теми же сеткой
+    и флотом, поэтому считается не больше одного раза на машину: для стандартных записан в STANDARD_OPENING,
+    остальные сохраняются в файл OPENINGS_FILE каталога кэша (если файл не записать, результат не сохраняется).
+    Аргументы:
+        remaining (кортеж): длины кораблей
+        board (BoardConfig): размеры сетки
+        max_states (int или None): ограничение для подсчета, если результата ещё нет (см. count_completions)
+    Возвращает:
+        Completions или None: число расстановок и занятость каждого блока; None, если подсчет превысил max_states
+    """
+    remaining = tuple(sorted(remaining, reverse=True))
+    width, height = board.width, board.height
+    total, quarter = STANDARD_OPENING[1:]
+    if (width, height, remaining) == STANDARD_OPENING[0]:
+        return Completions(
+            total,
+            tuple(quarter[min(y, height - 1 - y)][min(x, width - 1 - x)] for y in range(height) for x in range(width)),
+        )
+    path = cache_path(OPENINGS_FILE)
+    key = f"{width}x{height}:{','.join(map(str, remaining))}"
+    openings = _load_openings(path)
+    stored = openings.get(key)
+    if isinstance(stored, list) and len(stored) == 2 and isinstance(stored[1], list) and len(stored[1]) == board.cells:
+        return Completions(stored[0], tuple(stored[1]))
+    completions = _count(remaining, 0, 0, board, max_states)
+    if completions is not None:
+        openings[key] = [completions.total, list(completions.occupancy)]
+        _save_openings(path, openings)
+    return completions
+
+
+def _load_openings(path: str) -> dict:
+    """
+    Читает сохраненные начала партий. Испорченный или недоступный файл считается пустым.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            openings = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return openings if isinstance(openings, dict) else {}
+
+
+def _save_openings(path: str, openings: dict) -> None:
+    """
+    Записывает начала партий в файл; если записать не удалось, они будут посчитаны снова при следующем запуске.
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(openings, file, sort_keys=True)
+        os.replace(temporary_path, path)
+    except OSError:
+        pass
+
+
+def _count(
+    remaining: tuple, empty: int, hits: int, board: BoardConfig, max_states: Optional[int]
+) -> Optional[Completions]:
+    """
+    Считает count_completions для непустого remaining, без запомненных результатов.
+    """
+    cells = board.cells
+    polynomial = _FleetPolynomial(remaining, board)
+    regions = _regions(remaining, empty, hits, board)
+
+    # Forward: the polynomials of every row boundary and the profiles inside every row (without values);
+    # a region starts from the polynomial of all regions before it
+    value = 1
+    boundaries = []
+    states = []
+    for transitions, rows in regions:
+        layer = {0: value}
+        for row in rows:
+            layer = _forward_row(layer, row, hits, transitions, polynomial, states)
+            boundaries.append(layer)
+            if max_states is not None and sum(map(len, states)) > max_states:
+                return None
+        value = sum(_close_open_ships(layer, transitions, polynomial).values())
+    occupancy = [0] * cells
+    total = polynomial.top(value)
+    if not total:
+        return Completions(0, tuple(occupancy))
+
+    # Backward: the polynomials of the completions of every profile, from the last row of the last region
+    value = 1
+    for transitions, rows in reversed(regions):
+        after = _close_open_ships(dict.fromkeys(boundaries[-1], value), transitions, polynomial)
+        for row in reversed(rows):
+            _meet_row(occupancy, row, boundaries.pop(), after, transitions, polynomial)
+            after = _backward_row(after, row, hits, transitions, polynomial, states)
+        value = after.get(0, 0)
+    return Completions(total, tuple(occupancy))
+
+
+def _regions(remaining: tuple, empty: int, hits: int, board: BoardConfig) -> list:
+    """
+    Делит блоки, где корабль ещё может стоять, на области, связные с учетом диагоналей, и пропускает области
+    без попаданий, в которые не помещается ни один корабль. Область обходится по строкам своего прямоугольника,
+    повернутого так, чтобы строки были не длиннее столбцов.
+    Возвращает:
+        list: пары (переходы для ширины области, строки — кортежи номеров битов, -1 вне области)
+    """
+    width = board.width
+    unknown = board.full_mask & ~empty
+    regions = []
+    while unknown:
+        region = unknown & -unknown
+        while True:
+            grown = board.halo(region) & unknown
+            if grown == region:
+                break
+            region = grown
+        unknown &= ~region
+        if not region & hits and region.bit_count() < min(remaining):
+            continue
+        columns = [bit % width for bit in range(region.bit_length()) if region >> bit & 1]
+        left, right = min(columns), max(columns)
+        top, bottom = ((region & -region).bit_length() - 1) // width, (region.bit_length() - 1) // width
+        grid = [
+            tuple(y * width + x if region >> (y * width + x) & 1 else -1 for x in range(left, right + 1))
+            for y in range(top, bottom + 1)
+        ]
+        if len(grid[0]) > len(grid):
+            grid = list(zip(*grid))
+        regions.append((_transitions(len(grid[0]), min(max(remaining), len(grid))), grid))
+    return regions
+
+
+def _close_open_ships(layer: dict, transitions: _FrontierTransitions, polynomial: _FleetPolynomial) -> dict:
+    """
+    Закрывает вертикальные корабли, открытые в профилях layer в конце области, и возвращает новые многочлены
+    профилей (без профилей, у которых не осталось расстановок).
+    """
+    closed_layer = {}
+    for state, value in layer.items():
+        closed = transitions.open_ships(state)
+        if closed is not None:
+            value = polynomial.close(value, closed)
+            if value:
+                closed_layer[state] = value
+    return closed_layer
+
+
+def _forward_row(
+    layer: dict,
+    row: tuple,
+    hits: int,
+    transitions: _FrontierTransitions,
+    polynomial: _FleetPolynomial,
+    states: list,
+) -> dict:
+    """
+    Переводит многочлены профилей layer (граница перед строкой row) на границу после нее
+    и добавляет в states профили перед каждым блоком строки (для прохода назад).
+    """
+    closers = polynomial.closers
+    for column, bit in enumerate(row):
+        hit, known_empty = (hits >> bit & 1, 0) if bit >= 0 else (0, 1)
+        table = transitions.table(column, hit, known_empty)
+        next_layer = {}
+        get = next_layer.get
+        for state, value in layer.items():
+            successors = table.get(state)
+            if successors is None:
+                successors = transitions.successors(table, state, column, hit, known_empty)
+            for next_state, closed in successors:
+                # polynomial.close, inlined: this loop runs millions of times on an almost blank grid
+                next_value = value
+                for length in closed:
+                    closer = closers.get(length)
+                    if closer is None:
+                        next_value = 0
+                        break
+                    next_value = (next_value & closer[0]) << closer[1]
+                if next_value:
+                    next_layer[next_state] = get(next_state, 0) + next_value
+        states.append(list(layer))
+        layer = next_layer
+    return layer
+
+
+def _backward_row(
+    after: dict,
+    row: tuple,
+    hits: int,
+    transitions: _FrontierTransitions,
+    polynomial: _FleetPolynomial,
+    states: list,
+) -> dict:
+    """
+    Переводит многочлены продолжений профилей after (граница после строки row) на границу перед ней,
+    проходя профили states каждого блока строки в обратном порядке.
+    """
+    closers = polynomial.closers
+    for column in range(len(row) - 1, -1, -1):
+        bit = row[column]
+        hit, known_empty = (hits >> bit & 1, 0) if bit >= 0 else (0, 1)
+        table = transitions.table(column, hit, known_empty)
+        get = after.get
+        previous = {}
+        for state in states.pop():
+            successors = table.get(state)
+            if successors is None:
+                # The transitions were forgotten after the forward pass filled the cache
+                successors = transitions.successors(table, state, column, hit, known_empty)
+            value = 0
+            for next_state, closed in successors:
+                next_value = get(next_state)
+                if next_value:
+                    for length in closed:
+                        closer = closers.get(length)
+                        if closer is None:
+                            next_value = 0
+                            break
+                        next_value = (next_value & closer[0]) << closer[1]
+                    value += next_value
+            if value:
+                previous[state] = value
+        after = previous
+    return after
+
+
+def _meet_row(
+    occupancy: list,
+    row: tuple,
+    before: dict,
+    after: dict,
+    transitions: _FrontierTransitions,
+    polynomial: _FleetPolynomial,
+) -> None:
+    """
+    Добавляет к occupancy занятость блоков строки row по многочленам до и после границы за ней
+    (на этой границе каждый профиль знает, какие блоки строки заняты).
+    """
+    for state, value in after.items():
+        columns = transitions.occupied_columns(state)
+        previous = before.get(state) if columns else None
+        if previous:
+            count = polynomial.meet(previous, value)
+            for column in columns:
+                occupancy[row[column]] += count
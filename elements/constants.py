@@ -15,11 +15,21 @@ UPPER_MARGIN = 2 * BLOCK_SIZE
 SIZE = (LEFT_MARGIN + 30 * BLOCK_SIZE, UPPER_MARGIN + 15 * BLOCK_SIZE)
 LETTERS = "ABCDEFGHIJ"
 
+# Default board: width and height of each grid (in blocks) and the gap between the two grids
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 10
+GRID_GAP = 5
+# Fleet: lengths of all ships of one player, from the largest to the smallest
+FLEET = (4, 3, 3, 2, 2, 2, 1, 1, 1, 1)
+
 # This ratio is purely for scaling the font according to the block size
 FONT_SIZE = int(BLOCK_SIZE / 1.5)
 GAME_OVER_FONT_SIZE = 3 * BLOCK_SIZE
 LINE_WIDTH = 1
 
+# Upper limit of redraws per second (e.g. while a ship is being dragged)
+FRAME_RATE = 60
+
 # Button constants
 AUTO_BUTTON_PLACE = LEFT_MARGIN + 17 * BLOCK_SIZE
 MANUAL_BUTTON_PLACE = LEFT_MARGIN + 20 * BLOCK_SIZE
@@ -0,0 +1,47 @@
+"""Index of one player's ships for constant-time shot resolution."""
+
+from typing import Optional
+
+
+class Fleet:
+    """
+    Индекс кораблей одной сетки: блок -> номер корабля и счетчики оставшихся попаданий.
+    Списки кораблей при стрельбе не изменяются.
+    ----------
+    Атрибуты:
+        ships (список списков): исходные корабли (в виде списков координат)
+        ship_ends (список кортежей): первый и последний блок каждого корабля (по возрастанию координат)
+        remaining_hits (список целых): сколько ещё попаданий нужно, чтобы уничтожить каждый корабль
+    ----------
+    Методы:
+        hit(block): отмечает попадание в блок, возвращает номер корабля или None при промахе
+        is_destroyed(number): уничтожен ли корабль с номером number
+    """
+
+    def __init__(self, ships: list[list]) -> None:
+        self.ships = ships
+        self.ship_ends = []
+        self.remaining_hits = []
+        self.__ship_by_block = {}
+        for number, ship in enumerate(ships):
+            self.ship_ends.append((min(ship), max(ship)))
+            self.remaining_hits.append(len(ship))
+            for block in ship:
+                self.__ship_by_block[block] = number
+
+    def hit(self, block: tuple) -> Optional[int]:
+        """
+        Отмечает попадание в блок. Повторный выстрел по подбитому блоку считается промахом.
+        Возвращает:
+            int или None: номер корабля, в который попали, или None при промахе
+        """
+        number = self.__ship_by_block.pop(block, None)
+        if number is not None:
+            self.remaining_hits[number] -= 1
+        return number
+
+    def is_destroyed(self, number: int) -> bool:
+        """
+        Возвращает True, если все блоки корабля с номером number подбиты.
+        """
+        return not self.remaining_hits[number]
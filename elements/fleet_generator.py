@@ -0,0 +1,208 @@
+"""Batch generation of legal fleets by the AutoShips rules, as bitmasks."""
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional
+
+from elements.bitboard import iter_indexes
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.placements import PlacementIndex, placement_index
+from elements.rng import RngStream
+
+# How many random placements are tried before picking from the explicit set of legal ones
+QUICK_TRIES = 8
+# Upper bound on placements tried for one fleet; the standard fleet needs about len(fleet)
+MAX_PLACEMENT_STEPS = 10_000
+# Upper bound on whole fleets drawn by the uniform sampler. The standard fleet on a 10x10 grid is accepted once
+# in about 3700 attempts of 3-4 microseconds, so it is never reached there (the chance is below 1e-100),
+# and a fleet that does not fit fails after a few seconds instead of never
+MAX_UNIFORM_ATTEMPTS = 1_000_000
+# random_set_bit scans masks of at most this many bits bit by bit
+SCAN_BITS = 32
+# generate_fleets draws every FLEETS_PER_STREAM fleets from their own stream, whatever the number of workers
+FLEETS_PER_STREAM = 1000
+
+
+def random_set_bit(bits: int, rng) -> int:
+    """
+    Возвращает номер случайного установленного бита (все биты равновероятны).
+    Длинные маски сначала делятся пополам по числу битов, так что выбор на сетке 100x100
+    не перебирает тысячи битов по одному.
+    """
+    target = rng.randrange(bits.bit_count())
+    shift = 0
+    while bits.bit_length() > SCAN_BITS:
+        half = bits.bit_length() >> 1
+        low = bits & ((1 << half) - 1)
+        low_count = low.bit_count()
+        if target < low_count:
+            bits = low
+        else:
+            target -= low_count
+            bits >>= half
+            shift += half
+    for number in iter_indexes(bits):
+        if not target:
+            return shift + number
+        target -= 1
+    raise ValueError("bits must not be empty")
+
+
+def sample_fleet(
+    rng: Optional[random.Random] = None,
+    fleet: Optional[tuple] = None,
+    *,
+    uniform: bool = False,
+    board: BoardConfig = DEFAULT_BOARD,
+) -> tuple:
+    """
+    Создает один флот по правилам AutoShips: корабли от большего к меньшему,
+    не касаются друг друга даже углами и не выходят за пределы сетки.
+    По умолчанию каждый корабль выбирается равновероятно среди положений, ещё допустимых
+    после предыдущих кораблей. Выбор никогда не повторяется, а в тупике поиск возвращается на один
+    корабль назад; поиск идет без рекурсии (флот может быть любым большим), а число попыток —
+    не больше MAX_PLACEMENT_STEPS.
+    С uniform=True все флоты равновероятны (выборка с отклонением по всем положениям, не больше
+    MAX_UNIFORM_ATTEMPTS флотов), но это намного медленнее: на стандартной сетке 10x10 около 15 мс на флот
+    против 0,1 мс без uniform, на более просторной сетке разница меньше.
+    Аргументы:
+        rng (Random, необязательный): генератор случайных чисел. По умолчанию модуль random.
+        fleet (кортеж, необязательный): длины кораблей от большего к меньшему. По умолчанию board.fleet.
+        uniform (bool): точное равномерное распределение флотов
+        board (BoardConfig): размеры сетки
+    Возвращает:
+        tuple: маски кораблей в порядке fleet
+    Исключения:
+        ValueError: флот не удалось разместить за MAX_PLACEMENT_STEPS попыток
+                (с uniform=True — за MAX_UNIFORM_ATTEMPTS флотов)
+    """
+    rng = rng or random
+    fleet = board.fleet if fleet is None else fleet
+    index = placement_index(board)
+    if uniform:
+        return _sample_uniform_fleet(rng, fleet, index)
+    lengths = tuple(set(fleet))
+    # candidates[depth]: placements of ship number depth not tried yet, legal[depth]: placements left for every length
+    legal = [{length: index.all_placements(length) for length in lengths}]
+    candidates = [legal[0][fleet[0]]]
+    ships = []
+    steps_left = MAX_PLACEMENT_STEPS
+    while candidates and steps_left:
+        if not candidates[-1]:
+            candidates.pop()
+            legal.pop()
+            if ships:
+                ships.pop()
+            continue
+        steps_left -= 1
+        length = fleet[len(ships)]
+        options = candidates[-1]
+        numbers = index.numbers(length)
+        for _ in range(QUICK_TRIES):
+            number = numbers[rng.randrange(len(numbers))]
+            if options >> number & 1:
+                break
+        else:
+            number = random_set_bit(options, rng)
+        candidates[-1] = options & ~(1 << number)
+        ships.append(index.placement(length, number)[0])
+        if len(ships) == len(fleet):
+            return tuple(ships)
+        conflicts = index.conflicts(length, number, lengths)
+        legal.append({key: value & ~conflicts[key] for key, value in legal[-1].items()})
+        candidates.append(legal[-1][fleet[len(ships)]])
+    raise ValueError(f"Could not place fleet {fleet} on the {board.width}x{board.height} grid")
+
+
+def _sample_uniform_fleet(rng, fleet: tuple, index: PlacementIndex) -> tuple:
+    """
+    Выбирает каждый корабль равновероятно среди всех его положений и начинает заново при первом касании.
+    Каждый допустимый флот получается с одной и той же вероятностью: все наборы положений равновероятны,
+    а отклонение только отбрасывает недопустимые. Число попыток ограничено MAX_UNIFORM_ATTEMPTS.
+    Исключения:
+        ValueError: ни одна из MAX_UNIFORM_ATTEMPTS попыток не дала допустимого флота
+    """
+    for _ in range(MAX_UNIFORM_ATTEMPTS):
+        blocked = 0
+        ships = []
+        for length in fleet:
+            ship_mask, ship_halo = index.placement(length, rng.choice(index.numbers(length)))
+            if ship_mask & blocked:
+                break
+            ships.append(ship_mask)
+            blocked |= ship_halo
+        else:
+            return tuple(ships)
+    raise ValueError(f"Could not sample fleet {fleet} on the {index.board.width}x{index.board.height} grid")
+
+
+def generate_fleets(
+    count: int,
+    *,
+    rng: Optional[random.Random] = None,
+    fleet: Optional[tuple] = None,
+    uniform: bool = False,
+    workers: int = 0,
+    board: BoardConfig = DEFAULT_BOARD,
+) -> list:
+    """
+    Создает count флотов за один вызов.
+    С потоком RngStream флоты делятся на части по FLEETS_PER_STREAM, и каждая часть получает
+    свой поток-потомок (rng.spawn), поэтому результат не зависит от числа процессов workers
+    и совпадает бит в бит при том же зерне.
+    Аргументы:
+        rng (Random, необязательный): генератор случайных чисел; для workers > 0 обычный Random
+                заменяется потоком RngStream с зерном из него. По умолчанию модуль random.
+        workers (int): число процессов; 0 — все флоты создаются в текущем процессе
+        board (BoardConfig): размеры сетки и флот по умолчанию
+    Возвращает:
+        list: кортежи масок кораблей (см. sample_fleet)
+    """
+    rng = rng or random
+    fleet = board.fleet if fleet is None else fleet
+    if not workers and not isinstance(rng, RngStream):
+        return [sample_fleet(rng, fleet, uniform=uniform, board=board) for _ in range(count)]
+    if not isinstance(rng, RngStream):
+        rng = RngStream(rng.getrandbits(64))
+    sizes = [min(FLEETS_PER_STREAM, count - start) for start in range(0, count, FLEETS_PER_STREAM)]
+    streams = rng.spawn(len(sizes))
+    arguments = (sizes, streams, repeat(fleet), repeat(uniform), repeat(board))
+    if not workers:
+        return [ships for chunk in map(_generate_chunk, *arguments) for ships in chunk]
+    with ProcessPoolExecutor(workers) as pool:
+        return [ships for chunk in pool.map(_generate_chunk, *arguments) for ships in chunk]
+
+
+def _generate_chunk(count: int, rng: RngStream, fleet: tuple, uniform: bool, board: BoardConfig) -> list:
+    """
+    Создает часть флотов generate_fleets из своего потока (функция верхнего уровня для пула процессов).
+    """
+    return [sample_fleet(rng, fleet, uniform=uniform, board=board) for _ in range(count)]
+
+
+def fleets_to_grid_bytes(fleets: list, board: BoardConfig = DEFAULT_BOARD) -> bytearray:
+    """
+    Упаковывает флоты в плотный буфер формы (N, height, width): один байт на блок, 1 — корабль, 0 — вода.
+    Буфер можно без копирования прочитать как
+    numpy.frombuffer(buffer, numpy.uint8).reshape(-1, board.height, board.width).
+    """
+    grids = bytearray(len(fleets) * board.cells)
+    for number, ships in enumerate(fleets):
+        start = number * board.cells
+        for ship in ships:
+            for index in iter_indexes(ship):
+                grids[start + index] = 1
+    return grids
+
+
+def fleet_to_ships(ships: tuple, offset: int, board: BoardConfig = DEFAULT_BOARD) -> list:
+    """
+    Переводит маски кораблей в список кораблей в формате AutoShips.ships.
+    Аргументы:
+        ships (кортеж): маски кораблей
+        offset (int): Где начинается сетка (количество блоков)
+                (обычно 0 для компьютера и 15 для человека)
+        board (BoardConfig): размеры сетки
+    """
+    return [[board.index_to_block(index, offset) for index in iter_indexes(ship)] for ship in ships]
@@ -0,0 +1,99 @@
+"""Precomputed parity/lattice hunt orders for the computer's random search phase."""
+
+import random
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+
+# Entries kept by hunt_order, one per (board, min_length, phase) key; a board takes one entry per length and phase
+HUNT_ORDER_CACHE = 64
+
+
+@lru_cache(maxsize=HUNT_ORDER_CACHE)
+def hunt_order(board: BoardConfig, min_length: int, phase: int) -> tuple:
+    """
+    Возвращает порядок поиска кораблей, самый короткий из которых имеет длину min_length.
+    Любой корабль длины не меньше min_length занимает блок решетки (x + y) % min_length == phase
+    (при min_length 2 это шахматная раскраска, при 3 — каждая третья диагональ), поэтому сначала идут
+    блоки решетки, а потом все остальные (на случай, если флот нарушает правила, например при расстановке
+    вручную). Внутри частей блоки перемешаны один раз генератором с постоянным зерном, так что таблица
+    одинакова во всех процессах. Номера битов хранятся в массиве из 2 или 4 байт на блок.
+    Аргументы:
+        board (BoardConfig): размеры сетки
+        min_length (int): длина самого короткого оставшегося корабля
+        phase (int): какая из min_length решеток идет первой (0 ... min_length - 1)
+    Возвращает:
+        tuple: (массив номеров битов всех блоков сетки, число блоков решетки в его начале)
+    """
+    shuffler = random.Random(f"hunt order {board.width}x{board.height} {min_length} {phase}")
+    lattice, rest = [], []
+    for index in range(board.cells):
+        x, y = index % board.width, index // board.width
+        (lattice if (x + y) % min_length == phase else rest).append(index)
+    shuffler.shuffle(lattice)
+    shuffler.shuffle(rest)
+    return array("H" if board.cells <= 1 << 16 else "I", lattice + rest), len(lattice)
+
+
+class HuntCursor:
+    """
+    Курсор по таблице hunt_order одной партии: выдает следующий блок поиска за амортизированно постоянное время,
+    без копирования набора доступных блоков. Решетка и место начала обхода в ней выбираются случайно,
+    когда меняется длина самого короткого оставшегося корабля; блоки, по которым уже стреляли или где стоят
+    точки, пропускаются. Каждую таблицу курсор проходит не больше одного раза, поэтому за партию он
+    просматривает не больше (число разных длин кораблей) x (число блоков) элементов.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сетки
+        offset (int): где начинается сетка, по которой ведется поиск
+    ----------
+    Методы:
+        next_block(available, rng, min_length): следующий блок поиска из available или None
+        copy(): независимая копия
+    """
+
+    def __init__(self, board: BoardConfig = DEFAULT_BOARD, offset: Optional[int] = None) -> None:
+        self.board = board
+        self.offset = board.human_offset if offset is None else offset
+        self.__min_length = None
+        self.__order = None
+        self.__lattice_size = 0
+        self.__start = 0
+        self.__position = 0
+
+    def next_block(self, available, rng, min_length: int) -> Optional[tuple]:
+        """
+        Возвращает следующий по таблице блок, который есть в available, и сдвигает курсор за него.
+        Аргументы:
+            available: блоки, по которым ещё можно стрелять (поддерживает in)
+            rng (Random): генератор для выбора решетки и начала обхода при смене min_length
+            min_length (int): длина самого короткого оставшегося корабля
+        Возвращает:
+            tuple или None: блок или None, если таблица пройдена до конца
+        """
+        if min_length != self.__min_length:
+            self.__min_length = min_length
+            self.__order, self.__lattice_size = hunt_order(self.board, min_length, rng.randrange(min_length))
+            self.__start = rng.randrange(self.__lattice_size) if self.__lattice_size else 0
+            self.__position = 0
+        order, lattice_size, start = self.__order, self.__lattice_size, self.__start
+        while self.__position < len(order):
+            position = self.__position
+            self.__position += 1
+            # The lattice part is walked from a random start and wrapped around, the rest in table order
+            if position < lattice_size:
+                position = (start + position) % lattice_size
+            block = self.board.index_to_block(order[position], self.offset)
+            if block in available:
+                return block
+        return None
+
+    def copy(self) -> "HuntCursor":
+        """
+        Возвращает независимую копию курсора (таблица общая).
+        """
+        cursor = HuntCursor.__new__(HuntCursor)
+        cursor.__dict__.update(self.__dict__)
+        return cursor
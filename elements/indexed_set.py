@@ -0,0 +1,82 @@
+"""Set of blocks with constant-time random choice."""
+
+from typing import Iterable, Iterator
+
+
+class IndexedSet:
+    """
+    Набор с добавлением, удалением и случайным выбором элемента за постоянное время.
+    Элементы хранятся в списке, а словарь помнит место каждого; при удалении на место элемента
+    переносится последний. rng.choice(tuple(set)) копирует весь набор на каждом выстреле,
+    что на сетке 100x100 стоит 10 000 операций на выстрел.
+    ----------
+    Методы:
+        add(item), discard(item), item in indexed_set, len(indexed_set), iter(indexed_set): как у set
+        difference_update(items), indexed_set -= items: удаляет все items
+        choice(rng): случайный элемент (набор не должен быть пуст)
+        copy(): независимая копия
+    """
+
+    def __init__(self, items: Iterable = ()) -> None:
+        self.__items = []
+        self.__positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item) -> None:
+        """
+        Добавляет элемент, если его ещё нет.
+        """
+        if item not in self.__positions:
+            self.__positions[item] = len(self.__items)
+            self.__items.append(item)
+
+    def discard(self, item) -> None:
+        """
+        Удаляет элемент, если он есть: на его место ставится последний элемент списка.
+        """
+        position = self.__positions.pop(item, None)
+        if position is None:
+            return
+        last = self.__items.pop()
+        if position < len(self.__items):
+            self.__items[position] = last
+            self.__positions[last] = position
+
+    def difference_update(self, items: Iterable) -> None:
+        """
+        Удаляет все элементы items (время пропорционально len(items), а не размеру набора).
+        """
+        for item in items:
+            self.discard(item)
+
+    def __isub__(self, items: Iterable) -> "IndexedSet":
+        self.difference_update(items)
+        return self
+
+    def choice(self, rng):
+        """
+        Возвращает случайный элемент, выбранный генератором rng.
+        """
+        return self.__items[rng.randrange(len(self.__items))]
+
+    def copy(self) -> "IndexedSet":
+        """
+        Возвращает независимую копию набора.
+        """
+        copied = IndexedSet()
+        copied.__items = self.__items.copy()
+        copied.__positions = self.__positions.copy()
+        return copied
+
+    def __contains__(self, item) -> bool:
+        return item in self.__positions
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.__items)
+
+    def __repr__(self) -> str:
+        return f"IndexedSet({self.__items!r})"
@@ -0,0 +1,88 @@
+"""Reference-counted occupancy of a grid for manual ship placement and undo."""
+
+from array import array
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+
+
+class OccupancyGrid:
+    """
+    Занятость блоков сетки при ручной расстановке кораблей. Для каждого блока хранится, сколько
+    поставленных кораблей занимают его или касаются его (счетчик в массиве, а не набор блоков).
+    Поэтому удаление корабля освобождает только те блоки, которых не касается ни один другой корабль,
+    а постановка, удаление и проверка корабля стоят O(длины корабля).
+    Массив окружен рамкой в один блок, так что соседей корабля у края сетки не нужно проверять на выход за край.
+    ----------
+    Атрибуты:
+        offset (int): Где начинается сетка (количество блоков), обычно 15
+        board (BoardConfig): размеры сетки
+    ----------
+    Методы:
+        place(ship): отмечает корабль и соседние блоки
+        remove(ship): снимает отметки корабля (например, при отмене)
+        can_place(ship): можно ли поставить корабль (на сетке и не касается других кораблей)
+        can_place_at(block, length, horizontal): то же для корабля длины length с первым блоком block
+                (для подсветки корабля под мышью на каждом кадре)
+        block in grid: занят ли блок кораблем или соседством с ним
+    """
+
+    def __init__(self, offset: int, board: BoardConfig = DEFAULT_BOARD) -> None:
+        self.offset = offset
+        self.board = board
+        self.__stride = board.width + 2
+        self.__counts = array("H", bytes(2 * self.__stride * (board.height + 2)))
+
+    def __index(self, x: int, y: int) -> int:
+        """
+        Номер блока (x, y) в массиве с рамкой.
+        """
+        return y * self.__stride + x - self.offset
+
+    def __update(self, ship: list, delta: int) -> None:
+        """
+        Прибавляет delta к счетчикам корабля и всех соседних блоков (прямоугольник вокруг прямого корабля).
+        """
+        x_min, y_min = min(ship)
+        x_max, y_max = max(ship)
+        counts = self.__counts
+        for y in range(y_min - 1, y_max + 2):
+            start = self.__index(x_min - 1, y)
+            for index in range(start, start + x_max - x_min + 3):
+                counts[index] += delta
+
+    def place(self, ship: list) -> None:
+        """
+        Отмечает блоки прямого корабля ship и все блоки вокруг него.
+        Аргументы:
+            ship (список): координаты блоков корабля
+        """
+        self.__update(ship, 1)
+
+    def remove(self, ship: list) -> None:
+        """
+        Снимает отметки корабля ship, поставленного раньше через place.
+        Блоки, которых касаются другие корабли, остаются занятыми.
+        """
+        self.__update(ship, -1)
+
+    def can_place(self, ship: list) -> bool:
+        """
+        Возвращает True, если все блоки корабля лежат на сетке и не заняты другими кораблями и их соседством.
+        """
+        return all(self.board.contains(block, self.offset) and block not in self for block in ship)
+
+    def can_place_at(self, block: tuple, length: int, horizontal: bool) -> bool:
+        """
+        Возвращает True, если корабль длины length с первым (левым или верхним) блоком block можно поставить.
+        """
+        x, y = block
+        end = (x + length - 1, y) if horizontal else (x, y + length - 1)
+        if not (self.board.contains(block, self.offset) and self.board.contains(end, self.offset)):
+            return False
+        start = self.__index(x, y)
+        step = 1 if horizontal else self.__stride
+        counts = self.__counts
+        return not any(counts[index] for index in range(start, start + length * step, step))
+
+    def __contains__(self, block: tuple) -> bool:
+        return self.board.contains(block, self.offset) and self.__counts[self.__index(*block)] > 0
@@ -0,0 +1,156 @@
+"""Ship placements on an empty grid as bitmasks, computed arithmetically for boards of any size."""
+
+from functools import lru_cache
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.bitboard import iter_indexes
+
+# placement() and conflicts() remember at most this many results times the grid size in blocks
+# (every placement of a 10x10 grid, the last few hundred of a 100x100 one)
+CACHE_CELLS = 1 << 22
+
+
+class PlacementIndex:
+    """
+    Индекс всех положений кораблей каждой длины на сетке board. Наборы положений хранятся как битовые
+    множества с постоянной нумерацией: горизонтальный корабль с первым (левым) блоком s имеет номер s,
+    вертикальный с первым (верхним) блоком s — номер cells + s. Однопалубный корабль считается только
+    горизонтальным. Таблицы по блокам заранее не строятся: положения, занимающие блоки маски,
+    находятся сдвигами маски (length сдвигов на направление), поэтому индекс сетки 100x100 создается
+    мгновенно. Маски и конфликты положений запоминаются по мере использования в кэшах размером
+    до CACHE_CELLS / cells записей: на маленькой сетке это полные таблицы, на большой — последние
+    использованные положения.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сетки
+        cells (int): число блоков сетки
+    ----------
+    Методы:
+        all_placements(length): множество всех положений длины length
+        numbers(length): номера всех положений длины length (кортеж, для равновероятного выбора)
+        mask(length, number), cells_of(length, number): блоки положения (маска и номера битов)
+        placement(length, number): маска положения и маска вместе с соседними блоками (с кэшем)
+        covering_any(mask, length): положения, занимающие хотя бы один блок mask
+        blocked_by(mask, length): положения, которые касаются блоков mask или пересекают их
+        conflicts(length, number, lengths): положения длин lengths, недопустимые рядом с положением number
+    """
+
+    def __init__(self, board: BoardConfig = DEFAULT_BOARD) -> None:
+        self.board = board
+        self.cells = board.cells
+        self.__starts = {}
+        self.__all = {}
+        self.__numbers = {}
+        self.__placements = {}
+        self.__conflicts = {}
+        self.__cache_limit = max(1, CACHE_CELLS // board.cells)
+
+    def __starts_of(self, length: int) -> tuple:
+        """
+        Возвращает маски первых блоков горизонтальных и вертикальных положений длины length.
+        """
+        starts = self.__starts.get(length)
+        if starts is None:
+            board = self.board
+            row = (1 << max(board.width - length + 1, 0)) - 1
+            horizontal = sum(row << (y * board.width) for y in range(board.height))
+            vertical = (1 << max(board.height - length + 1, 0) * board.width) - 1 if length > 1 else 0
+            starts = self.__starts[length] = (horizontal, vertical)
+        return starts
+
+    def all_placements(self, length: int) -> int:
+        """
+        Возвращает множество всех положений длины length на пустой сетке.
+        """
+        placements = self.__all.get(length)
+        if placements is None:
+            horizontal, vertical = self.__starts_of(length)
+            placements = self.__all[length] = horizontal | vertical << self.cells
+        return placements
+
+    def numbers(self, length: int) -> tuple:
+        """
+        Возвращает номера всех положений длины length по возрастанию.
+        """
+        numbers = self.__numbers.get(length)
+        if numbers is None:
+            numbers = self.__numbers[length] = tuple(iter_indexes(self.all_placements(length)))
+        return numbers
+
+    def mask(self, length: int, number: int) -> int:
+        """
+        Возвращает блоки, занятые положением number длины length.
+        """
+        if number < self.cells:
+            return ((1 << length) - 1) << number
+        step = self.board.width
+        start = number - self.cells
+        return sum(1 << (start + k * step) for k in range(length))
+
+    def placement(self, length: int, number: int) -> tuple:
+        """
+        Возвращает (маска положения, маска положения вместе со всеми соседними блоками).
+        """
+        key = (length, number)
+        placement = self.__placements.get(key)
+        if placement is None:
+            if len(self.__placements) >= self.__cache_limit:
+                self.__placements.clear()
+            mask = self.mask(length, number)
+            placement = self.__placements[key] = (mask, self.board.halo(mask))
+        return placement
+
+    def cells_of(self, length: int, number: int) -> range:
+        """
+        Возвращает номера битов блоков положения number длины length.
+        """
+        if number < self.cells:
+            return range(number, number + length)
+        step = self.board.width
+        start = number - self.cells
+        return range(start, start + length * step, step)
+
+    def covering_any(self, mask: int, length: int) -> int:
+        """
+        Возвращает множество положений длины length, занимающих хотя бы один блок mask.
+        """
+        horizontal, vertical = self.__starts_of(length)
+        covered_horizontal = covered_vertical = 0
+        step = self.board.width
+        for k in range(length):
+            covered_horizontal |= mask >> k
+            covered_vertical |= mask >> (k * step)
+        return covered_horizontal & horizontal | (covered_vertical & vertical) << self.cells
+
+    def blocked_by(self, mask: int, length: int) -> int:
+        """
+        Возвращает множество положений длины length, которые касаются блоков mask или пересекают их.
+        """
+        return self.covering_any(self.board.halo(mask), length)
+
+    def conflicts(self, length: int, number: int, lengths: tuple) -> dict:
+        """
+        Возвращает словарь длина -> множество положений этой длины (для каждой длины из lengths),
+        которые становятся недопустимыми после постановки корабля length в положение number.
+        """
+        key = (length, number, lengths)
+        conflicts = self.__conflicts.get(key)
+        if conflicts is None:
+            if len(self.__conflicts) >= self.__cache_limit:
+                self.__conflicts.clear()
+            blocked = self.placement(length, number)[1]
+            conflicts = self.__conflicts[key] = {
+                other_length: self.covering_any(blocked, other_length) for other_length in lengths
+            }
+        return conflicts
+
+
+@lru_cache(maxsize=None)
+def placement_index(board: BoardConfig = DEFAULT_BOARD) -> PlacementIndex:
+    """
+    Возвращает общий индекс положений для сетки board (один на процесс).
+    """
+    return PlacementIndex(board)
+
+
+PLACEMENT_INDEX = placement_index(DEFAULT_BOARD)
@@ -0,0 +1,272 @@
+"""Low-overhead timing and counter histograms of the game's hot paths, enabled by an environment variable."""
+
+import atexit
+import functools
+import json
+import os
+import signal
+import sys
+import time
+from typing import Callable, Optional
+
+# Path of the JSON profile ("-" - standard error); profiling is off if it is not set
+PROFILE_ENV = "BATTLESHIP_PROFILE"
+PERCENTILES = (50, 90, 99)
+# Values are grouped by their 3 highest bits: buckets 1, 2, ..., 8, 10, 12, 14, 16, 20, ... (at most 25% wide)
+BUCKET_BITS = 3
+
+
+class _NullPhase:
+    """
+    Пустой замер: используется вместо настоящего, когда профилирование выключено.
+    """
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class Histogram:
+    """
+    Распределение неотрицательных целых значений (микросекунд или количеств за кадр) по логарифмическим
+    корзинам: корзина значения — его 3 старших бита, поэтому корзин немного при любом разбросе значений,
+    а погрешность перцентилей не больше 25%. Среднее, минимум и максимум считаются точно.
+    ----------
+    Атрибуты:
+        count (int): число значений
+        total (int): сумма значений
+        min, max (int): наименьшее и наибольшее значение (None, пока значений нет)
+    ----------
+    Методы:
+        add(value): добавляет значение
+        percentile(p): нижняя граница корзины, в которую попадает перцентиль p
+        summary(): словарь для отчета
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.__buckets = {}
+
+    def add(self, value: int) -> None:
+        """
+        Добавляет значение value (отрицательные считаются нулем).
+        """
+        value = max(value, 0)
+        shift = max(value.bit_length() - BUCKET_BITS, 0)
+        bucket = value >> shift << shift
+        self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, p: int) -> int:
+        """
+        Возвращает нижнюю границу корзины, в которую попадает перцентиль p (но не меньше минимума).
+        """
+        rank = min(self.count - 1, self.count * p // 100)
+        for bucket, count in sorted(self.__buckets.items()):
+            rank -= count
+            if rank < 0:
+                return max(bucket, self.min)
+        return self.max
+
+    def summary(self) -> dict:
+        """
+        Возвращает число значений, среднее, перцентили PERCENTILES, минимум, максимум и корзины
+        (нижняя граница -> число значений).
+        """
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 3),
+            **{f"p{p}": self.percentile(p) for p in PERCENTILES},
+            "min": self.min,
+            "max": self.max,
+            "buckets": dict(sorted(self.__buckets.items())),
+        }
+
+
+class _Phase:
+    """
+    Замер одной фазы: время от входа в блок with до выхода добавляется в гистограмму.
+    """
+
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.add(int((time.perf_counter() - self.start) * 1e6))
+
+
+class Profiler:
+    """
+    Время фаз кадра и вызовов горячих функций в гистограммах микросекунд, а также счетчики событий
+    (выстрелы, отрисовки надписей и т. п.) с гистограммами значений за кадр и скоростью в секунду.
+    Выключенный профилировщик почти ничего не стоит: timed возвращает функцию без обертки,
+    phase — общий пустой замер, count и end_frame сразу возвращаются.
+    ----------
+    Атрибуты:
+        enabled (bool): включено ли профилирование (решается при создании, поэтому timed можно
+                использовать как декоратор при импорте)
+    ----------
+    Методы:
+        phase(name): контекстный менеджер, замеряющий время блока with
+        timed(function): декоратор, замеряющий каждый вызов функции (фаза с именем функции)
+        count(name, amount): увеличивает счетчик name в текущем кадре
+        start_frame(), end_frame(): отмечают начало и конец кадра (без ожидания событий)
+        report(): словарь с гистограммами фаз и счетчиков
+        export(path): записывает отчет в JSON-файл (path "-" — стандартный поток ошибок)
+        install_export_handlers(path): записывать отчет при выходе и по сигналу SIGUSR1
+        reset(): удаляет все замеры
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.__export_path = None
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Удаляет все замеры и счетчики и начинает отсчет времени заново.
+        """
+        self.__phases = {}
+        self.__counters = {}
+        self.__counts_per_frame = {}
+        self.__frame_counts = {}
+        self.__frame_start = None
+        self.__start = time.perf_counter()
+
+    def __histogram(self, histograms: dict, name: str) -> Histogram:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram()
+        return histogram
+
+    def phase(self, name: str):
+        """
+        Возвращает контекстный менеджер, добавляющий время блока with в гистограмму фазы name.
+        """
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self.__histogram(self.__phases, name))
+
+    def timed(self, function: Callable) -> Callable:
+        """
+        Декоратор: время каждого вызова function попадает в фазу с именем функции.
+        Если профилирование выключено, функция возвращается без изменений.
+        """
+        if not self.enabled:
+            return function
+        histogram = self.__histogram(self.__phases, function.__name__)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.add(int((time.perf_counter() - start) * 1e6))
+
+        return wrapper
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """
+        Увеличивает счетчик name на amount (всего и в текущем кадре).
+        """
+        if not self.enabled:
+            return
+        self.__counters[name] = self.__counters.get(name, 0) + amount
+        self.__frame_counts[name] = self.__frame_counts.get(name, 0) + amount
+
+    def start_frame(self) -> None:
+        """
+        Отмечает начало кадра: вызывается после того, как пришли события, чтобы ожидание игрока
+        не попадало во время кадра.
+        """
+        if self.enabled:
+            self.__frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        """
+        Отмечает конец кадра (после обновления дисплея): время кадра попадает в фазу "frame",
+        а значения счетчиков за кадр — в их гистограммы (счетчики, не менявшиеся в кадре, получают 0).
+        """
+        if not self.enabled:
+            return
+        if self.__frame_start is not None:
+            self.__histogram(self.__phases, "frame").add(int((time.perf_counter() - self.__frame_start) * 1e6))
+            self.__frame_start = None
+        for name in self.__counters:
+            self.__histogram(self.__counts_per_frame, name).add(self.__frame_counts.get(name, 0))
+        self.__frame_counts.clear()
+
+    def report(self) -> dict:
+        """
+        Возвращает отчет: время с начала профилирования, гистограммы фаз в микросекундах
+        и для каждого счетчика — сумму, скорость в секунду и гистограмму значений за кадр.
+        """
+        elapsed = time.perf_counter() - self.__start
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "phases_us": {name: histogram.summary() for name, histogram in sorted(self.__phases.items())},
+            "counters": {
+                name: {
+                    "total": total,
+                    "per_second": round(total / elapsed, 3) if elapsed else 0.0,
+                    "per_frame": self.__histogram(self.__counts_per_frame, name).summary(),
+                }
+                for name, total in sorted(self.__counters.items())
+            },
+        }
+
+    def export(self, path: Optional[str] = None) -> None:
+        """
+        Записывает отчет в JSON-файл path (по умолчанию путь из install_export_handlers).
+        Файл заменяется целиком, поэтому читающий его процесс не увидит половину отчета.
+        """
+        path = path or self.__export_path
+        if not path:
+            return
+        output = json.dumps(self.report(), indent=2) + "\n"
+        if path == "-":
+            sys.stderr.write(output)
+            return
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(output)
+        os.replace(temporary_path, path)
+
+    def install_export_handlers(self, path: Optional[str]) -> None:
+        """
+        Запоминает путь отчета и записывает отчет при выходе из программы и по сигналу SIGUSR1
+        (где он есть; обработчик срабатывает, когда игровой цикл получает следующее событие).
+        Ничего не делает, если профилирование выключено или путь не задан; повторный вызов не регистрирует
+        обработчики ещё раз.
+        """
+        if not self.enabled or not path or self.__export_path is not None:
+            return
+        self.__export_path = path
+        atexit.register(self.export)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, lambda signum, frame: self.export())
+
+
+profiler = Profiler(enabled=bool(os.environ.get(PROFILE_ENV)))
@@ -0,0 +1,63 @@
+"""Seeded random streams that split into independent child streams for parallel workers."""
+
+import hashlib
+import os
+import random
+from typing import Optional
+
+
+def derive_seed(seed: int, path: tuple) -> int:
+    """
+    Выводит 64-битное зерно потока из корневого зерна и пути потока в дереве разбиений.
+    Одинаковые (seed, path) дают одинаковое зерно на любой машине и в любом процессе.
+    """
+    key = ",".join(str(part) for part in (seed, *path)).encode("ascii")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class RngStream(random.Random):
+    """
+    Генератор случайных чисел (random.Random) с явным зерном, который можно разбить на независимые потоки
+    ----------
+    Атрибуты:
+        seed_value (int): корневое зерно; без зерна берется случайное из os.urandom и запоминается,
+                чтобы запуск можно было повторить
+        path (кортеж целых): номера потомков от корня до этого потока
+        spawned (int): сколько потомков уже создано
+    ----------
+    Методы:
+        spawn(count): возвращает count новых независимых потоков-потомков
+    Потомки зависят только от seed_value, path и числа уже созданных потомков, но не от того, сколько чисел
+    уже выдано, поэтому разбиение на рабочие процессы не меняет последовательностей.
+    Поток можно передать в другой процесс (pickle сохраняет зерно, путь и состояние).
+    """
+
+    def __init__(self, seed: Optional[int] = None, path: tuple = ()) -> None:
+        self.seed_value = int.from_bytes(os.urandom(8), "little") if seed is None else seed
+        self.path = path
+        self.spawned = 0
+        super().__init__(derive_seed(self.seed_value, path))
+
+    def spawn(self, count: int) -> list["RngStream"]:
+        """
+        Создает count независимых потоков-потомков (следующие по порядку номера).
+        """
+        children = [RngStream(self.seed_value, (*self.path, self.spawned + number)) for number in range(count)]
+        self.spawned += count
+        return children
+
+    def __reduce__(self) -> tuple:
+        return _restore_stream, (self.seed_value, self.path, self.spawned, self.getstate())
+
+    def __repr__(self) -> str:
+        return f"RngStream(seed={self.seed_value}, path={self.path})"
+
+
+def _restore_stream(seed: int, path: tuple, spawned: int, state: tuple) -> RngStream:
+    """
+    Восстанавливает поток после pickle.
+    """
+    stream = RngStream(seed, path)
+    stream.spawned = spawned
+    stream.setstate(state)
+    return stream
@@ -1,52 +1,220 @@
 """Module for the logic behind the game."""
 
-from random import choice
-from typing import Callable
+import random
+from typing import Optional
 
 from elements.autoships import AutoShips
+from elements.bitboard import blocks_to_mask
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.completions import COMPLETION_STATES, Completions, count_completions
+from elements.fleet import Fleet
+from elements.hunt_order import HuntCursor
+from elements.indexed_set import IndexedSet
+from elements.occupancy import OccupancyGrid
+from elements.profiling import profiler
 
-# ---COMPUTER DATA-----
-computer_available_to_fire_set = {(x, y) for x in range(16, 26) for y in range(1, 11)}
-around_last_computer_hit_set = set()
 
-dotted_set_for_computer_not_to_shoot = set()
-hit_blocks_for_computer_not_to_shoot = set()
-last_hits_list = []
-# --------------------
+class GameState:
+    """
+    Все изменяемое состояние одной партии. Правила ниже получают его аргументом state,
+    поэтому в одном процессе (и в разных потоках) может идти сколько угодно независимых партий.
+    ----------
+    Атрибуты:
+        board (BoardConfig): размеры сеток и состав флотов
+        computer_available_to_fire_set (IndexedSet кортежей): блоки сетки игрока, по которым компьютер
+                ещё может стрелять (случайный выбор за постоянное время)
+        around_last_computer_hit_set (набор кортежей): блоки вокруг последнего попадания компьютера
+        hunt_cursor (HuntCursor): порядок поиска кораблей стандартной логики computer_shoots
+                (решетка по длине самого короткого оставшегося корабля)
+        dotted_set_for_computer_not_to_shoot (набор кортежей): точки на сетке игрока, куда компьютер не стреляет
+        hit_blocks_for_computer_not_to_shoot (набор кортежей): подбитые компьютером блоки
+        last_hits_list (список кортежей): попадания компьютера в ещё не уничтоженный корабль
+        hit_blocks (набор кортежей): все подбитые блоки на обеих сетках (для крестиков)
+        dotted_set (набор кортежей): все блоки с точками на обеих сетках
+        destroyed_computer_ships (список списков): уничтоженные корабли компьютера (для отрисовки)
+        human_destroyed_ships_count, computer_destroyed_ships_count (словари): число уничтоженных кораблей по длинам
+        computer_shooter (необязательный): подключаемый стрелок компьютера (например, ai.DensityShooter)
+                с методами reset(), next_shot() -> tuple и register_shot(fired_block, hit, destroyed_ship).
+                None — стандартная логика computer_shoots.
+        rng (Random): генератор случайных чисел стандартной логики computer_shoots (по умолчанию модуль random)
+        endgame_solver (необязательный): решатель конца партии (например, ai.EndgameSolver) с атрибутом max_ships
+                и методом choose(remaining, allowed, unsunk_hits) -> номер бита или None; когда у игрока остается
+                не больше max_ships кораблей, он выбирает выстрел вместо стрелка компьютера и стандартной логики
+    ----------
+    Методы:
+        reset(): возвращает партию в начальное состояние
+        copy(): дешевая копия (наборы и списки копируются, стрелок компьютера, решатель, генератор и board общие)
+    Правила выстрела (check_hit_or_miss и стандартная логика computer_shoots) обновляют наборы по одному блоку,
+    без операций над целыми наборами, поэтому такой выстрел стоит одинаково на сетке 10x10 и 100x100.
+    Исключение — grid_knowledge: он собирает маски из dotted_set и hit_blocks целиком, за время,
+    пропорциональное числу выстрелов. Его вызывают grid_completions и ход решателя конца партии
+    (computer_endgame_shot при каждом выстреле компьютера, если решатель подключен), а поиск решателя
+    все равно стоит намного дороже.
+    """
 
-hit_blocks = set()
-dotted_set = set()
-destroyed_computer_ships = []
+    def __init__(
+        self,
+        computer_shooter=None,
+        rng: Optional[random.Random] = None,
+        board: BoardConfig = DEFAULT_BOARD,
+        endgame_solver=None,
+    ) -> None:
+        self.computer_shooter = computer_shooter
+        self.rng = rng or random
+        self.board = board
+        self.endgame_solver = endgame_solver
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Возвращает все наборы, списки и счетчики в начальное состояние перед новой игрой.
+        """
+        # ---COMPUTER DATA-----
+        self.computer_available_to_fire_set = IndexedSet(self.board.blocks(self.board.human_offset))
+        self.around_last_computer_hit_set = set()
+        self.hunt_cursor = HuntCursor(self.board)
+
+        self.dotted_set_for_computer_not_to_shoot = set()
+        self.hit_blocks_for_computer_not_to_shoot = set()
+        self.last_hits_list = []
+        # --------------------
+
+        self.hit_blocks = set()
+        self.dotted_set = set()
+        self.destroyed_computer_ships = []
+
+        self.human_destroyed_ships_count = dict.fromkeys((*self.board.ship_lengths, "#"), 0)
+        self.computer_destroyed_ships_count = dict.fromkeys((*self.board.ship_lengths, "#"), 0)
+        if self.computer_shooter is not None:
+            self.computer_shooter.reset()
+
+    def copy(self) -> "GameState":
+        """
+        Возвращает независимую копию состояния. Корабли в destroyed_computer_ships, стрелок
+        компьютера, решатель конца партии и генератор случайных чисел не копируются, а используются совместно.
+        """
+        state = GameState.__new__(GameState)
+        state.computer_shooter = self.computer_shooter
+        state.rng = self.rng
+        state.board = self.board
+        state.endgame_solver = self.endgame_solver
+        for name, value in vars(self).items():
+            if name not in ("computer_shooter", "rng", "board", "endgame_solver"):
+                setattr(state, name, value.copy())
+        return state
+
+
+@profiler.timed
+def computer_shoots(state: GameState) -> tuple:
+    """
+    Добивает раненый корабль, а если раненых нет, ищет корабли по решетке hunt_cursor: самый короткий
+    оставшийся корабль длины n обязательно занимает блок решетки с шагом n, так что остальные блоки можно
+    пропустить. Когда решетка пройдена, выбирает случайный блок из доступных для стрельбы.
+    В конце партии выстрел выбирает решатель state.endgame_solver, если он задан.
+    """
+    # If every block has been fired at but the game is not over, the computer starts over with the whole grid
+    if not state.computer_available_to_fire_set:
+        state.computer_available_to_fire_set = IndexedSet(state.board.blocks(state.board.human_offset))
 
-human_destroyed_ships_count = {4: 0, 3: 0, 2: 0, 1: 0, "#": 0}
-computer_destroyed_ships_count = {4: 0, 3: 0, 2: 0, 1: 0, "#": 0}
+    if state.endgame_solver is not None:
+        computer_fired_block = computer_endgame_shot(state)
+        if computer_fired_block is not None:
+            state.computer_available_to_fire_set.discard(computer_fired_block)
+            return computer_fired_block
 
+    if state.computer_shooter is not None:
+        computer_fired_block = state.computer_shooter.next_shot()
+        state.computer_available_to_fire_set.discard(computer_fired_block)
+        return computer_fired_block
 
-def computer_shoots() -> tuple:
-    """
-    Случайным образом выбирает блок из доступных для стрельбы из набора
-    """
-    # This global keyword and check for len(computer_available_to_fire_set) is solely for the play again option
-    # when all the ships and blocks variables are re-initialized but computer_available_to_fire_set is not.
-    global computer_available_to_fire_set
-    if not computer_available_to_fire_set:
-        computer_available_to_fire_set = {(x, y) for x in range(16, 26) for y in range(1, 11)}
-
-    set_to_shoot_from = computer_available_to_fire_set
-    if around_last_computer_hit_set:
-        set_to_shoot_from = around_last_computer_hit_set
     # pygame.time.delay(500)
-    computer_fired_block = choice(tuple(set_to_shoot_from))
-    computer_available_to_fire_set.discard(computer_fired_block)
+    if state.around_last_computer_hit_set:
+        computer_fired_block = state.rng.choice(tuple(state.around_last_computer_hit_set))
+    else:
+        computer_fired_block = state.hunt_cursor.next_block(
+            state.computer_available_to_fire_set, state.rng, smallest_remaining_length(state)
+        )
+        if computer_fired_block is None:
+            computer_fired_block = state.computer_available_to_fire_set.choice(state.rng)
+    state.computer_available_to_fire_set.discard(computer_fired_block)
     return computer_fired_block
 
 
+def smallest_remaining_length(state: GameState) -> int:
+    """
+    Возвращает длину самого короткого ещё не уничтоженного корабля игрока
+    (1, если компьютер уничтожил больше кораблей, чем есть во флоте, например после расстановки вручную).
+    """
+    destroyed = state.human_destroyed_ships_count
+    for length in reversed(state.board.ship_lengths):
+        if destroyed[length] < state.board.ships_count(length):
+            return length
+    return 1
+
+
+def computer_endgame_shot(state: GameState) -> Optional[tuple]:
+    """
+    Передает решателю state.endgame_solver то, что компьютер знает о сетке игрока: оставшиеся корабли,
+    блоки, где корабль ещё может стоять (все, кроме точек и подбитых блоков уничтоженных кораблей),
+    и подбитые, но не уничтоженные блоки.
+    Возвращает:
+        tuple или None: блок для выстрела или None, если решатель оставил ход обычной логике
+    """
+    board = state.board
+    offset = board.human_offset
+    remaining, known_empty, unsunk_hits = grid_knowledge(state, offset)
+    if len(remaining) > state.endgame_solver.max_ships:
+        return None
+    cell = state.endgame_solver.choose(remaining, board.full_mask & ~known_empty, unsunk_hits)
+    return None if cell is None else board.index_to_block(cell, offset)
+
+
+def grid_knowledge(state: GameState, offset: int) -> tuple:
+    """
+    Собирает то, что известно о сетке, начинающейся с offset: оставшиеся корабли (по счетчикам уничтоженных
+    кораблей), блоки, где корабля точно нет (точки и блоки уничтоженных кораблей), и подбитые блоки
+    ещё не уничтоженных кораблей.
+    Возвращает:
+        tuple: (длины оставшихся кораблей от большей к меньшей, маска пустых блоков, маска подбитых блоков)
+    """
+    board = state.board
+    if offset == board.human_offset:
+        destroyed_count = state.human_destroyed_ships_count
+        unsunk_blocks = state.last_hits_list
+    else:
+        destroyed_count = state.computer_destroyed_ships_count
+        sunk_blocks = {block for ship in state.destroyed_computer_ships for block in ship}
+        unsunk_blocks = [block for block in state.hit_blocks if block not in sunk_blocks]
+    remaining = tuple(
+        length for length in board.ship_lengths for _ in range(board.ships_count(length) - destroyed_count[length])
+    )
+    unsunk_hits = blocks_to_mask((block for block in unsunk_blocks if board.contains(block, offset)), offset, board)
+    known = blocks_to_mask(
+        (block for block in state.dotted_set | state.hit_blocks if board.contains(block, offset)), offset, board
+    )
+    return remaining, known & ~unsunk_hits, unsunk_hits
+
+
+def grid_completions(
+    state: GameState, offset: int, max_states: Optional[int] = COMPLETION_STATES
+) -> Optional[Completions]:
+    """
+    Возвращает точное число расстановок оставшихся кораблей на сетке, начинающейся с offset,
+    и занятость каждого блока в них (см. count_completions); occupancy[i] / total — вероятность корабля
+    в блоке board.index_to_block(i, offset) без ошибки выборки. По умолчанию подсчет ограничен
+    COMPLETION_STATES профилями (около секунды на ход): в начале партии, пока неизвестных блоков слишком много,
+    возвращается None, и вероятности остается оценивать выборкой.
+    """
+    return count_completions(*grid_knowledge(state, offset), state.board, max_states)
+
+
+@profiler.timed
 def check_hit_or_miss(
     *,
+    state: GameState,
     fired_block: tuple,
-    opponents_ships_list: list[list],
+    opponents_fleet: Fleet,
     computer_turn: bool,
-    opponents_ships_list_original_copy: list,
     opponents_ships_set: set,
     computer: AutoShips,
 ) -> bool:
@@ -54,82 +222,93 @@ def check_hit_or_miss(
     Проверяет, является ли блок, в который стрелял компьютер или человек, попаданием или промахом.
     Обновляет наборы с точками (в пропущенных блоках или в диагональных блоках вокруг блока попадания) и крестиками.
     (в хит-блоках).
-    Удаляет уничтоженные корабли из списка кораблей.
+    Корабль, в который попали, находится по индексу opponents_fleet за постоянное время.
     """
-    for elem in opponents_ships_list:
-        diagonal_only = True
-        if fired_block in elem:
-            # This is to put dots before and after a destroyed ship
-            # and to draw computer's destroyed ships (which are hidden until destroyed)
-            ind = opponents_ships_list.index(elem)
-            if len(elem) == 1:
-                diagonal_only = False
-            update_dotted_and_hit_sets(
+    ind = opponents_fleet.hit(fired_block)
+    if ind is not None:
+        # This is to put dots before and after a destroyed ship
+        # and to draw computer's destroyed ships (which are hidden until destroyed)
+        ship_destroyed = opponents_fleet.is_destroyed(ind)
+        update_dotted_and_hit_sets(
+            state=state,
+            fired_block=fired_block,
+            computer_turn=computer_turn,
+            diagonal_only=not ship_destroyed,
+        )
+        # This is to check who lost - if ships_set is empty
+        opponents_ships_set.discard(fired_block)
+        if computer_turn:
+            state.last_hits_list.append(fired_block)
+            update_around_last_computer_hit(
+                state=state,
                 fired_block=fired_block,
+                computer_hits=True,
+            )
+        if computer_turn and state.computer_shooter is not None:
+            destroyed_ship = opponents_fleet.ships[ind] if ship_destroyed else None
+            state.computer_shooter.register_shot(fired_block, True, destroyed_ship)
+        # If the ship is destroyed
+        if ship_destroyed:
+            update_destroyed_ships(
+                state=state,
+                ind=ind,
                 computer_turn=computer_turn,
-                diagonal_only=diagonal_only,
+                opponents_fleet=opponents_fleet,
             )
-            elem.remove(fired_block)
-            # This is to check who lost - if ships_set is empty
-            opponents_ships_set.discard(fired_block)
             if computer_turn:
-                last_hits_list.append(fired_block)
-                update_around_last_computer_hit(
-                    fired_block=fired_block,
-                    computer_hits=True,
-                )
-            # If the ship is destroyed
-            if not elem:
-                update_destroyed_ships(
-                    ind=ind,
-                    computer_turn=computer_turn,
-                    opponents_ships_list_original_copy=opponents_ships_list_original_copy,
-                )
-                if computer_turn:
-                    last_hits_list.clear()
-                    around_last_computer_hit_set.clear()
-                else:
-                    # Add computer's destroyed ship to the list to draw it (computer ships are hidden)
-                    destroyed_computer_ships.append(computer.ships[ind])
-            return True
+                # Hits of another ship (only the endgame solver fires away from the wounded ship) stay
+                sunk_ship = opponents_fleet.ships[ind]
+                state.last_hits_list = [block for block in state.last_hits_list if block not in sunk_ship]
+                state.around_last_computer_hit_set.clear()
+            else:
+                # Add computer's destroyed ship to the list to draw it (computer ships are hidden)
+                state.destroyed_computer_ships.append(computer.ships[ind])
+        return True
     add_missed_block_to_dotted_set(
+        state=state,
         fired_block=fired_block,
     )
     if computer_turn:
         update_around_last_computer_hit(
+            state=state,
             fired_block=fired_block,
             computer_hits=False,
         )
+        if state.computer_shooter is not None:
+            state.computer_shooter.register_shot(fired_block, False)
     return False
 
 
 def update_destroyed_ships(
     *,
+    state: GameState,
     ind: int,
     computer_turn: bool,
-    opponents_ships_list_original_copy: list,
+    opponents_fleet: Fleet,
 ) -> None:
     """
     Добавляет блоки до и после корабля в dotted_set, чтобы рисовать на них точки.
     Добавляет все блоки на корабле в набор hit_blocks для рисования крестиков внутри разрушенного корабля.
     """
-    ship = sorted(opponents_ships_list_original_copy[ind])
-    for i in range(-1, 1):
+    for ship_end in opponents_fleet.ship_ends[ind]:
         update_dotted_and_hit_sets(
-            fired_block=ship[i],
+            state=state,
+            fired_block=ship_end,
             computer_turn=computer_turn,
             diagonal_only=False,
         )
+    ship_length = len(opponents_fleet.ships[ind])
     if computer_turn:
-        human_destroyed_ships_count[len(ship)] += 1
-        human_destroyed_ships_count["#"] += 1
+        state.human_destroyed_ships_count[ship_length] += 1
+        state.human_destroyed_ships_count["#"] += 1
     else:
-        computer_destroyed_ships_count[len(ship)] += 1
-        computer_destroyed_ships_count["#"] += 1
+        state.computer_destroyed_ships_count[ship_length] += 1
+        state.computer_destroyed_ships_count["#"] += 1
 
 
 def update_around_last_computer_hit(
     *,
+    state: GameState,
     fired_block: tuple,
     computer_hits: bool,
 ) -> None:
@@ -140,21 +319,24 @@ def update_around_last_computer_hit(
     around_last_computer_hit_set заставляет компьютер выбирать правильные блоки, чтобы быстро уничтожить корабль
     вместо случайной стрельбы по совершенно случайным блокам.
     """
-    global around_last_computer_hit_set, computer_available_to_fire_set
-    if computer_hits and fired_block in around_last_computer_hit_set:
-        around_last_computer_hit_set = computer_hits_twice()
-    elif computer_hits and fired_block not in around_last_computer_hit_set:
-        computer_first_hit(fired_block=fired_block)
+    if computer_hits and fired_block in state.around_last_computer_hit_set:
+        state.around_last_computer_hit_set = computer_hits_twice(state=state)
+    elif computer_hits and fired_block not in state.around_last_computer_hit_set:
+        computer_first_hit(state=state, fired_block=fired_block)
     elif not computer_hits:
-        around_last_computer_hit_set.discard(fired_block)
+        state.around_last_computer_hit_set.discard(fired_block)
 
-    around_last_computer_hit_set -= dotted_set_for_computer_not_to_shoot
-    around_last_computer_hit_set -= hit_blocks_for_computer_not_to_shoot
-    computer_available_to_fire_set -= around_last_computer_hit_set
-    computer_available_to_fire_set -= dotted_set_for_computer_not_to_shoot
+    # Dotted blocks leave computer_available_to_fire_set as soon as they are dotted (add_missed_block_to_dotted_set)
+    state.around_last_computer_hit_set = {
+        block
+        for block in state.around_last_computer_hit_set
+        if block not in state.dotted_set_for_computer_not_to_shoot
+        and block not in state.hit_blocks_for_computer_not_to_shoot
+    }
+    state.computer_available_to_fire_set -= state.around_last_computer_hit_set
 
 
-def computer_first_hit(*, fired_block: tuple) -> None:
+def computer_first_hit(*, state: GameState, fired_block: tuple) -> None:
     """
     Добавляет блоки сверху, снизу, справа и слева от места попадания
     компьютером во временный набор, чтобы компьютер мог выбрать следующий снимок.
@@ -162,17 +344,12 @@ def computer_first_hit(*, fired_block: tuple) -> None:
         fired_block (tuple): координаты блока, пораженного компьютером
     """
     x_hit, y_hit = fired_block
-    if x_hit > 16:
-        around_last_computer_hit_set.add((x_hit - 1, y_hit))
-    if x_hit < 25:
-        around_last_computer_hit_set.add((x_hit + 1, y_hit))
-    if y_hit > 1:
-        around_last_computer_hit_set.add((x_hit, y_hit - 1))
-    if y_hit < 10:
-        around_last_computer_hit_set.add((x_hit, y_hit + 1))
+    for block in ((x_hit - 1, y_hit), (x_hit + 1, y_hit), (x_hit, y_hit - 1), (x_hit, y_hit + 1)):
+        if state.board.contains(block, state.board.human_offset):
+            state.around_last_computer_hit_set.add(block)
 
 
-def computer_hits_twice() -> set:
+def computer_hits_twice(*, state: GameState) -> set:
     """
     Добавляет блоки до и после двух или более блоков корабля во временный список
     для компьютера, чтобы закончить корабль быстрее.
@@ -180,28 +357,23 @@ def computer_hits_twice() -> set:
         set: временный набор блоков, где потенциально должен находиться корабль людей.
         для компьютера, чтобы стрелять из
     """
-    last_hits_list.sort()
+    state.last_hits_list.sort()
     new_around_last_hit_set = set()
-    for i in range(len(last_hits_list) - 1):
-        x1 = last_hits_list[i][0]
-        x2 = last_hits_list[i + 1][0]
-        y1 = last_hits_list[i][1]
-        y2 = last_hits_list[i + 1][1]
+    for i in range(len(state.last_hits_list) - 1):
+        x1 = state.last_hits_list[i][0]
+        x2 = state.last_hits_list[i + 1][0]
+        y1 = state.last_hits_list[i][1]
+        y2 = state.last_hits_list[i + 1][1]
         if x1 == x2:
-            if y1 > 1:
-                new_around_last_hit_set.add((x1, y1 - 1))
-            if y2 < 10:
-                new_around_last_hit_set.add((x1, y2 + 1))
+            new_around_last_hit_set.update(((x1, y1 - 1), (x1, y2 + 1)))
         elif y1 == y2:
-            if x1 > 16:
-                new_around_last_hit_set.add((x1 - 1, y1))
-            if x2 < 25:
-                new_around_last_hit_set.add((x2 + 1, y1))
-    return new_around_last_hit_set
+            new_around_last_hit_set.update(((x1 - 1, y1), (x2 + 1, y1)))
+    return {block for block in new_around_last_hit_set if state.board.contains(block, state.board.human_offset)}
 
 
 def update_dotted_and_hit_sets(
     *,
+    state: GameState,
     fired_block: tuple,
     computer_turn: bool,
     diagonal_only: bool = True,
@@ -211,65 +383,60 @@ def update_dotted_and_hit_sets(
     по компьютеру). Добавляет все диагональные блоки или выбранный круговой блок в отдельный набор
     блок: нажмите блок (кортеж)
     """
-    global dotted_set, hit_blocks
     x, y = fired_block
-    a = 15 * computer_turn
-    b = 11 + 15 * computer_turn
+    a = state.board.human_offset * computer_turn
+    b = a + state.board.width + 1
+    c = state.board.height + 1
     # Adds a block hit by computer to the set of his hits to later remove
     # them from the set of blocks available for it to shoot from
-    hit_blocks_for_computer_not_to_shoot.add(fired_block)
+    state.hit_blocks_for_computer_not_to_shoot.add(fired_block)
     # Adds hit blocks on either grid1 (x:1-10) or grid2 (x:16-25)
-    hit_blocks.add(fired_block)
-    # Adds blocks in diagonal or all-around a block to respective sets
+    state.hit_blocks.add(fired_block)
+    state.dotted_set.discard(fired_block)
+    # Adds blocks in diagonal or all-around a block to respective sets (hit blocks never get a dot)
     for i in range(-1, 2):
         for j in range(-1, 2):
-            if (not diagonal_only or i != 0 and j != 0) and a < x + i < b and 0 < y + j < 11:
-                add_missed_block_to_dotted_set(fired_block=(x + i, y + j))
-    dotted_set -= hit_blocks
+            block = (x + i, y + j)
+            if (not diagonal_only or i != 0 and j != 0) and a < x + i < b and 0 < y + j < c:
+                if block not in state.hit_blocks:
+                    add_missed_block_to_dotted_set(state=state, fired_block=block)
 
 
-def add_missed_block_to_dotted_set(*, fired_block: tuple) -> None:
+def add_missed_block_to_dotted_set(*, state: GameState, fired_block: tuple) -> None:
     """
     Добавляет fired_block к набору пропущенных выстрелов (если fired_block является промахом), чтобы потом рисовать на них точки.
     Также необходимо, чтобы компьютер удалял эти точечные блоки из набора доступных блоков, из которых он мог стрелять.
     """
-    dotted_set.add(fired_block)
-    dotted_set_for_computer_not_to_shoot.add(fired_block)
+    state.dotted_set.add(fired_block)
+    state.dotted_set_for_computer_not_to_shoot.add(fired_block)
+    state.computer_available_to_fire_set.discard(fired_block)
 
 
-def is_ship_valid(*, ship_set: set, blocks_for_manual_drawing: set) -> bool:
+def is_ship_valid(*, ship: list, blocks_for_manual_drawing: OccupancyGrid) -> bool:
     """
     Проверяет, не касается ли корабль других кораблей
     Аргументы:
-        ship_set (set): набор с кортежами координат новых кораблей.
-        blocks_for_manual_drawing (набор): Набор со всеми используемыми блоками для других кораблей, включая все блоки вокруг кораблей.
+        ship (список): кортежи координат нового корабля.
+        blocks_for_manual_drawing (OccupancyGrid): занятость блоков другими кораблями и блоками вокруг них.
 
     Возвращает:
         Bool: True, если корабли не соприкасаются, в противном случае False.
     """
-    return ship_set.isdisjoint(blocks_for_manual_drawing)
+    return blocks_for_manual_drawing.can_place(ship)
 
 
-def validate_ships_numbers(*, ship: list, num_ships_list: list) -> bool:
+def validate_ships_numbers(*, ship: list, num_ships_list: list, board: BoardConfig = DEFAULT_BOARD) -> bool:
     """
-    Проверяет, не превышает ли корабль определенной длины (1-4) необходимое количество (4-1).
+    Проверяет, не превышает ли корабль определенной длины необходимое количество (board.ships_count).
 
     Аргументы:
         корабль (список): Список с координатами новых кораблей
         num_ships_list (список): список с номерами конкретных кораблей по соответствующим индексам.
+        board (BoardConfig): состав флота
 
     Возвращает:
         Bool: True, если количество кораблей определенной длины не больше необходимого,
             False, если таких кораблей достаточно.
     """
-    return (5 - len(ship)) > num_ships_list[len(ship) - 1]
-
+    return board.ships_count(len(ship)) > num_ships_list[len(ship) - 1]
 
-def update_used_blocks(*, ship: list, method: Callable) -> None:
-    """
-    Добавляет блоки корабля в набор использованных блоков, чтобы не использовать их снова.
-    """
-    for block in ship:
-        for i in range(-1, 2):
-            for j in range(-1, 2):
-                method((block[0] + i, block[1] + j))
@@ -0,0 +1,63 @@
+"""Lazily created game window and fonts, plus startup timing marks."""
+
+import time
+from typing import Optional
+
+import pygame
+
+from elements.constants import SIZE
+from graphics.font_cache import font_path_cache
+
+FONT_NAME = "notosans"
+ICON_PATH = "media/BattleShip.png"
+
+# Stage name -> seconds since this module was imported
+startup_timings = {}
+_startup_start = time.perf_counter()
+_screen = None
+_fonts = {}
+
+
+def mark_startup(stage: str) -> None:
+    """
+    Запоминает время, когда запуск игры дошел до этапа stage (только первое достижение).
+    """
+    startup_timings.setdefault(stage, time.perf_counter() - _startup_start)
+
+
+def startup_report() -> str:
+    """
+    Возвращает этапы запуска и время их достижения в миллисекундах, по одному этапу в строке.
+    """
+    return "\n".join(f"{stage}: {seconds * 1000:.1f} ms" for stage, seconds in startup_timings.items())
+
+
+def get_screen() -> pygame.Surface:
+    """
+    Возвращает поверхность окна игры. Окно, заголовок и иконка создаются при первом вызове,
+    поэтому импорт модулей graphics не открывает окно.
+    """
+    global _screen
+    if _screen is None:
+        pygame.display.init()
+        _screen = pygame.display.set_mode(SIZE)
+        pygame.display.set_caption("BattleShip")
+        pygame.display.set_icon(pygame.image.load(ICON_PATH))
+        mark_startup("display")
+    return _screen
+
+
+def get_font(size: int, name: Optional[str] = FONT_NAME) -> pygame.font.Font:
+    """
+    Возвращает шрифт name размера size. Шрифты создаются при первом запросе и затем используются повторно
+    (один объект на размер, что важно для кэшей надписей и фонов сеток). Путь к файлу шрифта берется
+    из постоянного кэша font_path_cache вместо перебора системных шрифтов в pygame.font.SysFont.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.Font(font_path_cache.find(name) if name else None, size)
+        mark_startup(f"font {name} {size}")
+    return font
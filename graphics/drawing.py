@@ -1,99 +1,108 @@
 """Module for drawing."""
 
+from typing import Optional
+
 import pygame
 
 from elements.constants import (
     BLACK,
     BLOCK_SIZE,
     FONT_SIZE,
-    GAME_OVER_FONT_SIZE,
     LEFT_MARGIN,
     RED,
-    SIZE,
     UPPER_MARGIN,
     WHITE,
 )
-
-pygame.init()
-screen = pygame.display.set_mode(SIZE)
-pygame.display.set_caption("BattleShip")
-icon = pygame.image.load("media/BattleShip.png")
-pygame.display.set_icon(icon)
-
-font = pygame.font.SysFont("notosans", FONT_SIZE)
-game_over_font = pygame.font.SysFont("notosans", GAME_OVER_FONT_SIZE)
+from elements.profiling import profiler
+from graphics.display import get_font, get_screen
+from graphics.stamps import HIT_STAMP_MARGIN, dot_stamp, hit_stamp, ship_stamp
+from graphics.text_cache import render_text
 
 
+@profiler.timed
 def draw_ships(ships_coordinates_list: list, ships_color: tuple = BLACK) -> None:
     """
-    Draws rectangles around the blocks that are occupied by a ship
+    Draws rectangles around the blocks that are occupied by a ship.
+    Every outline is a cached stamp (one per ship length and orientation), so pass only the ships that changed.
     Args:
         ships_coordinates_list (list of tuples): a list of ships's coordinates
     """
+    screen = get_screen()
     for elem in ships_coordinates_list:
-        ship = sorted(elem)
-        x_start = ship[0][0]
-        y_start = ship[0][1]
-        # Horizontal and 1block ships
-        ship_width = BLOCK_SIZE * len(ship)
-        ship_height = BLOCK_SIZE
-        # Vertical ships
-        if len(ship) > 1 and ship[0][0] == ship[1][0]:
-            ship_width, ship_height = ship_height, ship_width
+        x_start, y_start = min(elem)
+        vertical = len(elem) > 1 and elem[0][0] == elem[1][0]
         x = BLOCK_SIZE * (x_start - 1) + LEFT_MARGIN
         y = BLOCK_SIZE * (y_start - 1) + UPPER_MARGIN
-        pygame.draw.rect(screen, ships_color, ((x, y), (ship_width, ship_height)), width=BLOCK_SIZE // 10)
+        screen.blit(ship_stamp(len(elem), vertical, ships_color), (x, y))
 
 
+@profiler.timed
 def draw_from_dotted_set(dotted_set_to_draw_from: set, dots_color: tuple = BLACK) -> None:
     """
-    Draws dots in the center of all blocks in the dotted_set
+    Draws dots in the center of the given blocks (only the newly dotted ones need to be passed)
     """
-    for elem in dotted_set_to_draw_from:
-        pygame.draw.circle(
-            screen,
-            dots_color,
-            (BLOCK_SIZE * (elem[0] - 0.5) + LEFT_MARGIN, BLOCK_SIZE * (elem[1] - 0.5) + UPPER_MARGIN),
-            BLOCK_SIZE // 6,
-        )
+    screen = get_screen()
+    stamp = dot_stamp(dots_color)
+    screen.blits(
+        [
+            (stamp, (BLOCK_SIZE * (block[0] - 1) + LEFT_MARGIN, BLOCK_SIZE * (block[1] - 1) + UPPER_MARGIN))
+            for block in dotted_set_to_draw_from
+        ],
+        doreturn=False,
+    )
 
 
+@profiler.timed
 def draw_hit_blocks(hit_blocks_to_draw_from: set, hit_blocks_color: tuple = BLACK) -> None:
     """
-    Draws 'X' in the blocks that were successfully hit either by computer or by human
+    Draws 'X' in the given blocks that were successfully hit either by computer or by human
+    (only the newly hit ones need to be passed)
     """
-    for block in hit_blocks_to_draw_from:
-        x1 = BLOCK_SIZE * (block[0] - 1) + LEFT_MARGIN
-        y1 = BLOCK_SIZE * (block[1] - 1) + UPPER_MARGIN
-        pygame.draw.line(screen, hit_blocks_color, (x1, y1), (x1 + BLOCK_SIZE, y1 + BLOCK_SIZE), BLOCK_SIZE // 6)
-        pygame.draw.line(screen, hit_blocks_color, (x1, y1 + BLOCK_SIZE), (x1 + BLOCK_SIZE, y1), BLOCK_SIZE // 6)
+    screen = get_screen()
+    stamp = hit_stamp(hit_blocks_color)
+    corner = LEFT_MARGIN - HIT_STAMP_MARGIN, UPPER_MARGIN - HIT_STAMP_MARGIN
+    screen.blits(
+        [
+            (stamp, (BLOCK_SIZE * (block[0] - 1) + corner[0], BLOCK_SIZE * (block[1] - 1) + corner[1]))
+            for block in hit_blocks_to_draw_from
+        ],
+        doreturn=False,
+    )
 
 
+@profiler.timed
 def show_message_at_rect_center(
     message: str,
     rect: tuple,
-    font: pygame.font.Font = font,
+    font: Optional[pygame.font.Font] = None,
     message_color: tuple = RED,
     background_color: tuple = WHITE,
-) -> None:
+) -> pygame.Rect:
     """
     Prints message to screen at a given rect's center.
     Args:
         message (str): Message to print
         rect (tuple): rectangle in (x_start, y_start, width, height) format
-        font (pygame font object, optional): What font to use to print message. Defaults to font.
+        font (pygame font object, optional): What font to use to print message. Defaults to the FONT_SIZE font.
         message_color (tuple, optional): Color of the message. Defaults to RED.
+    Returns:
+        pygame.Rect: the area of the screen that was repainted
     """
+    if font is None:
+        font = get_font(FONT_SIZE)
     message_width, message_height = font.size(message)
     message_rect = pygame.Rect(rect)
     x_start = message_rect.centerx - message_width / 2
     y_start = message_rect.centery - message_height / 2
     background_rect = pygame.Rect(x_start - BLOCK_SIZE / 2, y_start, message_width + BLOCK_SIZE, message_height)
-    message_to_blit = font.render(message, True, message_color)
+    message_to_blit = render_text(font, message, message_color)
+    screen = get_screen()
     screen.fill(background_color, background_rect)
     screen.blit(message_to_blit, (x_start, y_start))
+    return background_rect
 
 
+@profiler.timed
 def print_destroyed_ships_count(
     x_offset: int, y_offset: int, count_dict: dict, font: pygame.font.Font, color: tuple = RED
 ) -> None:
@@ -103,9 +112,9 @@ def print_destroyed_ships_count(
         font (pygame font object, optional): What font to use to print message.
         color (tuple, optional): Color of the message. Defaults to RED.
     """
+    screen = get_screen()
+    screen.blit(render_text(font, "Ships", color), (x_offset, y_offset))
     for ship, count in count_dict.items():
-        title = font.render("Ships", True, color)
-        text = font.render(f"{ship}: {count}", True, color)
-        screen.blit(title, (x_offset, y_offset))
+        text = render_text(font, f"{ship}: {count}", color)
         num = ship if isinstance(ship, int) else 5
         screen.blit(text, (x_offset, y_offset + num * BLOCK_SIZE))
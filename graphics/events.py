@@ -0,0 +1,23 @@
+"""Blocking event helpers: the game loops sleep until the player does something."""
+
+import pygame
+
+# Only these events wake the game loops up
+GAME_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.WINDOWEXPOSED)
+
+
+def allow_only_game_events() -> None:
+    """
+    Оставляет в очереди только события мыши, выхода и перерисовки окна,
+    чтобы остальные события (клавиатура, фокус и т. п.) не будили игровые циклы.
+    """
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(GAME_EVENTS)
+
+
+def wait_for_events() -> list:
+    """
+    Блокирует выполнение, пока не придет хотя бы одно событие, и возвращает его
+    вместе со всеми остальными событиями из очереди. Пока событий нет, процессор не занят.
+    """
+    return [pygame.event.wait(), *pygame.event.get()]
@@ -0,0 +1,79 @@
+"""Persistent cache of system font paths, so the font list is scanned once per machine, not once per start."""
+
+import json
+import os
+from typing import Optional
+
+import pygame
+
+from elements.cache_dir import cache_path
+
+FONT_CACHE_FILE = "font_paths.json"
+
+
+def font_cache_path() -> str:
+    """
+    Возвращает путь к файлу кэша в каталоге cache_path.
+    """
+    return cache_path(FONT_CACHE_FILE)
+
+
+class FontPathCache:
+    """
+    Кэш путей к файлам системных шрифтов, сохраняемый между запусками игры.
+    pygame.font.SysFont при первом вызове перебирает все шрифты системы, что медленно;
+    здесь путь ищется один раз (pygame.font.match_font) и записывается в файл.
+    Шрифт, которого нет в системе, тоже запоминается (как None), тогда используется шрифт pygame по умолчанию.
+    ----------
+    Атрибуты:
+        path (str): файл кэша
+    ----------
+    Методы:
+        find(name): путь к файлу шрифта name или None
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or font_cache_path()
+        self.__paths = None
+
+    def find(self, name: str) -> Optional[str]:
+        """
+        Возвращает путь к файлу шрифта name (как pygame.font.SysFont) или None, если шрифта нет.
+        Пути, файлы которых исчезли, ищутся заново.
+        """
+        paths = self.__load()
+        if name in paths and (paths[name] is None or os.path.exists(paths[name])):
+            return paths[name]
+        paths[name] = pygame.font.match_font(name)
+        self.__save()
+        return paths[name]
+
+    def __load(self) -> dict:
+        """
+        Читает кэш из файла при первом обращении. Испорченный или недоступный файл считается пустым.
+        """
+        if self.__paths is None:
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self.__paths = json.load(file)
+            except (OSError, ValueError):
+                self.__paths = {}
+            if not isinstance(self.__paths, dict):
+                self.__paths = {}
+        return self.__paths
+
+    def __save(self) -> None:
+        """
+        Записывает кэш в файл; если записать не удалось, игра продолжается без кэша на диске.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temporary_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(self.__paths, file, indent=2, sort_keys=True)
+            os.replace(temporary_path, self.path)
+        except OSError:
+            pass
+
+
+font_path_cache = FontPathCache()
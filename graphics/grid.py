@@ -8,26 +8,35 @@ from elements.constants import (
     LEFT_MARGIN,
     LINE_WIDTH,
     UPPER_MARGIN,
+    WHITE,
 )
-from graphics.drawing import screen
+from graphics.display import get_screen
+from graphics.text_cache import render_text
 
 
 class Grid:
     """
     Класс для рисования сеток и добавления к ним заголовков, цифр и букв.
+    Неизменный фон каждой сетки рисуется один раз на отдельной поверхности и затем только копируется
+    на экран. Готовые фоны хранятся в общем кэше по заголовку, смещению, шрифту, буквам и цветам,
+    поэтому новый фон рисуется только при изменении одного из них.
     ----------
     Атрибуты:
         title (str): Имя игрока будет отображаться в верхней части его сетки.
         offset (int): Где начинается сетка (количество блоков)
                 (обычно 0 для компьютера и 15 для человека)
+        rect (pygame Rect): прямоугольник экрана, который занимает фон сетки
     ----------
     Методы:
-    __draw_grid(): рисует две сетки для обоих игроков
-    __add_nums_letters_to_grid(): рисует числа от 1 до 10 по вертикали и добавляет буквы ниже по горизонтали.
+    __draw(surface): рисует две сетки для обоих игроков
+    __add_nums_letters_to_grid(surface): рисует числа от 1 до 10 по вертикали и добавляет буквы ниже по горизонтали.
         линии для обеих сеток
-    __sign_grid(): помещает имена игроков (титулы) в центр над сетками.
+    __sign_grid(surface): помещает имена игроков (титулы) в центр над сетками.
+    __render_background(): рисует фон сетки на отдельной поверхности
     """
 
+    __backgrounds = {}
+
     def __init__(
         self,
         *,
@@ -37,6 +46,7 @@ class Grid:
         letters: list,
         line_color: tuple,
         text_color: tuple,
+        background_color: tuple = WHITE,
     ) -> None:
         """
         title(str): Имя игрока будет отображаться в верхней части его сетки.
@@ -49,23 +59,47 @@ class Grid:
         self.letters = letters
         self.line_color = line_color
         self.text_color = text_color
-        self.__draw()
-        self.__add_numbers_and_letters()
-        self.__sign_grid()
+        self.background_color = background_color
+        top = UPPER_MARGIN - BLOCK_SIZE // 2 - FONT_SIZE
+        self.rect = pygame.Rect(
+            LEFT_MARGIN + (self.offset - 1) * BLOCK_SIZE,
+            top,
+            11 * BLOCK_SIZE + LINE_WIDTH,
+            UPPER_MARGIN + 11 * BLOCK_SIZE - top,
+        )
+        key = (title, offset, font, tuple(letters), tuple(line_color), tuple(text_color), tuple(background_color))
+        background = Grid.__backgrounds.get(key)
+        if background is None:
+            background = Grid.__backgrounds[key] = self.__render_background()
+        get_screen().blit(background, self.rect)
+
+    def __render_background(self) -> pygame.Surface:
+        """
+        Рисует линии, цифры, буквы и заголовок сетки на отдельной поверхности размером с rect.
+        """
+        surface = pygame.Surface(self.rect.size)
+        surface.fill(self.background_color)
+        self.__draw(surface)
+        self.__add_numbers_and_letters(surface)
+        self.__sign_grid(surface)
+        return surface
 
-    def __draw(self) -> None:
+    def __draw(self, surface: pygame.Surface) -> None:
         """
         Рисует две сетки для обоих игроков
         """
+        # Coordinates are relative to the background surface, not to the screen
+        left_margin = LEFT_MARGIN - self.rect.left
+        upper_margin = UPPER_MARGIN - self.rect.top
         for i in range(11):
-            hor_line_start_pos = (LEFT_MARGIN + self.offset * BLOCK_SIZE, UPPER_MARGIN + i * BLOCK_SIZE)
-            hor_line_end_pos = (LEFT_MARGIN + (10 + self.offset) * BLOCK_SIZE, UPPER_MARGIN + i * BLOCK_SIZE)
-            ver_line_start_pos = (LEFT_MARGIN + (i + self.offset) * BLOCK_SIZE, UPPER_MARGIN)
-            ver_line_end_pos = (LEFT_MARGIN + (i + self.offset) * BLOCK_SIZE, UPPER_MARGIN + 10 * BLOCK_SIZE)
+            hor_line_start_pos = (left_margin + self.offset * BLOCK_SIZE, upper_margin + i * BLOCK_SIZE)
+            hor_line_end_pos = (left_margin + (10 + self.offset) * BLOCK_SIZE, upper_margin + i * BLOCK_SIZE)
+            ver_line_start_pos = (left_margin + (i + self.offset) * BLOCK_SIZE, upper_margin)
+            ver_line_end_pos = (left_margin + (i + self.offset) * BLOCK_SIZE, upper_margin + 10 * BLOCK_SIZE)
 
             # Horizontal lines
             pygame.draw.line(
-                screen,
+                surface,
                 self.line_color,
                 hor_line_start_pos,
                 hor_line_end_pos,
@@ -73,48 +107,54 @@ class Grid:
             )
             # Vertical lines
             pygame.draw.line(
-                screen,
+                surface,
                 self.line_color,
                 ver_line_start_pos,
                 ver_line_end_pos,
                 LINE_WIDTH,
             )
 
-    def __add_numbers_and_letters(self) -> None:
+    def __add_numbers_and_letters(self, surface: pygame.Surface) -> None:
         """
         Рисует цифры от 1 до 10 по вертикали и добавляет буквы ниже по горизонтали
         линии для обеих сеток
         """
+        # Coordinates are relative to the background surface, not to the screen
+        left_margin = LEFT_MARGIN - self.rect.left
+        upper_margin = UPPER_MARGIN - self.rect.top
         for i in range(10):
-            num_ver = self.font.render(str(i + 1), True, self.text_color)
-            letters_hor = self.font.render(self.letters[i], True, self.text_color)
+            num_ver = render_text(self.font, str(i + 1), self.text_color)
+            letters_hor = render_text(self.font, self.letters[i], self.text_color)
             num_ver_width = num_ver.get_width()
             num_ver_height = num_ver.get_height()
             letters_hor_width = letters_hor.get_width()
             numbers_blit_destination = (
-                LEFT_MARGIN - (BLOCK_SIZE // 2 + num_ver_width // 2) + self.offset * BLOCK_SIZE,
-                UPPER_MARGIN + i * BLOCK_SIZE + (BLOCK_SIZE // 2 - num_ver_height // 2),
+                left_margin - (BLOCK_SIZE // 2 + num_ver_width // 2) + self.offset * BLOCK_SIZE,
+                upper_margin + i * BLOCK_SIZE + (BLOCK_SIZE // 2 - num_ver_height // 2),
             )
             letters_blit_destination = (
-                LEFT_MARGIN + i * BLOCK_SIZE + (BLOCK_SIZE // 2 - letters_hor_width // 2) + self.offset * BLOCK_SIZE,
-                UPPER_MARGIN + 10 * BLOCK_SIZE,
+                left_margin + i * BLOCK_SIZE + (BLOCK_SIZE // 2 - letters_hor_width // 2) + self.offset * BLOCK_SIZE,
+                upper_margin + 10 * BLOCK_SIZE,
             )
 
             # Numbers (vertical)
-            screen.blit(num_ver, numbers_blit_destination)
+            surface.blit(num_ver, numbers_blit_destination)
             # Letters (horizontal)
-            screen.blit(letters_hor, letters_blit_destination)
+            surface.blit(letters_hor, letters_blit_destination)
 
-    def __sign_grid(self) -> None:
+    def __sign_grid(self, surface: pygame.Surface) -> None:
         """
         Помещает имена игроков (титулы) в центр над сетками
         """
-        player = self.font.render(self.title, True, self.text_color)
+        # Coordinates are relative to the background surface, not to the screen
+        left_margin = LEFT_MARGIN - self.rect.left
+        upper_margin = UPPER_MARGIN - self.rect.top
+        player = render_text(self.font, self.title, self.text_color)
         sign_width = player.get_width()
-        screen.blit(
+        surface.blit(
             player,
             (
-                LEFT_MARGIN + 5 * BLOCK_SIZE - sign_width // 2 + self.offset * BLOCK_SIZE,
-                UPPER_MARGIN - BLOCK_SIZE // 2 - FONT_SIZE,
+                left_margin + 5 * BLOCK_SIZE - sign_width // 2 + self.offset * BLOCK_SIZE,
+                upper_margin - BLOCK_SIZE // 2 - FONT_SIZE,
             ),
         )
@@ -1,7 +1,6 @@
 """Create ships manually."""
 
-import pygame
-
+from elements.board import DEFAULT_BOARD
 from elements.constants import (
     BLOCK_SIZE,
     LEFT_MARGIN,
@@ -9,10 +8,9 @@ from elements.constants import (
     UPPER_MARGIN,
     WHITE,
 )
-from game_logic import is_ship_valid, update_used_blocks, validate_ships_numbers
-from graphics.drawing import screen, show_message_at_rect_center
-
-pygame.init()
+from game_logic import is_ship_valid, validate_ships_numbers
+from graphics.display import get_screen
+from graphics.drawing import show_message_at_rect_center
 
 
 def manually_create_new_ship(
@@ -29,12 +27,10 @@ def manually_create_new_ship(
     """
     Validate each manually created ship and add it to the list of ships.
     """
-    start_block = ((x_start - LEFT_MARGIN) // BLOCK_SIZE + 1, (y_start - UPPER_MARGIN) // BLOCK_SIZE + 1)
-    end_block = ((x_end - LEFT_MARGIN) // BLOCK_SIZE + 1, (y_end - UPPER_MARGIN) // BLOCK_SIZE + 1)
-    if start_block > end_block:
-        start_block, end_block = end_block, start_block
+    start_block, end_block = drag_to_blocks(x_start, y_start, x_end, y_end)
     temp_ship = []
-    if 15 < start_block[0] < 26 and 0 < start_block[1] < 11 and 15 < end_block[0] < 26 and 0 < end_block[1] < 11:
+    human_offset = DEFAULT_BOARD.human_offset
+    if DEFAULT_BOARD.contains(start_block, human_offset) and DEFAULT_BOARD.contains(end_block, human_offset):
         temp_ship = create_new_ship(start_block, end_block)
     else:
         show_message_at_rect_center("SHIP IS BEYOND YOUR GRID! Try again!", RECT_FOR_MESSAGES_AND_BUTTONS)
@@ -44,16 +40,41 @@ def manually_create_new_ship(
         )
 
 
+def drag_to_blocks(x_start, y_start, x_end, y_end) -> tuple:
+    """
+    Convert the start and the end of a mouse drag to the first and the last block of the ship.
+    """
+    start_block = ((x_start - LEFT_MARGIN) // BLOCK_SIZE + 1, (y_start - UPPER_MARGIN) // BLOCK_SIZE + 1)
+    end_block = ((x_end - LEFT_MARGIN) // BLOCK_SIZE + 1, (y_end - UPPER_MARGIN) // BLOCK_SIZE + 1)
+    if start_block > end_block:
+        start_block, end_block = end_block, start_block
+    return start_block, end_block
+
+
+def ship_fits(*, used_blocks_for_manual_drawing, num_ships_list, x_start, y_start, x_end, y_end) -> bool:
+    """
+    Check whether the ship being dragged can be placed where it is now, without messages (called on every
+    mouse move to colour the preview). Takes O(ship length) with the occupancy grid.
+    """
+    start_block, end_block = drag_to_blocks(x_start, y_start, x_end, y_end)
+    horizontal = start_block[1] == end_block[1]
+    if not horizontal and start_block[0] != end_block[0]:
+        return False
+    length = end_block[0] - start_block[0] + 1 if horizontal else end_block[1] - start_block[1] + 1
+    if length > max(DEFAULT_BOARD.fleet) or num_ships_list[length - 1] >= DEFAULT_BOARD.ships_count(length):
+        return False
+    return used_blocks_for_manual_drawing.can_place_at(start_block, length, horizontal)
+
+
 def validate_and_save_new_ship(
     human_ships_to_draw, human_ships_set, used_blocks_for_manual_drawing, num_ships_list, temp_ship
 ):
-    temp_ship_set = set(temp_ship)
-    if is_ship_valid(ship_set=temp_ship_set, blocks_for_manual_drawing=used_blocks_for_manual_drawing):
+    if is_ship_valid(ship=temp_ship, blocks_for_manual_drawing=used_blocks_for_manual_drawing):
         if validate_ships_numbers(ship=temp_ship, num_ships_list=num_ships_list):
             num_ships_list[len(temp_ship) - 1] += 1
             human_ships_to_draw.append(temp_ship)
-            human_ships_set |= temp_ship_set
-            update_used_blocks(ship=temp_ship, method=used_blocks_for_manual_drawing.add)
+            human_ships_set.update(temp_ship)
+            used_blocks_for_manual_drawing.place(temp_ship)
         else:
             show_message_at_rect_center(
                 f"There already are enough of {len(temp_ship)} ships!", RECT_FOR_MESSAGES_AND_BUTTONS
@@ -63,12 +84,12 @@ def validate_and_save_new_ship(
 
 
 def create_new_ship(start_block, end_block):
-    screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
+    get_screen().fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
     temp_ship = []
-    if start_block[0] == end_block[0] and (end_block[1] - start_block[1]) < 4:
+    if start_block[0] == end_block[0] and (end_block[1] - start_block[1]) < max(DEFAULT_BOARD.fleet):
         for block in range(start_block[1], end_block[1] + 1):
             temp_ship.append((start_block[0], block))
-    elif start_block[1] == end_block[1] and (end_block[0] - start_block[0]) < 4:
+    elif start_block[1] == end_block[1] and (end_block[0] - start_block[0]) < max(DEFAULT_BOARD.fleet):
         for block in range(start_block[0], end_block[0] + 1):
             temp_ship.append((block, start_block[1]))
     else:
@@ -0,0 +1,63 @@
+"""Dirty-rectangle tracking: only changed screen areas are pushed to the display."""
+
+import pygame
+
+from elements.constants import BLOCK_SIZE, LEFT_MARGIN, UPPER_MARGIN
+from elements.profiling import profiler
+
+# X strokes are centred on the block corners, so they spill a little outside the block
+BLOCK_RECT_INFLATION = BLOCK_SIZE // 6
+
+
+def block_rect(block: tuple) -> pygame.Rect:
+    """
+    Возвращает прямоугольник экрана, который занимает блок (с небольшим запасом для крестиков).
+    """
+    rect = pygame.Rect(
+        LEFT_MARGIN + (block[0] - 1) * BLOCK_SIZE, UPPER_MARGIN + (block[1] - 1) * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE
+    )
+    return rect.inflate(BLOCK_RECT_INFLATION, BLOCK_RECT_INFLATION)
+
+
+class DirtyRectRenderer:
+    """
+    Собирает прямоугольники экрана, изменившиеся с прошлого кадра, и обновляет на дисплее только их
+    ----------
+    Методы:
+        mark(rect): отмечает изменившийся прямоугольник
+        mark_blocks(blocks): отмечает изменившиеся блоки сетки
+        update(): передает на дисплей только отмеченные прямоугольники
+        update_all(): обновляет весь экран
+    """
+
+    def __init__(self) -> None:
+        self.__dirty_rects = []
+
+    def mark(self, rect) -> None:
+        """
+        Отмечает прямоугольник (x, y, ширина, высота) или pygame.Rect как изменившийся.
+        """
+        self.__dirty_rects.append(pygame.Rect(rect))
+
+    def mark_blocks(self, blocks) -> None:
+        """
+        Отмечает блоки сетки с координатами blocks как изменившиеся.
+        """
+        self.__dirty_rects.extend(block_rect(block) for block in blocks)
+
+    def update(self) -> None:
+        """
+        Передает на дисплей только изменившиеся прямоугольники. Если ничего не менялось, ничего не делает.
+        """
+        if self.__dirty_rects:
+            with profiler.phase("display.update"):
+                pygame.display.update(self.__dirty_rects)
+            self.__dirty_rects.clear()
+
+    def update_all(self) -> None:
+        """
+        Обновляет весь экран (например, после смены фазы игры).
+        """
+        with profiler.phase("display.update"):
+            pygame.display.update()
+        self.__dirty_rects.clear()
@@ -0,0 +1,63 @@
+"""Cached stamp surfaces for the X's, dots and ship outlines drawn on the grids."""
+
+from functools import lru_cache
+
+import pygame
+
+from elements.constants import BLOCK_SIZE
+
+# Thick X strokes are centred on the block corners, so the X stamp is this much larger than a block on every side
+HIT_STAMP_MARGIN = BLOCK_SIZE // 6
+DOT_RADIUS = BLOCK_SIZE // 6
+SHIP_OUTLINE_WIDTH = BLOCK_SIZE // 10
+# Stamps are filled with a transparent colour key rather than per-pixel alpha: the strokes are not antialiased,
+# and run-length encoded colour-key blits are several times faster than alpha blending
+COLOR_KEY = (255, 0, 255)
+SPARE_COLOR_KEY = (0, 255, 255)
+
+
+def _new_stamp(size: tuple, color: tuple) -> pygame.Surface:
+    """
+    Возвращает поверхность размера size, залитую прозрачным цветом (отличным от color).
+    """
+    key = SPARE_COLOR_KEY if tuple(color[:3]) == COLOR_KEY else COLOR_KEY
+    stamp = pygame.Surface(size)
+    stamp.fill(key)
+    stamp.set_colorkey(key, pygame.RLEACCEL)
+    return stamp
+
+
+@lru_cache(maxsize=None)
+def hit_stamp(color: tuple) -> pygame.Surface:
+    """
+    Возвращает поверхность с прозрачным фоном с крестиком цвета color размером BLOCK_SIZE + 2 * HIT_STAMP_MARGIN.
+    Ее левый верхний угол ставится на HIT_STAMP_MARGIN левее и выше угла блока.
+    """
+    size = BLOCK_SIZE + 2 * HIT_STAMP_MARGIN
+    stamp = _new_stamp((size, size), color)
+    start, end = HIT_STAMP_MARGIN, HIT_STAMP_MARGIN + BLOCK_SIZE
+    pygame.draw.line(stamp, color, (start, start), (end, end), BLOCK_SIZE // 6)
+    pygame.draw.line(stamp, color, (start, end), (end, start), BLOCK_SIZE // 6)
+    return stamp
+
+
+@lru_cache(maxsize=None)
+def dot_stamp(color: tuple) -> pygame.Surface:
+    """
+    Возвращает поверхность с прозрачным фоном размером с блок с точкой цвета color в центре.
+    """
+    stamp = _new_stamp((BLOCK_SIZE, BLOCK_SIZE), color)
+    pygame.draw.circle(stamp, color, (BLOCK_SIZE / 2, BLOCK_SIZE / 2), DOT_RADIUS)
+    return stamp
+
+
+@lru_cache(maxsize=None)
+def ship_stamp(length: int, vertical: bool, color: tuple) -> pygame.Surface:
+    """
+    Возвращает поверхность с прозрачным фоном с рамкой корабля длины length цвета color
+    (вертикального, если vertical, иначе горизонтального или однопалубного).
+    """
+    size = (BLOCK_SIZE, BLOCK_SIZE * length) if vertical else (BLOCK_SIZE * length, BLOCK_SIZE)
+    stamp = _new_stamp(size, color)
+    pygame.draw.rect(stamp, color, ((0, 0), size), width=SHIP_OUTLINE_WIDTH)
+    return stamp
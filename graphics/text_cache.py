@@ -0,0 +1,70 @@
+"""Shared LRU cache of rendered text surfaces."""
+
+from collections import OrderedDict
+
+import pygame
+
+from elements.profiling import profiler
+
+# How many rendered texts are kept; the game uses a few dozen distinct ones
+TEXT_CACHE_SIZE = 256
+
+
+class TextCache:
+    """
+    Кэш отрисованных надписей с вытеснением давно не использованных (LRU)
+    ----------
+    Атрибуты:
+        max_size (int): наибольшее число надписей в кэше
+        hits (int): сколько раз надпись нашлась в кэше
+        misses (int): сколько раз надпись пришлось отрисовать
+    ----------
+    Методы:
+        render(font, text, color): возвращает поверхность с надписью (из кэша или новую)
+        clear(): очищает кэш
+    Возвращаемые поверхности общие, их можно только копировать на экран (blit), но не изменять.
+    """
+
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.__surfaces = OrderedDict()
+
+    def render(self, font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+        """
+        Возвращает сглаженную надпись text цвета color шрифтом font.
+        """
+        profiler.count("text_lookups")
+        key = (font, text, tuple(color))
+        surface = self.__surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.__surfaces.move_to_end(key)
+            return surface
+        self.misses += 1
+        profiler.count("text_renders")
+        surface = font.render(text, True, color)
+        self.__surfaces[key] = surface
+        if len(self.__surfaces) > self.max_size:
+            self.__surfaces.popitem(last=False)
+        return surface
+
+    def clear(self) -> None:
+        """
+        Удаляет все надписи из кэша.
+        """
+        self.__surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self.__surfaces)
+
+
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, color: tuple) -> pygame.Surface:
+    """
+    Отрисовывает надпись через общий кэш text_cache.
+    """
+    return text_cache.render(font, text, color)
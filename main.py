@@ -1,13 +1,20 @@
-import copy
+import os
 import sys
+from functools import lru_cache
+from typing import Optional
 
 import pygame
 
+from ai.endgame import EndgameSolver
 from elements.autoships import AutoShips
+from elements.board import DEFAULT_BOARD
 from elements.constants import (
     AUTO_BUTTON_PLACE,
     BLACK,
     BLOCK_SIZE,
+    FONT_SIZE,
+    FRAME_RATE,
+    GAME_OVER_FONT_SIZE,
     HOW_TO_CREATE_SHIPS_MESSAGE,
     LEFT_MARGIN,
     LETTERS,
@@ -21,6 +28,7 @@ from elements.constants import (
     RECT_FOR_GRIDS,
     RECT_FOR_HUMAN_SHIPS_COUNT,
     RECT_FOR_MESSAGES_AND_BUTTONS,
+    RED,
     SIZE,
     UNDO_BUTTON_PLACE,
     UPPER_MARGIN,
@@ -29,35 +37,38 @@ from elements.constants import (
     X_OFFSET_FOR_HUMAN_SHIPS_COUNT,
     Y_OFFSET_FOR_SHIPS_COUNT,
 )
-from game_logic import (
-    around_last_computer_hit_set,
-    check_hit_or_miss,
-    computer_destroyed_ships_count,
-    computer_shoots,
-    destroyed_computer_ships,
-    dotted_set,
-    dotted_set_for_computer_not_to_shoot,
-    hit_blocks,
-    hit_blocks_for_computer_not_to_shoot,
-    human_destroyed_ships_count,
-    last_hits_list,
-    update_used_blocks,
-)
+from elements.fleet import Fleet
+from elements.occupancy import OccupancyGrid
+from elements.profiling import PROFILE_ENV, profiler
+from game_logic import GameState, check_hit_or_miss, computer_shoots
 from graphics import Grid
 from graphics.button import Button
+from graphics.display import get_font, get_screen, mark_startup, startup_report, startup_timings
 from graphics.drawing import (
     draw_from_dotted_set,
     draw_hit_blocks,
     draw_ships,
-    font,
-    game_over_font,
     print_destroyed_ships_count,
-    screen,
     show_message_at_rect_center,
 )
-from graphics.manual_ships import manually_create_new_ship
+from graphics.events import allow_only_game_events, wait_for_events
+from graphics.manual_ships import manually_create_new_ship, ship_fits
+from graphics.renderer import DirtyRectRenderer
+from simulation.game_log import GameLogWriter
+
+mark_startup("imports")
 
-pygame.init()
+# Path of the binary game log; games are not recorded if it is not set
+GAME_LOG_ENV = "BATTLESHIP_GAME_LOG"
+
+
+@lru_cache(maxsize=None)
+def open_game_log() -> Optional[GameLogWriter]:
+    """
+    Открывает (один раз за запуск) журнал партий из переменной окружения BATTLESHIP_GAME_LOG для дописывания.
+    """
+    path = os.environ.get(GAME_LOG_ENV)
+    return GameLogWriter(open(path, "ab")) if path else None
 
 
 def main():
@@ -75,11 +86,19 @@ def main():
     computer_turn = False
     start = (0, 0)
     ship_size = (0, 0)
+    dragged_ship_fits = True
+    clock = pygame.time.Clock()
+    screen = get_screen()
+    font = get_font(FONT_SIZE)
+    game_over_font = get_font(GAME_OVER_FONT_SIZE)
+    allow_only_game_events()
+    profiler.install_export_handlers(os.environ.get(PROFILE_ENV))
+    state = GameState(endgame_solver=EndgameSolver())
 
     human_ships_to_draw = []
     human_ships_set = set()
-    used_blocks_for_manual_drawing = set()
-    num_ships_list = [0, 0, 0, 0]
+    used_blocks_for_manual_drawing = OccupancyGrid(DEFAULT_BOARD.human_offset)
+    num_ships_list = [0] * max(DEFAULT_BOARD.fleet)
 
     # Create AUTO and MANUAL buttons and explanatory message for them
     auto_button = Button(AUTO_BUTTON_PLACE, "АВТО", HOW_TO_CREATE_SHIPS_MESSAGE, font)
@@ -94,10 +113,17 @@ def main():
 
     screen.fill(WHITE)
     Grid(title="КОМПЬЮТЕР", offset=0, font=font, letters=LETTERS, line_color=BLACK, text_color=BLACK)  # type: ignore
-    Grid(title="ЧЕЛОВЕК", offset=15, font=font, letters=LETTERS, line_color=BLACK, text_color=BLACK)  # type: ignore
+    Grid(
+        title="ЧЕЛОВЕК",
+        offset=DEFAULT_BOARD.human_offset,
+        font=font,
+        letters=LETTERS,  # type: ignore
+        line_color=BLACK,
+        text_color=BLACK,
+    )
     # Create computer ships
     computer = AutoShips(0)
-    computer_ships_working = copy.deepcopy(computer.ships)
+    computer_fleet = Fleet(computer.ships)
 
     while ships_creation_not_decided:
         auto_button.draw()
@@ -105,129 +131,220 @@ def main():
         auto_button.change_color_on_hover()
         manual_button.change_color_on_hover()
         auto_button.print_message()
+        with profiler.phase("display.update"):
+            pygame.display.update()
+        profiler.end_frame()
+        if "first frame" not in startup_timings:
+            mark_startup("first frame")
+            if "--startup-report" in sys.argv:
+                sys.stderr.write(startup_report() + "\n")
+        clock.tick(FRAME_RATE)
 
+        events = wait_for_events()
+        profiler.start_frame()
         mouse = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            # If AUTO button is pressed - create human ships automatically
-            elif event.type == pygame.MOUSEBUTTONDOWN and auto_button.rect.collidepoint(mouse):
-                human = AutoShips(15)
-                human_ships_to_draw = human.ships
-                human_ships_working = copy.deepcopy(human.ships)
-                human_ships_set = human.ships_set
-                ships_creation_not_decided = False
-                ships_not_created = False
-            elif event.type == pygame.MOUSEBUTTONDOWN and manual_button.rect.collidepoint(mouse):
-                ships_creation_not_decided = False
+        with profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                # If AUTO button is pressed - create human ships automatically
+                elif event.type == pygame.MOUSEBUTTONDOWN and auto_button.rect.collidepoint(mouse):
+                    human = AutoShips(DEFAULT_BOARD.human_offset)
+                    human_ships_to_draw = human.ships
+                    human_fleet = Fleet(human.ships)
+                    human_ships_set = human.ships_set
+                    ships_creation_not_decided = False
+                    ships_not_created = False
+                elif event.type == pygame.MOUSEBUTTONDOWN and manual_button.rect.collidepoint(mouse):
+                    ships_creation_not_decided = False
 
-        pygame.display.update()
         screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
 
     while ships_not_created:
         screen.fill(WHITE, RECT_FOR_GRIDS)
         Grid(title="КОМПЬЮТЕР", offset=0, font=font, letters=LETTERS, line_color=BLACK, text_color=BLACK)  # type: ignore
-        Grid(title="ЧЕЛОВЕК", offset=15, font=font, letters=LETTERS, line_color=BLACK, text_color=BLACK)
+        Grid(
+            title="ЧЕЛОВЕК",
+            offset=DEFAULT_BOARD.human_offset,
+            font=font,
+            letters=LETTERS,
+            line_color=BLACK,
+            text_color=BLACK,
+        )
         undo_button.draw()
         undo_button.print_message()
         undo_button.change_color_on_hover()
-        mouse = pygame.mouse.get_pos()
         if not human_ships_to_draw:
             undo_button.draw(LIGHT_GRAY)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif undo_button.rect.collidepoint(mouse) and event.type == pygame.MOUSEBUTTONDOWN:
-                if human_ships_to_draw:
-                    screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
-                    deleted_ship = human_ships_to_draw.pop()
-                    num_ships_list[len(deleted_ship) - 1] -= 1
-                    update_used_blocks(ship=deleted_ship, method=used_blocks_for_manual_drawing.discard)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                drawing = True
-                x_start, y_start = event.pos
-                start = x_start, y_start
-                ship_size = (0, 0)
-            elif drawing and event.type == pygame.MOUSEMOTION:
-                x_end, y_end = event.pos
-                ship_size = x_end - x_start, y_end - y_start
-            elif drawing and event.type == pygame.MOUSEBUTTONUP:
-                x_end, y_end = event.pos
-                drawing = False
-                ship_size = (0, 0)
-                manually_create_new_ship(
-                    human_ships_to_draw=human_ships_to_draw,
-                    human_ships_set=human_ships_set,
-                    used_blocks_for_manual_drawing=used_blocks_for_manual_drawing,
-                    num_ships_list=num_ships_list,
-                    x_start=x_start,
-                    y_start=y_start,
-                    x_end=x_end,
-                    y_end=y_end,
-                )
-            if len(human_ships_to_draw) == 10:
-                ships_not_created = False
-                human_ships_working = copy.deepcopy(human_ships_to_draw)
-                screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
-        pygame.draw.rect(screen, BLACK, (start, ship_size), 3)
+        pygame.draw.rect(screen, BLACK if dragged_ship_fits else RED, (start, ship_size), 3)
         draw_ships(human_ships_to_draw)
-        pygame.display.update()
+        with profiler.phase("display.update"):
+            pygame.display.update()
+        profiler.end_frame()
+        # Caps the redraws while a ship is being dragged
+        clock.tick(FRAME_RATE)
 
-    while not game_over:
-        screen.fill(WHITE, RECT_FOR_HUMAN_SHIPS_COUNT)
-        screen.fill(WHITE, RECT_FOR_COMPUTER_SHIPS_COUNT)
-        if not dotted_set | hit_blocks:
-            show_message_at_rect_center("ИГРА НАЧАЛАСЬ! ВАШ ХОД!", MESSAGE_RECT_COMPUTER)
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif not computer_turn and event.type == pygame.MOUSEBUTTONDOWN:
-                x, y = event.pos
-                if (LEFT_MARGIN < x < LEFT_MARGIN + 10 * BLOCK_SIZE) and (
-                    UPPER_MARGIN < y < UPPER_MARGIN + 10 * BLOCK_SIZE
-                ):
-                    fired_block = ((x - LEFT_MARGIN) // BLOCK_SIZE + 1, (y - UPPER_MARGIN) // BLOCK_SIZE + 1)
-                    computer_turn = not check_hit_or_miss(
-                        fired_block=fired_block,
-                        opponents_ships_list=computer_ships_working,
-                        computer_turn=False,
-                        opponents_ships_list_original_copy=computer.ships,
-                        opponents_ships_set=computer.ships_set,
-                        computer=computer,
+        events = wait_for_events()
+        profiler.start_frame()
+        mouse = pygame.mouse.get_pos()
+        with profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif undo_button.rect.collidepoint(mouse) and event.type == pygame.MOUSEBUTTONDOWN:
+                    if human_ships_to_draw:
+                        screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
+                        deleted_ship = human_ships_to_draw.pop()
+                        num_ships_list[len(deleted_ship) - 1] -= 1
+                        human_ships_set.difference_update(deleted_ship)
+                        used_blocks_for_manual_drawing.remove(deleted_ship)
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    drawing = True
+                    x_start, y_start = event.pos
+                    start = x_start, y_start
+                    ship_size = (0, 0)
+                    dragged_ship_fits = True
+                elif drawing and event.type == pygame.MOUSEMOTION:
+                    x_end, y_end = event.pos
+                    ship_size = x_end - x_start, y_end - y_start
+                    dragged_ship_fits = ship_fits(
+                        used_blocks_for_manual_drawing=used_blocks_for_manual_drawing,
+                        num_ships_list=num_ships_list,
+                        x_start=x_start,
+                        y_start=y_start,
+                        x_end=x_end,
+                        y_end=y_end,
                     )
-
-                    draw_from_dotted_set(dotted_set)
-                    draw_hit_blocks(hit_blocks)
-                    screen.fill(WHITE, MESSAGE_RECT_COMPUTER)
-                    show_message_at_rect_center(
-                        f"Ваш последний выстрел: {LETTERS[fired_block[0]-1] + str(fired_block[1])}",
-                        MESSAGE_RECT_COMPUTER,
+                elif drawing and event.type == pygame.MOUSEBUTTONUP:
+                    x_end, y_end = event.pos
+                    drawing = False
+                    ship_size = (0, 0)
+                    manually_create_new_ship(
+                        human_ships_to_draw=human_ships_to_draw,
+                        human_ships_set=human_ships_set,
+                        used_blocks_for_manual_drawing=used_blocks_for_manual_drawing,
+                        num_ships_list=num_ships_list,
+                        x_start=x_start,
+                        y_start=y_start,
+                        x_end=x_end,
+                        y_end=y_end,
                     )
-                else:
-                    show_message_at_rect_center("Ваш выстрел вне сетки! Попробуйте еще раз", MESSAGE_RECT_COMPUTER)
+                if len(human_ships_to_draw) == len(DEFAULT_BOARD.fleet):
+                    ships_not_created = False
+                    human_fleet = Fleet(human_ships_to_draw)
+                    screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
+
+    game_log = open_game_log()
+    if game_log is not None:
+        game_log.start_game(computer.ships, human_ships_to_draw)
+    renderer = DirtyRectRenderer()
+    drawn_dotted_blocks = set()
+    drawn_hit_blocks = set()
+    drawn_destroyed_ships_number = 0
+    drawn_destroyed_ships_counts = None
+    show_message_at_rect_center("ИГРА НАЧАЛАСЬ! ВАШ ХОД!", MESSAGE_RECT_COMPUTER)
+    draw_ships(human_ships_to_draw)
+    renderer.update_all()
+
+    while not game_over:
+        shot_fired = False
+        # The computer's turn must not wait for the player
+        events = pygame.event.get() if computer_turn else wait_for_events()
+        profiler.start_frame()
+        with profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                # The window was uncovered: nothing changed in the game, but the whole screen has to be pushed again
+                elif event.type == pygame.WINDOWEXPOSED:
+                    renderer.mark(screen.get_rect())
+                elif not computer_turn and event.type == pygame.MOUSEBUTTONDOWN:
+                    x, y = event.pos
+                    if (LEFT_MARGIN < x < LEFT_MARGIN + DEFAULT_BOARD.width * BLOCK_SIZE) and (
+                        UPPER_MARGIN < y < UPPER_MARGIN + DEFAULT_BOARD.height * BLOCK_SIZE
+                    ):
+                        fired_block = ((x - LEFT_MARGIN) // BLOCK_SIZE + 1, (y - UPPER_MARGIN) // BLOCK_SIZE + 1)
+                        computer_turn = not check_hit_or_miss(
+                            state=state,
+                            fired_block=fired_block,
+                            opponents_fleet=computer_fleet,
+                            computer_turn=False,
+                            opponents_ships_set=computer.ships_set,
+                            computer=computer,
+                        )
+                        if game_log is not None:
+                            game_log.record_shot(False, fired_block)
+                        profiler.count("shots")
+                        shot_fired = True
+                        screen.fill(WHITE, MESSAGE_RECT_COMPUTER)
+                        renderer.mark(MESSAGE_RECT_COMPUTER)
+                        show_message_at_rect_center(
+                            f"Ваш последний выстрел: {LETTERS[fired_block[0]-1] + str(fired_block[1])}",
+                            MESSAGE_RECT_COMPUTER,
+                        )
+                    else:
+                        renderer.mark(
+                            show_message_at_rect_center(
+                                "Ваш выстрел вне сетки! Попробуйте еще раз", MESSAGE_RECT_COMPUTER
+                            )
+                        )
         if computer_turn:
-            fired_block = computer_shoots()
+            fired_block = computer_shoots(state)
             computer_turn = check_hit_or_miss(
+                state=state,
                 fired_block=fired_block,
-                opponents_ships_list=human_ships_working,
+                opponents_fleet=human_fleet,
                 computer_turn=True,
-                opponents_ships_list_original_copy=human_ships_to_draw,
                 opponents_ships_set=human_ships_set,
                 computer=computer,
             )
-
-            draw_from_dotted_set(dotted_set)
-            draw_hit_blocks(hit_blocks)
+            if game_log is not None:
+                game_log.record_shot(True, fired_block)
+            profiler.count("shots")
+            shot_fired = True
             screen.fill(WHITE, MESSAGE_RECT_HUMAN)
+            renderer.mark(MESSAGE_RECT_HUMAN)
             show_message_at_rect_center(
-                f"Последний выстрел компьютера: {LETTERS[fired_block[0] - 16] + str(fired_block[1])}",
+                "Последний выстрел компьютера: "
+                f"{LETTERS[fired_block[0] - DEFAULT_BOARD.human_offset - 1] + str(fired_block[1])}",
                 MESSAGE_RECT_HUMAN,
             )
-        draw_ships(destroyed_computer_ships)
-        draw_ships(human_ships_to_draw)
+
+        if shot_fired:
+            # Only the blocks changed by this shot are drawn and pushed to the display
+            new_dotted_blocks = state.dotted_set - drawn_dotted_blocks
+            new_hit_blocks = state.hit_blocks - drawn_hit_blocks
+            draw_from_dotted_set(new_dotted_blocks)
+            draw_hit_blocks(new_hit_blocks)
+            drawn_dotted_blocks |= new_dotted_blocks
+            drawn_hit_blocks |= new_hit_blocks
+            renderer.mark_blocks(new_dotted_blocks | new_hit_blocks)
+            # Only the outlines under the new X's are redrawn (a newly destroyed ship always contains the last hit)
+            draw_ships([ship for ship in state.destroyed_computer_ships if not new_hit_blocks.isdisjoint(ship)])
+            draw_ships([ship for ship in human_ships_to_draw if not new_hit_blocks.isdisjoint(ship)])
+            for ship in state.destroyed_computer_ships[drawn_destroyed_ships_number:]:
+                renderer.mark_blocks(ship)
+            drawn_destroyed_ships_number = len(state.destroyed_computer_ships)
+
+        destroyed_ships_counts = (
+            tuple(state.human_destroyed_ships_count.values()),
+            tuple(state.computer_destroyed_ships_count.values()),
+        )
+        if destroyed_ships_counts != drawn_destroyed_ships_counts:
+            screen.fill(WHITE, RECT_FOR_HUMAN_SHIPS_COUNT)
+            screen.fill(WHITE, RECT_FOR_COMPUTER_SHIPS_COUNT)
+            print_destroyed_ships_count(
+                X_OFFSET_FOR_HUMAN_SHIPS_COUNT, Y_OFFSET_FOR_SHIPS_COUNT, state.human_destroyed_ships_count, font
+            )
+            print_destroyed_ships_count(
+                X_OFFSET_FOR_COMPUTER_SHIPS_COUNT, Y_OFFSET_FOR_SHIPS_COUNT, state.computer_destroyed_ships_count, font
+            )
+            renderer.mark(RECT_FOR_HUMAN_SHIPS_COUNT)
+            renderer.mark(RECT_FOR_COMPUTER_SHIPS_COUNT)
+            drawn_destroyed_ships_counts = destroyed_ships_counts
 
         if not computer.ships_set:
             show_message_at_rect_center("ВЫ ПОБЕДИЛИ!", (0, 0, SIZE[0], SIZE[1]), game_over_font)
@@ -235,14 +352,14 @@ def main():
         if not human_ships_set:
             show_message_at_rect_center("ВЫ ПРОИГРАЛИ!", (0, 0, SIZE[0], SIZE[1]), game_over_font)
             game_over = True
-
-        print_destroyed_ships_count(
-            X_OFFSET_FOR_HUMAN_SHIPS_COUNT, Y_OFFSET_FOR_SHIPS_COUNT, human_destroyed_ships_count, font
-        )
-        print_destroyed_ships_count(
-            X_OFFSET_FOR_COMPUTER_SHIPS_COUNT, Y_OFFSET_FOR_SHIPS_COUNT, computer_destroyed_ships_count, font
-        )
-        pygame.display.update()
+        if game_over:
+            if game_log is not None:
+                game_log.end_game("human" if not computer.ships_set else "computer")
+            renderer.update_all()
+            profiler.export()
+        else:
+            renderer.update()
+        profiler.end_frame()
 
     while game_over:
         screen.fill(WHITE, RECT_FOR_MESSAGES_AND_BUTTONS)
@@ -251,27 +368,24 @@ def main():
         play_again_button.change_color_on_hover()
         quit_game_button.draw()
         quit_game_button.change_color_on_hover()
+        with profiler.phase("display.update"):
+            pygame.display.update()
+        profiler.end_frame()
+        clock.tick(FRAME_RATE)
 
+        events = wait_for_events()
+        profiler.start_frame()
         mouse = pygame.mouse.get_pos()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN and play_again_button.rect.collidepoint(mouse):
-                around_last_computer_hit_set.clear()
-                dotted_set_for_computer_not_to_shoot.clear()
-                hit_blocks_for_computer_not_to_shoot.clear()
-                last_hits_list.clear()
-                hit_blocks.clear()
-                dotted_set.clear()
-                destroyed_computer_ships.clear()
-                dotted_set.clear()
-                hit_blocks.clear()
-                main()
-            elif event.type == pygame.MOUSEBUTTONDOWN and quit_game_button.rect.collidepoint(mouse):
-                pygame.quit()
-                sys.exit()
-        pygame.display.update()
+        with profiler.phase("events"):
+            for event in events:
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.MOUSEBUTTONDOWN and play_again_button.rect.collidepoint(mouse):
+                    main()
+                elif event.type == pygame.MOUSEBUTTONDOWN and quit_game_button.rect.collidepoint(mouse):
+                    pygame.quit()
+                    sys.exit()
 
 
 if __name__ == "__main__":
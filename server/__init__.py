@@ -0,0 +1,3 @@
+# flake8: noqa
+from .game_server import GameServer
+from .session import GameSession
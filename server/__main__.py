@@ -0,0 +1,58 @@
+"""Runs the game server: python -m server --port 8765 --shooter density"""
+
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from ai import DensityShooter, MonteCarloShooter
+from elements.rng import RngStream
+from server.game_server import DEFAULT_HOST, DEFAULT_MAX_SESSIONS, DEFAULT_PORT, GameServer
+
+
+async def serve(args: argparse.Namespace) -> None:
+    """
+    Запускает сервер и обслуживает соединения до остановки.
+    Стрелки Монте-Карло всех сессий делят один пул процессов.
+    """
+    pool = None
+    shooter_factory = lambda: None
+    if args.shooter == "density":
+        shooter_factory = DensityShooter
+    elif args.shooter == "monte-carlo":
+        pool = ProcessPoolExecutor(os.cpu_count() or 1)
+        shooter_factory = lambda: MonteCarloShooter(executor=pool, time_budget=args.time_budget)
+    rng = None if args.seed is None else RngStream(args.seed)
+    server = GameServer(shooter_factory=shooter_factory, max_sessions=args.max_sessions, rng=rng)
+    await server.start(args.host, args.port)
+    print(f"serving on {args.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def main() -> None:
+    """
+    Разбирает аргументы командной строки и запускает сервер.
+    """
+    parser = argparse.ArgumentParser(description="BattleShip game server")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (0 - any free port)")
+    parser.add_argument(
+        "--shooter", choices=("default", "density", "monte-carlo"), default="default", help="computer shooter"
+    )
+    parser.add_argument("--time-budget", type=float, default=0.1, help="seconds per monte-carlo shot")
+    parser.add_argument("--seed", type=int, help="root seed of the sessions' random streams")
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS, help="simultaneous games limit")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
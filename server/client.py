@@ -0,0 +1,156 @@
+"""Minimal client for the game server: python -m server.client --games 100 --clients 10"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import Optional
+
+from elements.board import DEFAULT_BOARD
+from server.game_server import DEFAULT_HOST, DEFAULT_PORT
+from server.protocol import ERROR, FIRE, GAME, NEW, OVER, QUIT, WIN, format_line, is_final, parse_line
+
+ALL_BLOCKS = tuple(DEFAULT_BOARD.blocks(0))
+
+
+class GameClient:
+    """
+    Соединение с сервером игры
+    ----------
+    Атрибуты:
+        session_id (int): номер текущей партии на сервере
+    ----------
+    Методы:
+        connect(host, port): подключается и читает начало первой партии
+        request(*words): отправляет команду и возвращает ответ (список строк, разбитых на слова)
+        close(): отправляет QUIT и закрывает соединение
+    """
+
+    def __init__(self) -> None:
+        self.session_id = None
+        self.__reader = None
+        self.__writer = None
+
+    async def connect(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> list[list[str]]:
+        """
+        Подключается к серверу.
+        Возвращает:
+            list: ответ сервера на начало партии
+        """
+        self.__reader, self.__writer = await asyncio.open_connection(host, port)
+        return await self.__read_reply()
+
+    async def request(self, *words) -> list[list[str]]:
+        """
+        Отправляет команду и читает все строки ответа до завершающей (TURN, OVER, ERR или BYE).
+        """
+        self.__writer.write(format_line(*words))
+        await self.__writer.drain()
+        return await self.__read_reply()
+
+    async def close(self) -> None:
+        """
+        Завершает сессию и закрывает соединение.
+        """
+        if self.__writer is None:
+            return
+        try:
+            await self.request(QUIT)
+        except ConnectionError:
+            pass
+        self.__writer.close()
+        await self.__writer.wait_closed()
+        self.__writer = None
+
+    async def __read_reply(self) -> list[list[str]]:
+        """
+        Читает строки ответа до завершающей.
+        """
+        reply = []
+        while True:
+            line = await self.__reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            words = parse_line(line)
+            reply.append(words)
+            if words[0] == GAME:
+                self.session_id = int(words[1])
+            if is_final(words):
+                return reply
+
+
+async def play_random_game(client: GameClient, rng: random.Random) -> tuple:
+    """
+    Стреляет по случайным блокам, пока партия не закончится.
+    Возвращает:
+        tuple: (True, если игрок победил; число выстрелов игрока)
+    """
+    blocks = list(ALL_BLOCKS)
+    rng.shuffle(blocks)
+    shots = 0
+    for block in blocks:
+        reply = await client.request(FIRE, *block)
+        if reply[-1][0] == ERROR:
+            # Dotted block around a destroyed ship
+            continue
+        shots += 1
+        if reply[-1][0] == OVER:
+            return reply[-1][1] == WIN, shots
+    raise RuntimeError("the game did not end after every block was fired")
+
+
+async def run_client(host: str, port: int, games: int, seed: Optional[int]) -> list[tuple]:
+    """
+    Играет games партий подряд в одном соединении.
+    """
+    rng = random.Random(seed)
+    client = GameClient()
+    await client.connect(host, port)
+    results = []
+    try:
+        for game in range(games):
+            if game:
+                await client.request(NEW)
+            results.append(await play_random_game(client, rng))
+    finally:
+        await client.close()
+    return results
+
+
+async def run_clients(host: str, port: int, games: int, clients: int, seed: Optional[int]) -> list[tuple]:
+    """
+    Запускает clients соединений одновременно и делит между ними games партий.
+    """
+    tasks = [
+        run_client(host, port, games // clients + (number < games % clients), None if seed is None else seed + number)
+        for number in range(clients)
+    ]
+    return [result for results in await asyncio.gather(*tasks) for result in results]
+
+
+def main() -> None:
+    """
+    Играет случайными выстрелами против сервера из нескольких соединений и печатает итог и скорость.
+    """
+    parser = argparse.ArgumentParser(description="BattleShip server load client")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="server host")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="server port")
+    parser.add_argument("--games", type=int, default=10, help="total number of games")
+    parser.add_argument("--clients", type=int, default=1, help="number of simultaneous connections")
+    parser.add_argument("--seed", type=int, help="seed for the random shots")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(run_clients(args.host, args.port, args.games, args.clients, args.seed))
+    except ConnectionError as error:
+        sys.exit(f"connection failed: {error}")
+    elapsed = time.perf_counter() - start
+    wins = sum(won for won, _ in results)
+    print(f"games: {len(results)}, human wins: {wins}, computer wins: {len(results) - wins}")
+    print(f"{len(results) / elapsed:.1f} games/s")
+
+
+if __name__ == "__main__":
+    main()
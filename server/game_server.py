@@ -0,0 +1,224 @@
+"""Asyncio server hosting many independent games against the computer."""
+
+import asyncio
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import Callable, Optional
+
+from elements.rng import RngStream
+from server.protocol import (
+    BYE,
+    CPU,
+    ERROR,
+    FIRE,
+    GAME,
+    LOSE,
+    MAX_LINE_LENGTH,
+    NEW,
+    OVER,
+    QUIT,
+    SHIP,
+    SHIPS,
+    TURN,
+    WIN,
+    YOU,
+    format_line,
+    parse_block,
+    parse_line,
+)
+from server.session import GameSession
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class GameServer:
+    """
+    Сервер, на котором каждое TCP-соединение играет свою партию против компьютера (GameSession).
+    Все соединения обслуживаются одним циклом asyncio; выстрелы подключаемого стрелка компьютера,
+    которые могут долго считаться (например, ai.MonteCarloShooter), выполняются в executor,
+    поэтому одна сессия не задерживает остальные.
+    Executor может быть только пулом потоков: ход считается методом сессии, а сессия и стрелок
+    не передаются в другой процесс. Если стрелку нужны процессы, пул процессов передается ему самому
+    (как executor у MonteCarloShooter в server.__main__).
+    ----------
+    Атрибуты:
+        shooter_factory (callable): создает стрелка компьютера для новой сессии (None — стандартная логика)
+        executor (ThreadPoolExecutor или None): где считаются ходы стрелка; None — пул потоков цикла asyncio
+        max_sessions (int): сколько партий может идти одновременно
+        idle_timeout (float): через сколько секунд без команд соединение закрывается
+        sessions (словарь): номер сессии -> GameSession для всех идущих партий
+        rng (RngStream или None): корневой поток, из которого каждая новая сессия получает свой
+                (None — модуль random)
+    ----------
+    Методы:
+        start(host, port): начинает принимать соединения (port 0 — любой свободный порт)
+        serve_forever(): обслуживает соединения до отмены
+        close(): перестает принимать соединения
+        port: порт, на котором сервер слушает
+    """
+
+    def __init__(
+        self,
+        *,
+        shooter_factory: Callable = lambda: None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        rng: Optional[RngStream] = None,
+    ) -> None:
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise TypeError(f"executor must be a ThreadPoolExecutor, got {type(executor).__name__}")
+        self.shooter_factory = shooter_factory
+        self.executor = executor
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = {}
+        self.rng = rng
+        self.__session_ids = itertools.count(1)
+        self.__server = None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Начинает принимать соединения на host:port.
+        """
+        self.__server = await asyncio.start_server(self.__handle_connection, host, port, limit=MAX_LINE_LENGTH)
+
+    @property
+    def port(self) -> int:
+        """Порт, на котором сервер принимает соединения."""
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """
+        Обслуживает соединения, пока задачу не отменят.
+        """
+        await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Перестает принимать новые соединения и ждет закрытия сокета сервера.
+        """
+        self.__server.close()
+        await self.__server.wait_closed()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Играет партии одного соединения: новая партия начинается сразу после подключения
+        и по команде NEW, ответы на каждую команду заканчиваются одной из FINAL_REPLIES.
+        """
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(format_line(ERROR, "server is full"))
+            await self.__close_writer(writer)
+            return
+        session = self.__new_session()
+        try:
+            writer.write(self.__game_started(session))
+            await writer.drain()
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout)
+                except (asyncio.TimeoutError, ValueError):
+                    # ValueError: the line is longer than MAX_LINE_LENGTH
+                    break
+                if not line:
+                    break
+                words = parse_line(line)
+                if not words:
+                    continue
+                if words[0] == QUIT:
+                    writer.write(format_line(BYE))
+                    break
+                if words[0] == NEW:
+                    self.__end_session(session)
+                    session = self.__new_session()
+                    writer.write(self.__game_started(session))
+                elif words[0] == SHIPS:
+                    writer.write(self.__ships(session))
+                elif words[0] == FIRE:
+                    writer.write(await self.__fire(session, words[1:]))
+                else:
+                    writer.write(format_line(ERROR, "unknown command"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.__end_session(session)
+            await self.__close_writer(writer)
+
+    def __new_session(self) -> GameSession:
+        """
+        Создает новую партию и регистрирует её на сервере.
+        """
+        session_rng = self.rng.spawn(1)[0] if self.rng else None
+        session = GameSession(next(self.__session_ids), self.shooter_factory(), session_rng)
+        self.sessions[session.session_id] = session
+        return session
+
+    def __end_session(self, session: GameSession) -> None:
+        """
+        Убирает партию с сервера и закрывает её стрелка, если у него есть close().
+        """
+        self.sessions.pop(session.session_id, None)
+        close = getattr(session.state.computer_shooter, "close", None)
+        if close is not None:
+            close()
+
+    @staticmethod
+    async def __close_writer(writer: asyncio.StreamWriter) -> None:
+        """
+        Закрывает соединение, не обращая внимания на уже разорванные сокеты.
+        """
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+    def __game_started(self, session: GameSession) -> bytes:
+        """
+        Ответ на начало новой партии: номер сессии и ход игрока.
+        """
+        return format_line(GAME, session.session_id) + format_line(TURN)
+
+    def __ships(self, session: GameSession) -> bytes:
+        """
+        Ответ на SHIPS: корабли игрока, по одному в строке.
+        """
+        lines = [
+            format_line(SHIP, x, y, length, "H" if horizontal else "V")
+            for x, y, length, horizontal in session.human_ships()
+        ]
+        return b"".join(lines) + self.__final_reply(session)
+
+    async def __fire(self, session: GameSession, words: list[str]) -> bytes:
+        """
+        Ответ на FIRE x y: результат выстрела игрока, затем все выстрелы компьютера до его промаха
+        или конца партии.
+        """
+        if session.winner is not None:
+            return format_line(ERROR, "game is over")
+        block = parse_block(words)
+        if block is None:
+            return format_line(ERROR, "usage: FIRE x y")
+        if not session.is_available(block):
+            return format_line(ERROR, "block is already fired")
+        lines = [format_line(YOU, session.human_fires(block), *block)]
+        while session.computer_turn and session.winner is None:
+            if session.state.computer_shooter is None:
+                result, fired_block = session.computer_fires()
+            else:
+                loop = asyncio.get_running_loop()
+                result, fired_block = await loop.run_in_executor(self.executor, session.computer_fires)
+            lines.append(format_line(CPU, result, *fired_block))
+        return b"".join(lines) + self.__final_reply(session)
+
+    @staticmethod
+    def __final_reply(session: GameSession) -> bytes:
+        """
+        Последняя строка ответа: ход игрока или итог партии.
+        """
+        if session.winner is None:
+            return format_line(TURN)
+        return format_line(OVER, WIN if session.winner == "human" else LOSE)
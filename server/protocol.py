@@ -0,0 +1,70 @@
+"""Line protocol spoken between the game server and its clients."""
+
+from typing import Optional
+
+from elements.board import DEFAULT_BOARD
+
+ENCODING = "ascii"
+MAX_LINE_LENGTH = 64
+
+# Client commands
+NEW = "NEW"  # NEW - start a new game in this connection
+FIRE = "FIRE"  # FIRE x y - shoot at block (x, y) of the computer's grid, 1 <= x <= width, 1 <= y <= height
+SHIPS = "SHIPS"  # SHIPS - list the player's ships
+QUIT = "QUIT"  # QUIT - close the connection
+
+# Server replies
+GAME = "GAME"  # GAME session_id - a new game has started
+SHIP = "SHIP"  # SHIP x y length H|V - one of the player's ships
+YOU = "YOU"  # YOU MISS|HIT|SUNK x y - result of the player's shot
+CPU = "CPU"  # CPU MISS|HIT|SUNK x y - result of the computer's shot at the player's grid
+MISS = "MISS"
+HIT = "HIT"
+SUNK = "SUNK"
+
+# Replies ending the answer to a command
+TURN = "TURN"  # TURN - the player's move
+OVER = "OVER"  # OVER WIN|LOSE - the game is over
+ERROR = "ERR"  # ERR message - the command was rejected, the game is unchanged
+BYE = "BYE"  # BYE - the server closes the connection
+WIN = "WIN"
+LOSE = "LOSE"
+FINAL_REPLIES = (TURN, OVER, ERROR, BYE)
+
+
+def format_line(*words) -> bytes:
+    """
+    Собирает строку протокола из слов, разделенных пробелами.
+    """
+    return (" ".join(str(word) for word in words) + "\n").encode(ENCODING)
+
+
+def parse_line(line: bytes) -> list[str]:
+    """
+    Разбивает строку протокола на слова. Команды не зависят от регистра.
+    """
+    words = line.decode(ENCODING, errors="replace").split()
+    if words:
+        words[0] = words[0].upper()
+    return words
+
+
+def parse_block(words: list[str]) -> Optional[tuple]:
+    """
+    Читает координаты блока из слов "x y".
+    Возвращает:
+        tuple или None: блок (x, y) сетки DEFAULT_BOARD или None, если координаты неверны
+    """
+    if len(words) != 2 or not all(word.isdigit() for word in words):
+        return None
+    x, y = int(words[0]), int(words[1])
+    if not DEFAULT_BOARD.contains((x, y), 0):
+        return None
+    return x, y
+
+
+def is_final(words: list[str]) -> bool:
+    """
+    Возвращает True, если ответ сервера заканчивает ответ на команду.
+    """
+    return bool(words) and words[0] in FINAL_REPLIES
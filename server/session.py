@@ -0,0 +1,115 @@
+"""One game against the computer, driven by commands instead of pygame events."""
+
+from typing import Optional
+
+from elements.autoships import AutoShips
+from elements.board import DEFAULT_BOARD
+from elements.fleet import Fleet
+from elements.rng import RngStream
+from game_logic import GameState, check_hit_or_miss, computer_shoots
+from server.protocol import HIT, MISS, SUNK
+
+HUMAN_OFFSET = DEFAULT_BOARD.human_offset
+
+
+class GameSession:
+    """
+    Партия одного игрока против компьютера без графики. Корабли расставляет AutoShips,
+    выстрелы разбираются правилами game_logic; у каждой сессии свой GameState,
+    поэтому сессии не мешают друг другу. Поток rng (необязательный) делится на потоки для обоих флотов
+    и стрельбы компьютера, так что сессия с тем же потоком и теми же командами повторяется в точности.
+    ----------
+    Атрибуты:
+        session_id (int): номер сессии на сервере
+        state (GameState): состояние партии
+        computer, human (AutoShips): корабли компьютера и игрока
+        computer_turn (bool): True, если сейчас ход компьютера
+    ----------
+    Методы:
+        human_fires(block): выстрел игрока по сетке компьютера (координаты 1-10)
+        computer_fires(): один выстрел компьютера, может занимать время (запускается в executor)
+        winner: "human", "computer" или None, пока партия идет
+    """
+
+    def __init__(self, session_id: int, computer_shooter=None, rng: Optional[RngStream] = None) -> None:
+        computer_fleet_rng, human_fleet_rng, computer_rng = rng.spawn(3) if rng else (None,) * 3
+        self.session_id = session_id
+        self.state = GameState(computer_shooter, computer_rng)
+        self.computer = AutoShips(0, rng=computer_fleet_rng)
+        self.human = AutoShips(HUMAN_OFFSET, rng=human_fleet_rng)
+        self.computer_fleet = Fleet(self.computer.ships)
+        self.human_fleet = Fleet(self.human.ships)
+        self.computer_turn = False
+
+    @property
+    def winner(self) -> Optional[str]:
+        """Победитель партии или None, пока у обоих игроков остались корабли."""
+        if not self.computer.ships_set:
+            return "human"
+        if not self.human.ships_set:
+            return "computer"
+        return None
+
+    def human_ships(self) -> list[tuple]:
+        """
+        Возвращает корабли игрока в виде (x, y, длина, горизонтальный) в координатах 1-10.
+        """
+        ships = []
+        for ship in self.human.ships:
+            x, y = min(ship)
+            horizontal = len(ship) == 1 or ship[0][1] == ship[1][1]
+            ships.append((x - HUMAN_OFFSET, y, len(ship), horizontal))
+        return ships
+
+    def is_available(self, block: tuple) -> bool:
+        """
+        Проверяет, что игрок ещё не стрелял в блок и на нем нет точки.
+        """
+        return block not in self.state.hit_blocks and block not in self.state.dotted_set
+
+    def human_fires(self, block: tuple) -> str:
+        """
+        Выстрел игрока по блоку сетки компьютера.
+        Возвращает:
+            str: MISS, HIT или SUNK
+        """
+        destroyed_before = self.state.computer_destroyed_ships_count["#"]
+        hit = check_hit_or_miss(
+            state=self.state,
+            fired_block=block,
+            opponents_fleet=self.computer_fleet,
+            computer_turn=False,
+            opponents_ships_set=self.computer.ships_set,
+            computer=self.computer,
+        )
+        self.computer_turn = not hit
+        return self.__result(hit, destroyed_before, self.state.computer_destroyed_ships_count["#"])
+
+    def computer_fires(self) -> tuple:
+        """
+        Один выстрел компьютера по сетке игрока.
+        Возвращает:
+            tuple: (MISS, HIT или SUNK, блок в координатах 1-10)
+        """
+        destroyed_before = self.state.human_destroyed_ships_count["#"]
+        fired_block = computer_shoots(self.state)
+        hit = check_hit_or_miss(
+            state=self.state,
+            fired_block=fired_block,
+            opponents_fleet=self.human_fleet,
+            computer_turn=True,
+            opponents_ships_set=self.human.ships_set,
+            computer=self.computer,
+        )
+        self.computer_turn = hit
+        result = self.__result(hit, destroyed_before, self.state.human_destroyed_ships_count["#"])
+        return result, (fired_block[0] - HUMAN_OFFSET, fired_block[1])
+
+    @staticmethod
+    def __result(hit: bool, destroyed_before: int, destroyed_after: int) -> str:
+        """
+        Переводит результат check_hit_or_miss и счетчик уничтоженных кораблей в ответ протокола.
+        """
+        if not hit:
+            return MISS
+        return SUNK if destroyed_after > destroyed_before else HIT
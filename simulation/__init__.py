@@ -0,0 +1,3 @@
+# flake8: noqa
+from .engine import GameResult, play_game, random_human_shooter, scripted_human_shooter
+from .game_log import GameLogReader, GameLogWriter, RecordedGame, Replay
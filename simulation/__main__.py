@@ -0,0 +1,61 @@
+"""Runs headless computer-vs-computer games: python -m simulation --games 1000 [--log games.bslg]
+
+Other boards: python -m simulation --width 100 --height 100 --fleet "6*10,5*20,4*40,3*60,2*80,1*100"
+"""
+
+import argparse
+import time
+
+from ai.endgame import EndgameSolver
+from elements.board import DEFAULT_BOARD, BoardConfig, parse_fleet
+from elements.constants import BOARD_HEIGHT, BOARD_WIDTH, FLEET
+from simulation.engine import play_game
+from simulation.game_log import GameLogWriter
+
+
+def main() -> None:
+    """
+    Играет заданное количество партий и печатает число побед и скорость.
+    С --log партии дописываются в двоичный журнал (см. simulation.game_log).
+    --width, --height и --fleet задают размеры сеток и состав флотов, --endgame включает решатель конца партии.
+    """
+    parser = argparse.ArgumentParser(description="Headless BattleShip self-play")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--log", help="append the games to this binary game log")
+    parser.add_argument("--width", type=int, default=BOARD_WIDTH, help="grid width in blocks")
+    parser.add_argument("--height", type=int, default=BOARD_HEIGHT, help="grid height in blocks")
+    parser.add_argument(
+        "--fleet",
+        type=parse_fleet,
+        default=FLEET,
+        help='ship lengths, "length*count" for repeats (default "4,3*2,2*3,1*4")',
+    )
+    parser.add_argument(
+        "--endgame", action="store_true", help="let the exact endgame solver choose the computer's last shots"
+    )
+    args = parser.parse_args()
+    try:
+        board = BoardConfig(args.width, args.height, args.fleet)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.log and board != DEFAULT_BOARD:
+        parser.error("--log records games on the default board only")
+
+    endgame_solver = EndgameSolver(board=board) if args.endgame else None
+    wins = {"human": 0, "computer": 0, None: 0}
+    log_file = open(args.log, "ab") if args.log else None
+    log = GameLogWriter(log_file) if log_file else None
+    start = time.perf_counter()
+    try:
+        for _ in range(args.games):
+            wins[play_game(log=log, board=board, endgame_solver=endgame_solver).winner] += 1
+    finally:
+        if log_file:
+            log_file.close()
+    elapsed = time.perf_counter() - start
+    print(f"games: {args.games}, human wins: {wins['human']}, computer wins: {wins['computer']}")
+    print(f"{args.games / elapsed:.1f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Headless game engine: plays complete games by the game_logic rules without pygame."""
+
+import random
+from functools import partial
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from elements.autoships import AutoShips
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.fleet import Fleet
+from elements.rng import RngStream
+from game_logic import GameState, check_hit_or_miss, computer_shoots
+from simulation.game_log import GameLogWriter
+
+# How many random blocks random_human_shooter tries before listing all blocks still available
+QUICK_TRIES = 16
+
+
+class GameResult(NamedTuple):
+    """
+    Итог сыгранной партии
+    ----------
+    Атрибуты:
+        winner (str или None): "human", "computer" или None, если сценарий выстрелов закончился раньше
+        human_shots (int): количество выстрелов игрока по сетке компьютера
+        computer_shots (int): количество выстрелов компьютера по сетке игрока
+        shots (список кортежей): все выстрелы по порядку в виде (computer_turn, fired_block, hit)
+    """
+
+    winner: Optional[str]
+    human_shots: int
+    computer_shots: int
+    shots: list
+
+
+def random_human_shooter(state: GameState, rng: random.Random = random) -> tuple:
+    """
+    Выбирает случайный блок сетки компьютера, по которому ещё не стреляли и где нет точки.
+    Используется вместо человека в партиях компьютер против компьютера.
+    Сначала пробует QUICK_TRIES случайных блоков и только потом перебирает всю сетку,
+    так что на большой сетке выстрел почти всегда стоит несколько операций.
+    """
+    board = state.board
+    for _ in range(QUICK_TRIES):
+        block = board.index_to_block(rng.randrange(board.cells), 0)
+        if block not in state.dotted_set and block not in state.hit_blocks:
+            return block
+    return rng.choice(
+        [block for block in board.blocks(0) if block not in state.dotted_set and block not in state.hit_blocks]
+    )
+
+
+def scripted_human_shooter(shots: Iterable[tuple]) -> Callable[[GameState], Optional[tuple]]:
+    """
+    Превращает заранее заданную последовательность выстрелов в стрелка.
+    Когда выстрелы заканчиваются, стрелок возвращает None и партия останавливается.
+    """
+    shots_iterator = iter(shots)
+    return lambda state: next(shots_iterator, None)
+
+
+def play_game(
+    *,
+    human_shooter: Optional[Callable[[GameState], Optional[tuple]]] = None,
+    computer: Optional[AutoShips] = None,
+    human: Optional[AutoShips] = None,
+    computer_shooter=None,
+    log: Optional[GameLogWriter] = None,
+    rng: Optional[RngStream] = None,
+    board: BoardConfig = DEFAULT_BOARD,
+    endgame_solver=None,
+) -> GameResult:
+    """
+    Играет одну партию от первого выстрела до победы, чередуя ходы так же, как main.main():
+    игрок (human_shooter) стреляет по сетке компьютера, компьютер (computer_shoots) — по сетке игрока,
+    попадание дает право на следующий выстрел.
+    Каждая партия получает свое состояние GameState, поэтому партии можно играть параллельно в потоках.
+    Аргументы:
+        human_shooter (callable, необязательный): получает GameState и возвращает следующий блок для выстрела
+                по сетке компьютера или None. По умолчанию random_human_shooter.
+        computer (AutoShips, необязательный): корабли компьютера. По умолчанию AutoShips(0, board=board).
+        human (AutoShips, необязательный): корабли игрока. По умолчанию AutoShips(board.human_offset, board=board).
+        computer_shooter (необязательный): стрелок компьютера (см. game_logic.GameState).
+                По умолчанию стандартная логика computer_shoots.
+        log (GameLogWriter, необязательный): журнал, в который по ходу игры записываются флоты и выстрелы
+                (только для сетки по умолчанию)
+        rng (RngStream, необязательный): поток случайных чисел партии. Из него создаются отдельные потоки
+                для обоих флотов, стрельбы компьютера и случайного игрока, так что партия с тем же потоком
+                повторяется в точности. По умолчанию модуль random.
+        board (BoardConfig): размеры сеток и состав флотов. По умолчанию сетка 10x10 и флот FLEET.
+        endgame_solver (необязательный): решатель конца партии компьютера (см. game_logic.GameState)
+    Возвращает:
+        GameResult: итог партии
+    Исключения:
+        ValueError: журнал log передан для сетки не по умолчанию
+    """
+    if log is not None and board != DEFAULT_BOARD:
+        raise ValueError(f"The game log stores {DEFAULT_BOARD.width}x{DEFAULT_BOARD.height} games only")
+    computer_fleet_rng, human_fleet_rng, computer_rng, human_rng = rng.spawn(4) if rng else (random,) * 4
+    if human_shooter is None:
+        human_shooter = partial(random_human_shooter, rng=human_rng)
+    state = GameState(computer_shooter, computer_rng, board, endgame_solver)
+    if computer is None:
+        computer = AutoShips(0, rng=computer_fleet_rng, board=board)
+    if human is None:
+        human = AutoShips(board.human_offset, rng=human_fleet_rng, board=board)
+    computer_fleet = Fleet(computer.ships)
+    human_fleet = Fleet(human.ships)
+    shots = []
+    human_shots = computer_shots = 0
+    computer_turn = False
+    if log is not None:
+        log.start_game(computer.ships, human.ships)
+
+    while computer.ships_set and human.ships_set:
+        if computer_turn:
+            fired_block = computer_shoots(state)
+            computer_shots += 1
+            hit = check_hit_or_miss(
+                state=state,
+                fired_block=fired_block,
+                opponents_fleet=human_fleet,
+                computer_turn=True,
+                opponents_ships_set=human.ships_set,
+                computer=computer,
+            )
+        else:
+            fired_block = human_shooter(state)
+            if fired_block is None:
+                if log is not None:
+                    log.end_game(None)
+                return GameResult(None, human_shots, computer_shots, shots)
+            human_shots += 1
+            hit = check_hit_or_miss(
+                state=state,
+                fired_block=fired_block,
+                opponents_fleet=computer_fleet,
+                computer_turn=False,
+                opponents_ships_set=computer.ships_set,
+                computer=computer,
+            )
+        shots.append((computer_turn, fired_block, hit))
+        if log is not None:
+            log.record_shot(computer_turn, fired_block)
+        computer_turn = computer_turn == hit
+
+    winner = "human" if not computer.ships_set else "computer"
+    if log is not None:
+        log.end_game(winner)
+    return GameResult(winner, human_shots, computer_shots, shots)
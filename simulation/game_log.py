@@ -0,0 +1,270 @@
+"""Compact binary log of played games and a replayer that seeks through periodic checkpoints.
+
+Layout (all values are single bytes):
+    file:  MAGIC VERSION game*
+    game:  GAME_MARKER fleet(computer) fleet(human) shot* [END_MARKER winner]
+    fleet: ships_count (start length_and_direction)*
+    shot:  cell index 0-99 of the target grid, + COMPUTER_SHOT_FLAG for shots of the computer
+A ship is its top-left cell index and length * 2 + 1 for vertical ships. Shot results are not stored:
+the replayer recomputes them from the fleets. A game without END_MARKER was interrupted.
+"""
+
+import mmap
+from typing import BinaryIO, Iterator, NamedTuple, Optional
+
+from elements.bitboard import BitBoard
+from elements.board import DEFAULT_BOARD
+
+MAGIC = b"BSGL"
+VERSION = 1
+GAME_MARKER = 0xFF
+END_MARKER = 0xFE
+COMPUTER_SHOT_FLAG = 0x80
+WINNERS = ("human", "computer")
+UNFINISHED = 2
+
+COMPUTER_OFFSET = 0
+HUMAN_OFFSET = DEFAULT_BOARD.human_offset
+# A replay keeps the boards of every CHECKPOINT_INTERVAL-th move
+CHECKPOINT_INTERVAL = 16
+
+
+def encode_fleet(ships: list[list], offset: int) -> bytes:
+    """
+    Кодирует корабли одной сетки: по два байта на корабль.
+    """
+    encoded = bytearray([len(ships)])
+    for ship in ships:
+        vertical = len(ship) > 1 and ship[0][0] == ship[1][0]
+        encoded += bytes((DEFAULT_BOARD.block_to_index(min(ship), offset), len(ship) * 2 + vertical))
+    return bytes(encoded)
+
+
+def decode_ship(start: int, length_and_direction: int, offset: int) -> list:
+    """
+    Восстанавливает список координат корабля из двух байтов encode_fleet.
+    """
+    step = DEFAULT_BOARD.width if length_and_direction & 1 else 1
+    return [DEFAULT_BOARD.index_to_block(start + number * step, offset) for number in range(length_and_direction >> 1)]
+
+
+class RecordedGame(NamedTuple):
+    """
+    Партия, прочитанная из журнала
+    ----------
+    Атрибуты:
+        computer_ships, human_ships (списки списков): корабли в формате AutoShips.ships
+        shots (bytes): выстрелы по порядку в закодированном виде (см. decode_shot)
+        winner (str или None): "human", "computer" или None, если партия не закончена
+    """
+
+    computer_ships: list
+    human_ships: list
+    shots: bytes
+    winner: Optional[str]
+
+
+def encode_shot(computer_turn: bool, fired_block: tuple) -> int:
+    """
+    Кодирует выстрел одним байтом: номер блока на сетке противника и флаг стрелявшего.
+    """
+    if computer_turn:
+        return COMPUTER_SHOT_FLAG | DEFAULT_BOARD.block_to_index(fired_block, HUMAN_OFFSET)
+    return DEFAULT_BOARD.block_to_index(fired_block, COMPUTER_OFFSET)
+
+
+def decode_shot(shot: int) -> tuple:
+    """
+    Возвращает:
+        tuple: (computer_turn, fired_block) — как в GameResult.shots, без результата выстрела
+    """
+    if shot & COMPUTER_SHOT_FLAG:
+        return True, DEFAULT_BOARD.index_to_block(shot & ~COMPUTER_SHOT_FLAG, HUMAN_OFFSET)
+    return False, DEFAULT_BOARD.index_to_block(shot, COMPUTER_OFFSET)
+
+
+class GameLogWriter:
+    """
+    Дописывает партии в двоичный журнал по мере игры (выстрел — один байт)
+    ----------
+    Атрибуты:
+        file (двоичный файл): куда пишется журнал; заголовок пишется, если файл пуст
+    ----------
+    Методы:
+        start_game(computer_ships, human_ships): начинает новую партию
+        record_shot(computer_turn, fired_block): записывает выстрел (как он передан в check_hit_or_miss)
+        end_game(winner): записывает победителя и сбрасывает буфер файла
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        if file.tell() == 0:
+            file.write(MAGIC + bytes((VERSION,)))
+
+    def start_game(self, computer_ships: list[list], human_ships: list[list]) -> None:
+        """
+        Записывает начало партии и оба флота.
+        """
+        self.file.write(bytes((GAME_MARKER,)))
+        self.file.write(encode_fleet(computer_ships, COMPUTER_OFFSET))
+        self.file.write(encode_fleet(human_ships, HUMAN_OFFSET))
+
+    def record_shot(self, computer_turn: bool, fired_block: tuple) -> None:
+        """
+        Записывает один выстрел.
+        """
+        self.file.write(bytes((encode_shot(computer_turn, fired_block),)))
+
+    def end_game(self, winner: Optional[str]) -> None:
+        """
+        Записывает конец партии и победителя ("human", "computer" или None).
+        """
+        self.file.write(bytes((END_MARKER, UNFINISHED if winner is None else WINNERS.index(winner))))
+        self.file.flush()
+
+
+class GameLogReader:
+    """
+    Чтение журнала партий без загрузки всего файла в память (через mmap).
+    Партии находятся по маркеру GAME_MARKER, который не встречается внутри партий.
+    ----------
+    Атрибуты:
+        offsets (список целых): где в файле начинается каждая партия
+    ----------
+    Методы:
+        len(reader), reader[number]: число партий и партия с номером number (RecordedGame)
+        iter(reader): все партии по порядку
+        close(): закрывает файл
+    """
+
+    def __init__(self, path: str) -> None:
+        self.__file = open(path, "rb")
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.__data[: len(MAGIC)] != MAGIC or self.__data[len(MAGIC)] != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a game log of version {VERSION}")
+        self.offsets = []
+        offset = self.__data.find(bytes((GAME_MARKER,)), len(MAGIC) + 1)
+        while offset != -1:
+            self.offsets.append(offset)
+            offset = self.__data.find(bytes((GAME_MARKER,)), offset + 1)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, number: int) -> RecordedGame:
+        start = self.offsets[number]
+        end = self.offsets[number + 1] if number + 1 < len(self.offsets) else len(self.__data)
+        return self.__parse(self.__data[start + 1 : end])
+
+    def __iter__(self) -> Iterator[RecordedGame]:
+        for number in range(len(self)):
+            yield self[number]
+
+    def close(self) -> None:
+        """
+        Закрывает отображение файла в память и сам файл.
+        """
+        self.__data.close()
+        self.__file.close()
+
+    def __enter__(self) -> "GameLogReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def __parse(data: bytes) -> RecordedGame:
+        """
+        Разбирает одну партию (без маркера начала).
+        """
+        fleets = []
+        position = 0
+        for offset in (COMPUTER_OFFSET, HUMAN_OFFSET):
+            ships_count = data[position]
+            fleet_bytes = data[position + 1 : position + 1 + 2 * ships_count]
+            fleets.append([decode_ship(*fleet_bytes[i : i + 2], offset) for i in range(0, len(fleet_bytes), 2)])
+            position += 1 + 2 * ships_count
+        shots_end = data.find(bytes((END_MARKER,)), position)
+        if shots_end == -1:
+            return RecordedGame(fleets[0], fleets[1], data[position:], None)
+        winner = data[shots_end + 1] if shots_end + 1 < len(data) else UNFINISHED
+        return RecordedGame(
+            fleets[0], fleets[1], data[position:shots_end], WINNERS[winner] if winner < len(WINNERS) else None
+        )
+
+
+class Replay:
+    """
+    Воспроизведение записанной партии с переходом к любому ходу. При создании партия один раз
+    проигрывается на BitBoard, и каждые checkpoint_interval ходов сохраняется состояние обеих сеток;
+    переход к ходу восстанавливает ближайшее предыдущее состояние и доигрывает меньше checkpoint_interval ходов.
+    ----------
+    Атрибуты:
+        game (RecordedGame): воспроизводимая партия
+        computer_board, human_board (BitBoard): сетки компьютера и игрока после move ходов
+        move (int): сколько выстрелов сделано
+        results (список целых): результат каждого выстрела (MISS, HIT или SUNK)
+    ----------
+    Методы:
+        seek(move): переходит к состоянию после move выстрелов
+        step(): делает следующий выстрел, возвращает (computer_turn, fired_block, результат)
+        shot(number): выстрел номер number в виде (computer_turn, fired_block, результат)
+    """
+
+    def __init__(self, game: RecordedGame, checkpoint_interval: int = CHECKPOINT_INTERVAL) -> None:
+        self.game = game
+        self.checkpoint_interval = checkpoint_interval
+        self.computer_board = BitBoard(game.computer_ships, COMPUTER_OFFSET)
+        self.human_board = BitBoard(game.human_ships, HUMAN_OFFSET)
+        self.results = []
+        self.__checkpoints = []
+        for move, shot in enumerate(game.shots):
+            if move % checkpoint_interval == 0:
+                self.__checkpoints.append((self.computer_board.snapshot(), self.human_board.snapshot()))
+            self.results.append(self.__fire(shot))
+        self.move = len(game.shots)
+
+    def __len__(self) -> int:
+        return len(self.game.shots)
+
+    def shot(self, number: int) -> tuple:
+        """
+        Возвращает выстрел номер number: (computer_turn, fired_block, MISS/HIT/SUNK).
+        """
+        return (*decode_shot(self.game.shots[number]), self.results[number])
+
+    def seek(self, move: int) -> None:
+        """
+        Переходит к состоянию после move выстрелов (0 — начало партии).
+        """
+        if not 0 <= move <= len(self):
+            raise IndexError(f"move {move} is outside of 0..{len(self)}")
+        if move < self.move or move - self.move >= self.checkpoint_interval:
+            checkpoint = min(move // self.checkpoint_interval, len(self.__checkpoints) - 1)
+            if checkpoint >= 0:
+                computer_snapshot, human_snapshot = self.__checkpoints[checkpoint]
+                self.computer_board.restore(computer_snapshot)
+                self.human_board.restore(human_snapshot)
+                self.move = checkpoint * self.checkpoint_interval
+        while self.move < move:
+            self.step()
+
+    def step(self) -> tuple:
+        """
+        Делает следующий записанный выстрел.
+        """
+        shot = self.game.shots[self.move]
+        self.__fire(shot)
+        self.move += 1
+        return self.shot(self.move - 1)
+
+    def __fire(self, shot: int) -> int:
+        """
+        Стреляет по нужной сетке, возвращает MISS, HIT или SUNK.
+        """
+        if shot & COMPUTER_SHOT_FLAG:
+            return self.human_board.fire_index(shot & ~COMPUTER_SHOT_FLAG)
+        return self.computer_board.fire_index(shot)
+
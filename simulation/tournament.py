@@ -0,0 +1,376 @@
+"""Tournament of the computer's shooting strategies against fleet placement strategies on a process pool.
+
+python -m simulation.tournament --games 1000000 --workers 8 --output tournament.json
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
+from multiprocessing.sharedctypes import RawArray
+from typing import Callable, Optional
+
+from ai import DensityShooter, EndgameSolver
+from elements.autoships import AutoShips
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.fleet import Fleet
+from elements.rng import RngStream
+from game_logic import GameState, check_hit_or_miss, computer_shoots
+
+# Games played by one task of the pool (the results of a task are written to the shared array at once)
+BATCH_GAMES = 500
+PERCENTILES = (50, 90, 99)
+# Ratings are Elo-like: a difference of ELO_SCALE points means 10:1 odds, the average rating is INITIAL_RATING
+INITIAL_RATING = 1500
+ELO_SCALE = 400
+# Every pair of strategies is credited with this many drawn games, so that a strategy that never loses
+# still gets a finite rating
+PRIOR_DRAWS = 1
+RATING_ITERATIONS = 1000
+RATING_TOLERANCE = 1e-12
+# Search nodes of the endgame solver per move: a node limit instead of a time limit keeps games reproducible
+ENDGAME_NODES = 2_000
+
+# Strategy name -> factory(rng, board); see register_shooting_strategy and register_placement_strategy
+SHOOTING_STRATEGIES = {}
+PLACEMENT_STRATEGIES = {}
+
+# Shots of every game, set in each worker process by _attach_results
+_results = None
+
+
+def register_shooting_strategy(name: str, factory: Callable[[RngStream, BoardConfig], GameState]) -> None:
+    """
+    Добавляет стратегию стрельбы компьютера. factory(rng, board) создает GameState новой партии со своим
+    стрелком (computer_shooter, endgame_solver), которая берет случайные числа только из rng.
+    Стратегии нужно регистрировать при импорте модуля: рабочие процессы находят их по имени.
+    """
+    SHOOTING_STRATEGIES[name] = factory
+
+
+def register_placement_strategy(name: str, factory: Callable[[RngStream, BoardConfig], AutoShips]) -> None:
+    """
+    Добавляет стратегию расстановки флота. factory(rng, board) возвращает корабли на сетке игрока
+    (с началом board.human_offset), по которой стреляет компьютер; случайные числа берутся только из rng.
+    """
+    PLACEMENT_STRATEGIES[name] = factory
+
+
+@lru_cache(maxsize=None)
+def _endgame_solver(board: BoardConfig) -> EndgameSolver:
+    """
+    Возвращает решатель конца партии процесса для сетки board (таблица позиций очищается перед каждой партией).
+    """
+    return EndgameSolver(time_budget=None, max_nodes=ENDGAME_NODES, board=board)
+
+
+def _hunt_target(rng: RngStream, board: BoardConfig) -> GameState:
+    return GameState(None, rng, board)
+
+
+def _density(rng: RngStream, board: BoardConfig) -> GameState:
+    return GameState(DensityShooter(rng=rng, board=board), rng, board)
+
+
+def _hunt_target_endgame(rng: RngStream, board: BoardConfig) -> GameState:
+    solver = _endgame_solver(board)
+    # Positions solved in earlier games would make a game depend on which games its worker played before
+    solver.table.clear()
+    return GameState(None, rng, board, solver)
+
+
+def _autoships(rng: RngStream, board: BoardConfig) -> AutoShips:
+    return AutoShips(board.human_offset, rng=rng, board=board)
+
+
+def _uniform_autoships(rng: RngStream, board: BoardConfig) -> AutoShips:
+    return AutoShips(board.human_offset, uniform=True, rng=rng, board=board)
+
+
+register_shooting_strategy("hunt_target", _hunt_target)
+register_shooting_strategy("density", _density)
+register_shooting_strategy("hunt_target_endgame", _hunt_target_endgame)
+register_placement_strategy("autoships", _autoships)
+register_placement_strategy("uniform", _uniform_autoships)
+
+
+def shots_to_clear(state: GameState, human: AutoShips) -> int:
+    """
+    Компьютер по правилам game_logic стреляет по кораблям human, пока не уничтожит весь флот.
+    Возвращает:
+        int: число выстрелов
+    """
+    human_fleet = Fleet(human.ships)
+    shots = 0
+    while human.ships_set:
+        check_hit_or_miss(
+            state=state,
+            fired_block=computer_shoots(state),
+            opponents_fleet=human_fleet,
+            computer_turn=True,
+            opponents_ships_set=human.ships_set,
+            computer=human,
+        )
+        shots += 1
+    return shots
+
+
+def _attach_results(results) -> None:
+    """
+    Запоминает общий массив результатов в рабочем процессе (инициализатор пула).
+    """
+    global _results
+    _results = results
+
+
+def _play_batch(
+    seed: int,
+    shooter: str,
+    placement: str,
+    first_game: int,
+    games: int,
+    offset: int,
+    board: BoardConfig,
+) -> int:
+    """
+    Играет партии first_game ... first_game + games - 1 стрелка shooter против расстановки placement
+    и записывает числа выстрелов в общий массив, начиная с offset + first_game.
+    Флот партии n зависит только от (seed, placement, n), а случайные числа стрелка — от (seed, shooter,
+    placement, n), поэтому все стрелки стреляют по одним и тем же флотам, а итог не зависит от разбиения на задачи.
+    Возвращает:
+        int: число сыгранных партий
+    """
+    shooter_factory = SHOOTING_STRATEGIES[shooter]
+    placement_factory = PLACEMENT_STRATEGIES[placement]
+    for game in range(first_game, first_game + games):
+        human = placement_factory(RngStream(seed, ("fleet", placement, game)), board)
+        state = shooter_factory(RngStream(seed, ("shots", shooter, placement, game)), board)
+        _results[offset + game] = shots_to_clear(state, human)
+    return games
+
+
+def _shots_summary(shots) -> dict:
+    """
+    Возвращает среднее, выборочную дисперсию, перцентили PERCENTILES, минимум и максимум чисел выстрелов.
+    """
+    histogram = Counter(shots)
+    games = len(shots)
+    mean = sum(value * count for value, count in histogram.items()) / games
+    squares = sum((value - mean) ** 2 * count for value, count in histogram.items())
+    summary = {
+        "games": games,
+        "mean": round(mean, 4),
+        "variance": round(squares / (games - 1), 4) if games > 1 else 0.0,
+    }
+    ordered = sorted(histogram.items())
+    for p in PERCENTILES:
+        rank = min(games - 1, games * p // 100)
+        for value, count in ordered:
+            rank -= count
+            if rank < 0:
+                summary[f"p{p}"] = value
+                break
+    summary["min"] = ordered[0][0]
+    summary["max"] = ordered[-1][0]
+    return summary
+
+
+def _head_to_head(first, second, fewer_wins: bool) -> tuple:
+    """
+    Сравнивает партии с одинаковыми номерами. Побеждает партия с меньшим числом выстрелов,
+    если fewer_wins (стрелки), иначе с большим (расстановки, которые дольше живут).
+    Возвращает:
+        tuple: (победы первого, победы второго, ничьи)
+    """
+    first_wins = second_wins = 0
+    for first_shots, second_shots in zip(first, second):
+        if first_shots != second_shots:
+            if (first_shots < second_shots) == fewer_wins:
+                first_wins += 1
+            else:
+                second_wins += 1
+    return first_wins, second_wins, len(first) - first_wins - second_wins
+
+
+def elo_ratings(names: list, results: dict) -> dict:
+    """
+    Считает рейтинги по модели Брэдли — Терри (вероятность победы i над j равна s_i / (s_i + s_j)),
+    которая не зависит от порядка партий, и переводит силы в шкалу Эло: ELO_SCALE * log10(s) вокруг INITIAL_RATING.
+    Ничья считается половиной победы каждого; каждой паре добавляется PRIOR_DRAWS ничьих.
+    Аргументы:
+        names (список): имена участников
+        results (словарь): (имя, имя) -> (победы первого, победы второго, ничьи) для пар, которые играли
+    Возвращает:
+        dict: имя -> рейтинг
+    """
+    if len(names) < 2:
+        return dict.fromkeys(names, float(INITIAL_RATING))
+    scores = dict.fromkeys(names, 0.0)
+    games = {}
+    for (first, second), (first_wins, second_wins, draws) in results.items():
+        draws += PRIOR_DRAWS
+        scores[first] += first_wins + draws / 2
+        scores[second] += second_wins + draws / 2
+        games[first, second] = games[second, first] = first_wins + second_wins + draws
+    strengths = dict.fromkeys(names, 1.0)
+    # Minorization-maximization: s_i = score_i / sum_j(n_ij / (s_i + s_j)), then the geometric mean is set to 1
+    for _ in range(RATING_ITERATIONS):
+        updated = {}
+        for name in names:
+            denominator = sum(
+                games[name, other] / (strengths[name] + strengths[other])
+                for other in names
+                if (name, other) in games
+            )
+            updated[name] = scores[name] / denominator if denominator else strengths[name]
+        scale = math.exp(sum(math.log(strength) for strength in updated.values()) / len(names))
+        updated = {name: strength / scale for name, strength in updated.items()}
+        change = max(abs(math.log(updated[name] / strengths[name])) for name in names)
+        strengths = updated
+        if change < RATING_TOLERANCE:
+            break
+    return {name: round(INITIAL_RATING + ELO_SCALE * math.log10(strengths[name]), 1) for name in names}
+
+
+def _pool_report(names: list, shots_by_name: dict, fewer_wins: bool) -> dict:
+    """
+    Сравнивает всех участников одного вида попарно на одних и тех же партиях и возвращает
+    долю побед (ничья — половина победы) каждой пары и рейтинги.
+    """
+    results = {}
+    for first, second in combinations(names, 2):
+        wins = [0, 0, 0]
+        for first_shots, second_shots in zip(shots_by_name[first], shots_by_name[second]):
+            for i, part in enumerate(_head_to_head(first_shots, second_shots, fewer_wins)):
+                wins[i] += part
+        results[first, second] = tuple(wins)
+    win_rates = {}
+    for (first, second), (first_wins, second_wins, draws) in results.items():
+        games = first_wins + second_wins + draws
+        win_rates[f"{first} vs {second}"] = {
+            "wins": first_wins,
+            "losses": second_wins,
+            "draws": draws,
+            "win_rate": round((first_wins + draws / 2) / games, 4) if games else None,
+        }
+    return {"head_to_head": win_rates, "ratings": elo_ratings(names, results)}
+
+
+def run_tournament(
+    games: int,
+    *,
+    shooters: Optional[list] = None,
+    placements: Optional[list] = None,
+    seed: int = 0,
+    workers: int = 0,
+    batch_games: int = BATCH_GAMES,
+    board: BoardConfig = DEFAULT_BOARD,
+) -> dict:
+    """
+    Играет games партий каждой стратегии стрельбы против каждой стратегии расстановки и возвращает отчет.
+    Партии делятся на задачи по batch_games и раздаются пулу из workers процессов (0 — без пула);
+    процессы пишут числа выстрелов прямо в общий массив (multiprocessing.sharedctypes.RawArray), так что
+    обратно возвращается только число сыгранных партий, а отчет строится по массиву в главном процессе.
+    Стрелки сравниваются между собой на одних и тех же флотах (побеждает меньшее число выстрелов),
+    расстановки — на партиях одного стрелка с одним номером (побеждает большее число выстрелов).
+    Аргументы:
+        games (int): число партий на пару (стрелок, расстановка)
+        shooters, placements (списки, необязательные): имена стратегий. По умолчанию все зарегистрированные.
+        seed (int): корневое зерно; при том же зерне результаты совпадают при любых workers и batch_games
+        workers (int): число процессов
+        batch_games (int): партий в одной задаче
+        board (BoardConfig): размеры сетки и состав флота
+    Возвращает:
+        dict: "matchups" (стрелок -> расстановка -> среднее, дисперсия, перцентили), "shooters" и "placements"
+                (попарные доли побед и рейтинги), "games_per_second"
+    Исключения:
+        ValueError: неизвестная стратегия или games < 1
+    """
+    shooters = list(SHOOTING_STRATEGIES) if shooters is None else list(shooters)
+    placements = list(PLACEMENT_STRATEGIES) if placements is None else list(placements)
+    unknown = [name for name in shooters if name not in SHOOTING_STRATEGIES]
+    unknown += [name for name in placements if name not in PLACEMENT_STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+    if games < 1:
+        raise ValueError(f"games must be positive, got {games}")
+
+    # Games of (shooter s, placement p) take the slots from (s * len(placements) + p) * games on
+    results = RawArray("I", len(shooters) * len(placements) * games)
+    offsets = {
+        (shooter, placement): (s * len(placements) + p) * games
+        for s, shooter in enumerate(shooters)
+        for p, placement in enumerate(placements)
+    }
+    tasks = [
+        (seed, shooter, placement, first_game, min(batch_games, games - first_game), offset, board)
+        for (shooter, placement), offset in offsets.items()
+        for first_game in range(0, games, batch_games)
+    ]
+    start = time.perf_counter()
+    if workers:
+        with ProcessPoolExecutor(workers, initializer=_attach_results, initargs=(results,)) as pool:
+            played = sum(pool.map(_play_batch, *zip(*tasks)))
+    else:
+        _attach_results(results)
+        played = sum(_play_batch(*task) for task in tasks)
+    elapsed = time.perf_counter() - start
+
+    shots = {key: results[offset : offset + games] for key, offset in offsets.items()}
+    return {
+        "parameters": {"games": games, "seed": seed, "workers": workers, "board": repr(board)},
+        "games_per_second": round(played / elapsed, 3),
+        "matchups": {
+            shooter: {placement: _shots_summary(shots[shooter, placement]) for placement in placements}
+            for shooter in shooters
+        },
+        "shooters": _pool_report(
+            shooters, {shooter: [shots[shooter, placement] for placement in placements] for shooter in shooters}, True
+        ),
+        "placements": _pool_report(
+            placements,
+            {placement: [shots[shooter, placement] for shooter in shooters] for placement in placements},
+            False,
+        ),
+    }
+
+
+def main() -> None:
+    """
+    Запускает турнир с параметрами командной строки и печатает отчет в JSON.
+    """
+    parser = argparse.ArgumentParser(description="BattleShip strategy tournament")
+    parser.add_argument("--games", type=int, default=1000, help="games per (shooter, placement) pair")
+    parser.add_argument("--shooters", nargs="+", choices=sorted(SHOOTING_STRATEGIES), help="shooting strategies")
+    parser.add_argument("--placements", nargs="+", choices=sorted(PLACEMENT_STRATEGIES), help="placement strategies")
+    parser.add_argument("--seed", type=int, default=0, help="root seed of all random streams")
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 - play in this process)")
+    parser.add_argument("--batch", type=int, default=BATCH_GAMES, help="games per task of the pool")
+    parser.add_argument("--output", help="write JSON to this file instead of stdout")
+    args = parser.parse_args()
+    if args.games < 1 or args.batch < 1:
+        parser.error("--games and --batch must be positive")
+
+    report = run_tournament(
+        args.games,
+        shooters=args.shooters,
+        placements=args.placements,
+        seed=args.seed,
+        workers=args.workers,
+        batch_games=args.batch,
+    )
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        sys.stdout.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
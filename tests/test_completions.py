@@ -0,0 +1,132 @@
+"""count_completions against brute-force enumeration of every fleet on small boards."""
+
+import random
+
+import pytest
+
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.completions import STANDARD_OPENING, Completions, count_completions, opening_completions
+from elements.fleet_generator import sample_fleet
+
+SMALL_BOARDS = (
+    BoardConfig(4, 4, (3, 2, 1)),
+    BoardConfig(5, 5, (3, 2, 2, 1)),
+    BoardConfig(6, 4, (3, 2, 1, 1)),
+)
+# Random partly revealed grids checked on every board
+POSITIONS = 40
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(tmp_path, monkeypatch):
+    """
+    Сохраняет начала партий во временный каталог и забывает запомненные результаты между тестами.
+    """
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    count_completions.cache_clear()
+    yield
+    count_completions.cache_clear()
+
+
+def brute_force(remaining: tuple, empty: int, hits: int, board: BoardConfig) -> Completions:
+    """
+    Перебирает все расстановки remaining (от большего к меньшему) по правилам count_completions.
+    """
+    placements = {}
+    for length in set(remaining):
+        ships = set()
+        for y in range(board.height):
+            for x in range(board.width):
+                for dx, dy in ((1, 0), (0, 1)):
+                    cells = [(x + step * dx, y + step * dy) for step in range(length)]
+                    if all(cx < board.width and cy < board.height for cx, cy in cells):
+                        ships.add(sum(1 << (cy * board.width + cx) for cx, cy in cells))
+        placements[length] = sorted(ships)
+    total = 0
+    occupancy = [0] * board.cells
+
+    def place(position: int, first: int, occupied: int, blocked: int) -> None:
+        nonlocal total
+        if position == len(remaining):
+            if occupied & hits == hits:
+                total += 1
+                for bit in range(board.cells):
+                    occupancy[bit] += occupied >> bit & 1
+            return
+        length = remaining[position]
+        # Ships of the same length are placed in increasing order, so every fleet is counted once
+        start = first if position and remaining[position - 1] == length else 0
+        for number in range(start, len(placements[length])):
+            ship = placements[length][number]
+            if not ship & (empty | blocked) and ship & hits != ship:
+                place(position + 1, number + 1, occupied | ship, blocked | board.halo(ship))
+
+    place(0, 0, 0, 0)
+    return Completions(total, tuple(occupancy))
+
+
+def revealed_position(rng: random.Random, board: BoardConfig) -> tuple:
+    """
+    Расставляет флот и открывает случайную часть сетки: уничтоженные корабли вместе с соседними блоками
+    становятся пустыми, а открытые блоки остальных кораблей — попаданиями.
+    Возвращает:
+        tuple: (оставшиеся корабли, маска пустых блоков, маска попаданий)
+    """
+    ships = sample_fleet(rng, board=board)
+    revealed = sum(1 << bit for bit in rng.sample(range(board.cells), rng.randrange(board.cells)))
+    fleet_mask = 0
+    for ship in ships:
+        fleet_mask |= ship
+    empty, hits, remaining = revealed & ~fleet_mask, 0, []
+    for ship, length in zip(ships, board.fleet):
+        if ship & revealed == ship:
+            empty |= board.halo(ship)
+        else:
+            hits |= ship & revealed
+            remaining.append(length)
+    return tuple(remaining), empty & ~hits, hits
+
+
+@pytest.mark.parametrize("board", SMALL_BOARDS, ids=repr)
+def test_blank_board(board):
+    assert count_completions(board.fleet, 0, 0, board) == brute_force(board.fleet, 0, 0, board)
+
+
+@pytest.mark.parametrize("board", SMALL_BOARDS, ids=repr)
+def test_revealed_positions(board):
+    rng = random.Random(f"completions {board}")
+    for _ in range(POSITIONS):
+        remaining, empty, hits = revealed_position(rng, board)
+        assert count_completions(remaining, empty, hits, board) == brute_force(remaining, empty, hits, board)
+
+
+def test_separate_regions():
+    # A column of misses splits the 6x4 grid in two; ships on either side must still not touch each other
+    board = SMALL_BOARDS[2]
+    wall = sum(1 << (y * board.width + 2) for y in range(board.height))
+    hit = 1 << (board.width + 4)
+    assert count_completions(board.fleet, wall, hit, board) == brute_force(board.fleet, wall, hit, board)
+
+
+def test_openings_are_stored(tmp_path):
+    board = SMALL_BOARDS[1]
+    expected = brute_force(board.fleet, 0, 0, board)
+    assert opening_completions(board.fleet, board) == expected
+    assert (tmp_path / "openings.json").exists()
+    count_completions.cache_clear()
+    assert opening_completions(board.fleet, board, max_states=0) == expected
+
+
+def test_standard_opening():
+    key, total, _ = STANDARD_OPENING
+    assert key == (DEFAULT_BOARD.width, DEFAULT_BOARD.height, DEFAULT_BOARD.fleet)
+    completions = count_completions(DEFAULT_BOARD.fleet, 0, 0, DEFAULT_BOARD)
+    assert completions.total == total
+    # Every fleet covers sum(fleet) blocks
+    assert sum(completions.occupancy) == total * sum(DEFAULT_BOARD.fleet)
+
+
+def test_state_budget():
+    board = SMALL_BOARDS[1]
+    assert count_completions(board.fleet, 1, 0, board, max_states=10) is None
+    assert count_completions(board.fleet, 1, 0, board) == brute_force(board.fleet, 1, 0, board)
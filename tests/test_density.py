@@ -0,0 +1,67 @@
+"""Incremental placement counts of DensityShooter against a fresh recount after every shot."""
+
+import random
+
+import pytest
+
+from ai.density import DensityShooter
+from elements.board import DEFAULT_BOARD, BoardConfig
+from elements.fleet_generator import sample_fleet
+from elements.placements import placement_index
+
+BOARDS = (DEFAULT_BOARD, BoardConfig(6, 5, (3, 2, 2, 1)))
+GAMES = 20
+
+
+def recount(shooter: DensityShooter, misses: int, hits: int, sunk: int) -> tuple:
+    """
+    Заново считает по маскам промахов, попаданий и уничтоженных кораблей, какие положения кораблей возможны.
+    Положение возможно, если оно не задевает промахи и уничтоженные корабли с соседними блоками,
+    а каждое подбитое, но не уничтоженное соседнее с ним или его собственное попадание лежит на нем.
+    Возвращает:
+        tuple: (длина -> маска номеров возможных положений, длина -> счетчики по блокам, плотность)
+    """
+    board = shooter.board
+    index = placement_index(board)
+    unsunk_hits = hits & ~sunk
+    alive, counts = {}, {}
+    density = [0] * board.cells
+    for length in shooter.alive:
+        alive[length] = 0
+        counts[length] = [0] * board.cells
+        for number in index.numbers(length):
+            ship = index.mask(length, number)
+            if ship & (misses | board.halo(sunk)) or board.halo(ship) & unsunk_hits & ~ship:
+                continue
+            alive[length] |= 1 << number
+            for cell in range(board.cells):
+                if ship >> cell & 1:
+                    counts[length][cell] += 1
+                    density[cell] += shooter.remaining[length]
+    return alive, counts, density
+
+
+@pytest.mark.parametrize("board", BOARDS, ids=repr)
+def test_counts_match_a_recount(board):
+    rng = random.Random(f"density {board}")
+    shooter = DensityShooter(0, rng=rng, board=board)
+    for _ in range(GAMES):
+        ships = sample_fleet(rng, board=board)
+        shooter.reset()
+        misses = hits = sunk = 0
+        while sunk != sum(ships):
+            block = shooter.next_shot()
+            bit = 1 << board.block_to_index(block, 0)
+            assert not bit & (misses | hits)
+            ship = next((ship for ship in ships if ship & bit), None)
+            if ship is None:
+                misses |= bit
+                shooter.register_shot(block, False)
+            else:
+                hits |= bit
+                destroyed = None
+                if ship & ~hits == 0:
+                    sunk |= ship
+                    destroyed = [board.index_to_block(cell, 0) for cell in range(board.cells) if ship >> cell & 1]
+                shooter.register_shot(block, True, destroyed)
+            assert (shooter.alive, shooter.counts, shooter.density) == recount(shooter, misses, hits, sunk)
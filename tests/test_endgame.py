@@ -0,0 +1,185 @@
+"""EndgameSolver and enumerate_arrangements against a plain recursive expectimin on small boards."""
+
+import random
+from functools import lru_cache
+
+import pytest
+
+from ai.endgame import EndgameSolver, enumerate_arrangements
+from elements.bitboard import iter_indexes
+from elements.board import BoardConfig
+from elements.fleet_generator import sample_fleet
+from elements.placements import placement_index
+
+BOARD = BoardConfig(5, 5, (3, 2, 1, 1))
+# Positions are handed to the solver once at most this many fleets are left, so that expectimin stays small
+BRUTE_FORCE_ARRANGEMENTS = 16
+GAMES = 10
+EPSILON = 1e-9
+
+
+def all_arrangements(remaining: tuple, allowed: int, unsunk_hits: int, board: BoardConfig) -> set:
+    """
+    Перебирает все расстановки remaining (от большего к меньшему) как множества масок кораблей.
+    """
+    placements = {}
+    for length in set(remaining):
+        ships = set()
+        for y in range(board.height):
+            for x in range(board.width):
+                for dx, dy in ((1, 0), (0, 1)):
+                    cells = [(x + step * dx, y + step * dy) for step in range(length)]
+                    if all(cx < board.width and cy < board.height for cx, cy in cells):
+                        ships.add(sum(1 << (cy * board.width + cx) for cx, cy in cells))
+        placements[length] = sorted(ships)
+    arrangements = set()
+
+    def place(position: int, first: int, ships: tuple, blocked: int) -> None:
+        if position == len(remaining):
+            occupied = sum(ships)
+            if occupied & unsunk_hits == unsunk_hits:
+                arrangements.add(frozenset(ships))
+            return
+        length = remaining[position]
+        start = first if position and remaining[position - 1] == length else 0
+        for number in range(start, len(placements[length])):
+            ship = placements[length][number]
+            if not ship & (~allowed | blocked) and ship & unsunk_hits != ship:
+                place(position + 1, number + 1, ships + (ship,), blocked | board.halo(ship))
+
+    place(0, 0, (), 0)
+    return arrangements
+
+
+def expectimin(arrangements: set, shot: int) -> tuple:
+    """
+    Возвращает (ожидаемое число выстрелов до уничтожения всех кораблей при лучшей игре, лучшие выстрелы)
+    для равновероятных расстановок arrangements, если уже стреляли по блокам shot.
+    """
+
+    @lru_cache(maxsize=None)
+    def solve(members: frozenset, shot: int) -> tuple:
+        if all(not ship & ~shot for arrangement in members for ship in arrangement):
+            return 0.0, ()
+        cells = {cell for arrangement in members for ship in arrangement for cell in iter_indexes(ship & ~shot)}
+        values = {}
+        for cell in cells:
+            bit = 1 << cell
+            parts = {}
+            for arrangement in members:
+                ship = next((ship for ship in arrangement if ship & bit), None)
+                outcome = None if ship is None else ship if not ship & ~(shot | bit) else 0
+                parts.setdefault(outcome, set()).add(arrangement)
+            shots = sum(len(part) * solve(frozenset(part), shot | bit)[0] for part in parts.values())
+            values[cell] = 1 + shots / len(members)
+        best = min(values.values())
+        return best, tuple(cell for cell, value in values.items() if value <= best + EPSILON)
+
+    return solve(frozenset(arrangements), shot)
+
+
+def to_masks(arrangements: list, board: BoardConfig) -> set:
+    """
+    Переводит расстановки enumerate_arrangements (пары (длина, номер положения)) в множества масок кораблей.
+    """
+    index = placement_index(board)
+    return {frozenset(index.mask(length, number) for length, number in arrangement) for arrangement in arrangements}
+
+
+class Game:
+    """
+    Сетка с настоящим флотом и тем, что о ней известно стреляющему (как в grid_knowledge).
+    """
+
+    def __init__(self, rng: random.Random, board: BoardConfig) -> None:
+        self.board = board
+        self.ships = sample_fleet(rng, board=board)
+        self.shot = 0
+
+    def fire(self, cell: int) -> None:
+        self.shot |= 1 << cell
+
+    def knowledge(self) -> tuple:
+        """
+        Возвращает (оставшиеся корабли, маска блоков, где корабль ещё может стоять, подбитые блоки).
+        """
+        empty, hits, remaining = self.shot & ~sum(self.ships), 0, []
+        for ship, length in zip(self.ships, self.board.fleet):
+            if not ship & ~self.shot:
+                empty |= self.board.halo(ship)
+            else:
+                hits |= ship & self.shot
+                remaining.append(length)
+        return tuple(remaining), self.board.full_mask & ~(empty & ~hits), hits
+
+    def over(self) -> bool:
+        return all(not ship & ~self.shot for ship in self.ships)
+
+
+def endgame_positions(seed: int):
+    """
+    Стреляет по случайной сетке случайно, пока расстановок не станет не больше BRUTE_FORCE_ARRANGEMENTS,
+    и возвращает партию (дальше по ней стреляет тест).
+    """
+    rng = random.Random(f"endgame {seed}")
+    game = Game(rng, BOARD)
+    while True:
+        remaining, allowed, hits = game.knowledge()
+        if enumerate_arrangements(remaining, allowed, hits, limit=BRUTE_FORCE_ARRANGEMENTS, board=BOARD) is not None:
+            return game, rng
+        game.fire(rng.choice([cell for cell in range(BOARD.cells) if not game.shot >> cell & 1]))
+
+
+@pytest.mark.parametrize("table_bits", (16, 2), ids=("table", "colliding table"))
+def test_solver_matches_expectimin(table_bits):
+    # One solver plays every game, so positions of earlier moves and games stay in its table
+    solver = EndgameSolver(time_budget=None, max_ships=len(BOARD.fleet), table_bits=table_bits, board=BOARD)
+    for seed in range(GAMES):
+        game, _ = endgame_positions(seed)
+        while not game.over():
+            remaining, allowed, hits = game.knowledge()
+            arrangements = all_arrangements(remaining, allowed, hits, BOARD)
+            assert to_masks(enumerate_arrangements(remaining, allowed, hits, board=BOARD), BOARD) == arrangements
+            expected, best_cells = expectimin(arrangements, game.shot)
+            cell = solver.choose(remaining, allowed, hits)
+            assert solver.last_exact
+            assert cell in best_cells
+            if solver.last_expected is not None:
+                assert solver.last_expected == pytest.approx(expected)
+            game.fire(cell)
+
+
+def test_too_many_arrangements():
+    remaining, allowed, hits = BOARD.fleet, BOARD.full_mask, 0
+    assert enumerate_arrangements(remaining, allowed, hits, limit=10, board=BOARD) is None
+    solver = EndgameSolver(time_budget=None, max_ships=len(BOARD.fleet), max_arrangements=10, board=BOARD)
+    assert solver.choose(remaining, allowed, hits) is None
+    assert solver.last_arrangements == 0
+
+
+def test_too_many_ships():
+    solver = EndgameSolver(time_budget=None, max_ships=len(BOARD.fleet) - 1, board=BOARD)
+    assert solver.choose(BOARD.fleet, BOARD.full_mask, 0) is None
+
+
+@pytest.mark.parametrize("limits", ({"max_nodes": 0, "time_budget": None}, {"time_budget": 0.0}), ids=repr)
+def test_out_of_budget(limits):
+    # Out of nodes or time, the solver shoots at the block taken in most fleets (the lowest of them)
+    solver = EndgameSolver(max_ships=len(BOARD.fleet), **limits, board=BOARD)
+    for seed in range(GAMES):
+        game, _ = endgame_positions(seed)
+        remaining, allowed, hits = game.knowledge()
+        arrangements = all_arrangements(remaining, allowed, hits, BOARD)
+        counts = {}
+        for arrangement in arrangements:
+            for ship in arrangement:
+                for cell in iter_indexes(ship & ~hits):
+                    counts[cell] = counts.get(cell, 0) + 1
+        if len(arrangements) < 2 or max(counts.values()) == len(arrangements):
+            # A block taken in every fleet is chosen without a search
+            continue
+        cell = solver.choose(remaining, allowed, hits)
+        assert not solver.last_exact and solver.last_expected is None
+        # With no time at all the fleets may not even be enumerated: then the ordinary logic takes the move
+        if cell is not None:
+            assert cell == min(cell for cell, count in counts.items() if count == max(counts.values()))
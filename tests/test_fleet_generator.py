@@ -0,0 +1,76 @@
+"""Uniformity of the rejection sampler and the attempt caps of sample_fleet."""
+
+import random
+from collections import Counter
+
+import pytest
+
+import elements.fleet_generator as fleet_generator
+from elements.board import BoardConfig
+from elements.fleet_generator import sample_fleet
+from elements.placements import placement_index
+
+BOARD = BoardConfig(4, 4, (2, 1, 1))
+SAMPLES_PER_LAYOUT = 100
+# Upper 0.1% point of chi-square with 379 degrees of freedom (every layout of BOARD but one)
+CHI_SQUARE_LIMIT = 469.8
+
+
+def all_layouts(board: BoardConfig) -> set:
+    """
+    Перебирает все допустимые флоты board как множества масок кораблей.
+    """
+    index = placement_index(board)
+    layouts = set()
+
+    def place(position: int, ships: tuple, blocked: int) -> None:
+        if position == len(board.fleet):
+            layouts.add(frozenset(ships))
+            return
+        length = board.fleet[position]
+        for number in index.numbers(length):
+            ship, halo = index.placement(length, number)
+            if not ship & blocked:
+                place(position + 1, ships + (ship,), blocked | halo)
+
+    place(0, (), 0)
+    return layouts
+
+
+def chi_square(uniform: bool) -> float:
+    layouts = all_layouts(BOARD)
+    rng = random.Random("uniform fleets")
+    counts = Counter(
+        frozenset(sample_fleet(rng, uniform=uniform, board=BOARD))
+        for _ in range(SAMPLES_PER_LAYOUT * len(layouts))
+    )
+    assert set(counts) <= layouts
+    return sum((counts[layout] - SAMPLES_PER_LAYOUT) ** 2 / SAMPLES_PER_LAYOUT for layout in layouts)
+
+
+def test_uniform_sampler_is_uniform():
+    assert len(all_layouts(BOARD)) == 380
+    assert chi_square(uniform=True) < CHI_SQUARE_LIMIT
+
+
+def test_default_sampler_is_not():
+    # Picking each ship among the placements still legal favours some layouts, which is why uniform exists
+    assert chi_square(uniform=False) > CHI_SQUARE_LIMIT
+
+
+def test_placement_steps_cap(monkeypatch):
+    monkeypatch.setattr(fleet_generator, "MAX_PLACEMENT_STEPS", len(BOARD.fleet) - 1)
+    with pytest.raises(ValueError):
+        sample_fleet(random.Random(0), board=BOARD)
+
+
+def test_uniform_attempts_cap(monkeypatch):
+    monkeypatch.setattr(fleet_generator, "MAX_UNIFORM_ATTEMPTS", 1000)
+    # Five ships of length 4 never fit a 5x5 grid without touching
+    with pytest.raises(ValueError):
+        sample_fleet(random.Random(0), fleet=(4, 4, 4, 4, 4), uniform=True, board=BoardConfig(5, 5, (4,)))
+
+
+def test_unplaceable_fleet():
+    with pytest.raises(ValueError):
+        sample_fleet(random.Random(0), fleet=(4, 4, 4, 4, 4), board=BoardConfig(5, 5, (4,)))
@@ -0,0 +1,110 @@
+"""Round trips through the binary game log and seeking in replays."""
+
+import pytest
+
+from elements.autoships import AutoShips
+from elements.bitboard import MISS
+from elements.board import DEFAULT_BOARD
+from elements.rng import RngStream
+from simulation import GameLogReader, GameLogWriter, Replay, play_game
+from simulation.game_log import END_MARKER, MAGIC, VERSION, decode_shot
+
+GAMES = 50
+SEEK_MOVES = (0, 15, 16, 17, 33)
+
+
+def boards(replay: Replay) -> tuple:
+    return replay.computer_board.snapshot(), replay.human_board.snapshot()
+
+
+def fleets(seed: int) -> tuple:
+    """
+    Возвращает случайные корабли компьютера и игрока (для партий, записанных в журнал вручную).
+    """
+    rng = RngStream(seed)
+    return AutoShips(0, rng=rng).ships, AutoShips(DEFAULT_BOARD.human_offset, rng=rng).ships
+
+
+@pytest.fixture(scope="module")
+def logged_games(tmp_path_factory):
+    """
+    Играет GAMES партий с записью в журнал и возвращает (путь к журналу, итоги партий).
+    """
+    path = tmp_path_factory.mktemp("log") / "games.bsgl"
+    with open(path, "ab") as file:
+        writer = GameLogWriter(file)
+        results = [play_game(log=writer, rng=RngStream(seed)) for seed in range(GAMES)]
+    return path, results
+
+
+def test_games_read_back(logged_games):
+    path, results = logged_games
+    with GameLogReader(str(path)) as reader:
+        assert len(reader) == GAMES
+        for result, game in zip(results, reader):
+            assert game.winner == result.winner
+            assert [decode_shot(shot) for shot in game.shots] == [(turn, block) for turn, block, _ in result.shots]
+            replay = Replay(game)
+            assert [outcome != MISS for outcome in replay.results] == [hit for _, _, hit in result.shots]
+            assert replay.computer_board.is_defeated == (result.winner == "human")
+            assert replay.human_board.is_defeated == (result.winner == "computer")
+
+
+def test_seek_matches_replay_from_scratch(logged_games):
+    path, _ = logged_games
+    with GameLogReader(str(path)) as reader:
+        for game in reader:
+            replay = Replay(game)
+            moves = [move for move in SEEK_MOVES if move <= len(replay)] + [len(replay)]
+            # Forwards, backwards and back to the end again
+            for move in moves + moves[::-1] + [len(replay)]:
+                replay.seek(move)
+                assert replay.move == move
+                assert boards(replay) == boards(Replay(game._replace(shots=game.shots[:move])))
+            with pytest.raises(IndexError):
+                replay.seek(len(replay) + 1)
+
+
+def test_interrupted_games(tmp_path):
+    path = tmp_path / "interrupted.bsgl"
+    interrupted_shots = [(False, (1, 1)), (True, (16, 1)), (True, (17, 1)), (False, (10, 10))]
+    with open(path, "ab") as file:
+        writer = GameLogWriter(file)
+        # The first game stops without END_MARKER, as if the window had been closed, and the next one follows it
+        writer.start_game(*fleets(1))
+        for computer_turn, block in interrupted_shots:
+            writer.record_shot(computer_turn, block)
+        finished = play_game(log=writer, rng=RngStream(2))
+        # The last game is cut off after one shot
+        writer.start_game(*fleets(3))
+        writer.record_shot(False, (5, 5))
+    with GameLogReader(str(path)) as reader:
+        assert [game.winner for game in reader] == [None, finished.winner, None]
+        assert [decode_shot(shot) for shot in reader[0].shots] == interrupted_shots
+        assert len(Replay(reader[1])) == len(finished.shots)
+        assert [decode_shot(shot) for shot in reader[2].shots] == [(False, (5, 5))]
+        assert len(Replay(reader[2]).results) == 1
+
+
+def test_game_ended_without_winner(tmp_path):
+    path = tmp_path / "no_winner.bsgl"
+    with open(path, "ab") as file:
+        writer = GameLogWriter(file)
+        writer.start_game(*fleets(4))
+        writer.end_game(None)
+        # END_MARKER is the last byte of the file: the winner was never written
+        computer_ships, human_ships = fleets(5)
+        writer.start_game(computer_ships, human_ships)
+        writer.record_shot(True, human_ships[0][0])
+        file.write(bytes((END_MARKER,)))
+    with GameLogReader(str(path)) as reader:
+        assert [game.winner for game in reader] == [None, None]
+        assert Replay(reader[1]).results[0] != MISS
+
+
+@pytest.mark.parametrize("header", (b"XXXX" + bytes((VERSION,)), MAGIC + bytes((VERSION + 1,))), ids=repr)
+def test_bad_header(tmp_path, header):
+    path = tmp_path / "bad.bsgl"
+    path.write_bytes(header + bytes(10))
+    with pytest.raises(ValueError):
+        GameLogReader(str(path))
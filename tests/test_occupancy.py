@@ -0,0 +1,72 @@
+"""OccupancyGrid against the set of blocks taken by ships and their neighbours, with undo."""
+
+import random
+
+from elements.board import DEFAULT_BOARD
+from elements.occupancy import OccupancyGrid
+from game_logic import is_ship_valid
+
+OFFSET = DEFAULT_BOARD.human_offset
+LAYOUTS = 200
+
+
+def halo_blocks(ship: list) -> set:
+    """
+    Возвращает блоки корабля и все соседние с ними (как набор used_blocks до OccupancyGrid).
+    """
+    return {(x + dx, y + dy) for x, y in ship for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+
+
+def straight_ship(block: tuple, length: int, horizontal: bool) -> list:
+    x, y = block
+    return [(x + step, y) if horizontal else (x, y + step) for step in range(length)]
+
+
+def random_ship(rng: random.Random) -> list:
+    """
+    Возвращает случайный корабль длины от 1 до 4, целиком лежащий на сетке игрока.
+    """
+    length = rng.randint(1, 4)
+    horizontal = rng.random() < 0.5
+    x = rng.randint(1, DEFAULT_BOARD.width - (length - 1 if horizontal else 0))
+    y = rng.randint(1, DEFAULT_BOARD.height - (0 if horizontal else length - 1))
+    return straight_ship((x + OFFSET, y), length, horizontal)
+
+
+def test_undo_keeps_the_neighbours_halo():
+    grid = OccupancyGrid(OFFSET)
+    survivor = straight_ship((OFFSET + 2, 2), 3, True)
+    # The removed ship is two blocks below, so the row between them belongs to both halos
+    removed = straight_ship((OFFSET + 3, 4), 2, True)
+    grid.place(survivor)
+    grid.place(removed)
+    grid.remove(removed)
+    for block in halo_blocks(survivor):
+        if DEFAULT_BOARD.contains(block, OFFSET):
+            assert block in grid
+            assert not grid.can_place([block])
+            assert not grid.can_place_at(block, 1, True)
+    assert grid.can_place(removed)
+    assert grid.can_place_at(removed[0], len(removed), True)
+    grid.remove(survivor)
+    assert not any(block in grid for block in DEFAULT_BOARD.blocks(OFFSET))
+
+
+def test_matches_the_set_of_used_blocks():
+    rng = random.Random("occupancy")
+    for _ in range(LAYOUTS):
+        grid = OccupancyGrid(OFFSET)
+        ships = []
+        for _ in range(rng.randint(1, 10)):
+            used = set().union(*map(halo_blocks, ships))
+            ship = random_ship(rng)
+            valid = set(ship).isdisjoint(used)
+            assert is_ship_valid(ship=ship, blocks_for_manual_drawing=grid) == valid
+            assert grid.can_place_at(ship[0], len(ship), len(ship) > 1 and ship[0][1] == ship[1][1]) == valid
+            if valid:
+                grid.place(ship)
+                ships.append(ship)
+            elif ships and rng.random() < 0.3:
+                grid.remove(ships.pop(rng.randrange(len(ships))))
+        on_board = set(DEFAULT_BOARD.blocks(OFFSET))
+        assert {block for block in on_board if block in grid} == on_board & set().union(*map(halo_blocks, ships))
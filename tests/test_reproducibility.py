@@ -0,0 +1,40 @@
+"""Fleets and tournaments with the same seed do not depend on the number of worker processes."""
+
+import pytest
+
+from elements.board import BoardConfig
+from elements.fleet_generator import FLEETS_PER_STREAM, generate_fleets
+from elements.rng import RngStream
+from simulation.tournament import run_tournament
+
+WORKERS = 3
+# Neither the first nor the last stream of generate_fleets is full
+FLEETS = 2 * FLEETS_PER_STREAM + 7
+# The endgame solver makes tournament games slow, so there are only a few
+TOURNAMENT_GAMES = 6
+BOARD = BoardConfig(6, 6, (3, 2, 2, 1))
+
+
+def without_timing(report: dict) -> dict:
+    """
+    Возвращает отчет турнира без скорости и числа процессов — единственного, что от них зависит.
+    """
+    report = dict(report, parameters=dict(report["parameters"]))
+    del report["games_per_second"], report["parameters"]["workers"]
+    return report
+
+
+@pytest.mark.parametrize("uniform", (False, True), ids=("default", "uniform"))
+def test_generate_fleets(uniform):
+    fleets = generate_fleets(FLEETS, rng=RngStream(7), uniform=uniform, board=BOARD)
+    assert len(fleets) == FLEETS
+    assert generate_fleets(FLEETS, rng=RngStream(7), uniform=uniform, workers=WORKERS, board=BOARD) == fleets
+    assert generate_fleets(FLEETS, rng=RngStream(8), uniform=uniform, board=BOARD) != fleets
+
+
+def test_tournament():
+    # Batches of 4 games leave a short last batch for every pair of strategies
+    arguments = {"games": TOURNAMENT_GAMES, "seed": 11, "batch_games": 4, "board": BOARD}
+    report = without_timing(run_tournament(**arguments, workers=1))
+    assert without_timing(run_tournament(**arguments, workers=WORKERS)) == report
+    assert without_timing(run_tournament(**dict(arguments, batch_games=TOURNAMENT_GAMES))) == report